@@ -0,0 +1,77 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from PySide6.QtCore import QSharedMemory, QSize
+from PySide6.QtWidgets import QApplication
+
+from src.animation import decode_animation
+from src.ResourceManager import AssetPack, SharedAssetPack, build_asset_pack
+from src.ResourceManager.shared_pack import shared_pack_key
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestAssetPack(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.gif_dirs = {}
+        for category in ["Drag", "Eat"]:
+            directory = os.path.join(self.temp_dir, category)
+            shutil.copytree(f"resources/doro/{category}", directory)
+            self.gif_dirs[category] = directory
+        self.pack_path = os.path.join(self.temp_dir, "doro.pack")
+
+    def test_round_trip(self):
+        """打包后读取的帧与直接解码 GIF 的结果一致"""
+        self.assertEqual(build_asset_pack(self.gif_dirs, self.pack_path), 2)
+        pack = AssetPack.open(self.pack_path)
+        self.assertIsNotNone(pack)
+        assert pack is not None
+        self.assertEqual(
+            pack.categories(), {"Drag": ["drag1.gif"], "Eat": ["eat1.gif"]}
+        )
+
+        expected = decode_animation(os.path.join(self.gif_dirs["Eat"], "eat1.gif"))
+        animation = pack.animation("Eat/eat1.gif")
+        self.assertEqual(animation.delays, expected.delays)
+        for frame, expected_frame in zip(animation.frames, expected.frames):
+            self.assertEqual(frame, expected_frame)
+
+    def test_invalid_pack(self):
+        """格式不符的文件不会被当作资源包"""
+        with open(self.pack_path, "wb") as f:
+            f.write(b"not a pack" * 10)
+        self.assertIsNone(AssetPack.open(self.pack_path))
+
+    def test_shared_pack(self):
+        """第二个使用者附加到已发布的共享内存, 帧零拷贝且内容一致; 全部断开后释放"""
+        size = QSize(50, 50)
+        publisher = SharedAssetPack.attach_or_publish(self.gif_dirs, {}, size)
+        assert publisher is not None
+        reader = SharedAssetPack.attach_or_publish(self.gif_dirs, {}, size)
+        assert reader is not None
+        frame = reader.animation("Drag/drag1.gif").frames[0]
+        self.assertEqual(frame.size(), size)
+        self.assertEqual(frame, publisher.animation("Drag/drag1.gif").frames[0])
+        self.assertTrue(
+            np.shares_memory(
+                np.frombuffer(frame.constBits(), np.uint8),
+                np.frombuffer(reader.memory.constData(), np.uint8),
+            )
+        )
+
+        publisher.close()
+        reader.close()
+        key = shared_pack_key(self.gif_dirs, {}, size)
+        self.assertFalse(QSharedMemory(key).attach())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
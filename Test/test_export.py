@@ -0,0 +1,87 @@
+import os
+import struct
+import sys
+import tempfile
+import unittest
+import zlib
+
+import numpy as np
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from src.export import FrameEncoder, encode_png, parse_script
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def read_chunks(path):
+    """PNG/APNG 文件中的 (类型, 数据) 列表, 同时校验 CRC"""
+    with open(path, "rb") as f:
+        data = f.read()
+    chunks, offset = [], 8
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset : offset + 4])
+        tag = data[offset + 4 : offset + 8]
+        body = data[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack(">I", data[offset + 8 + length : offset + 12 + length])
+        assert crc == zlib.crc32(tag + body) & 0xFFFFFFFF
+        chunks.append((tag, body))
+        offset += 12 + length
+    return chunks
+
+
+def rgba(width, height, value):
+    pixels = np.zeros((height, width, 4), np.uint8)
+    pixels[: height // 2, :, :] = value
+    return pixels.tobytes()
+
+
+class TestExport(unittest.TestCase):
+    def test_parse_script(self):
+        steps = parse_script("normal:1500, HUNGRY:2000,EATING")
+        self.assertEqual(
+            [(step["state"], step["duration"]) for step in steps],
+            [("NORMAL", 1500), ("HUNGRY", 2000), ("EATING", 1000)],
+        )
+        with self.assertRaises(ValueError):
+            parse_script("SLEEPING:1000")
+
+    def test_encode_png_round_trip(self):
+        """编码结果可被 Qt 原样读回"""
+        pixels = np.random.default_rng(0).integers(0, 256, (7, 5, 4), np.uint8)
+        image = QImage.fromData(encode_png(pixels.tobytes(), 5, 7))
+        image = image.convertToFormat(QImage.Format.Format_RGBA8888)
+        decoded = np.frombuffer(image.constBits(), np.uint8).reshape(7, 5, 4)
+        np.testing.assert_array_equal(decoded, pixels)
+
+    def test_apng_merges_repeated_frames(self):
+        """相同的连续帧合并为一帧, 时长累加"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "out.apng")
+            encoder = FrameEncoder(path, "apng", 4, 4, workers=2)
+            for value, duration in ((10, 33), (10, 34), (200, 33), (10, 33)):
+                encoder.add(rgba(4, 4, value), duration)
+            self.assertEqual(encoder.close(), 3)
+            self.assertEqual(encoder.frames, 4)
+
+            chunks = read_chunks(path)
+            tags = [tag for tag, _ in chunks]
+            self.assertEqual(tags[:3], [b"IHDR", b"acTL", b"fcTL"])
+            self.assertEqual(struct.unpack(">II", chunks[1][1]), (3, 0))
+            delays = [
+                struct.unpack(">IIIIIHHBB", body)[5]
+                for tag, body in chunks
+                if tag == b"fcTL"
+            ]
+            self.assertEqual(delays, [67, 33, 33])
+            # fcTL 与 fdAT 共用连续的序号
+            sequence = [
+                struct.unpack(">I", body[:4])[0]
+                for tag, body in chunks
+                if tag in (b"fcTL", b"fdAT")
+            ]
+            self.assertEqual(sequence, list(range(len(sequence))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from PySide6.QtGui import QImage
+
+from src.animation import FRAME_FORMAT, Animation, limit_frame_rate
+
+
+def make_animation(delays):
+    frames = [QImage(1, 1, FRAME_FORMAT) for _ in delays]
+    return Animation(frames, list(delays))
+
+
+class TestFrameRate(unittest.TestCase):
+    def test_keeps_slow_animation(self):
+        """帧时长已满足帧率时原样返回"""
+        animation = make_animation([100, 100, 100])
+        self.assertIs(limit_frame_rate(animation, 30), animation)
+
+    def test_disabled(self):
+        """fps <= 0 表示不限制"""
+        animation = make_animation([10, 10, 10])
+        self.assertIs(limit_frame_rate(animation, 0), animation)
+
+    def test_merges_fast_frames(self):
+        """100fps 的动画限制到 30fps 后, 总时长不变且帧数不超过 30fps 对应的数量"""
+        animation = make_animation([10] * 30)
+        limited = limit_frame_rate(animation, 30)
+        self.assertEqual(limited.duration, animation.duration)
+        self.assertEqual(len(limited), 9)
+        self.assertTrue(all(delay >= 1000 // 30 for delay in limited.delays))
+        self.assertIs(limited.frames[0], animation.frames[0])
+
+    def test_short_loop_keeps_frames(self):
+        """略高于上限的短循环不会被合并成单帧"""
+        animation = make_animation([30, 30, 30])
+        limited = limit_frame_rate(animation, 30)
+        self.assertEqual(len(limited), 3)
+        self.assertEqual(limited.duration, 90)
+
+    def test_mixed_delays(self):
+        """慢帧保留, 连续的快帧按采样间隔抽取"""
+        animation = make_animation([100, 10, 10, 10, 10, 100])
+        limited = limit_frame_rate(animation, 30)
+        self.assertEqual(limited.duration, animation.duration)
+        self.assertIs(limited.frames[0], animation.frames[0])
+        self.assertIs(limited.frames[-1], animation.frames[-1])
+        self.assertEqual(limited.delays[0], 100)
+        self.assertLess(len(limited), len(animation))
+
+    def test_last_slot_before_end(self):
+        """最后一个采样点接近总时长时不会越过最后一帧"""
+        for delays in ([10, 57], [5] * 13 + [2]):
+            animation = make_animation(delays)
+            limited = limit_frame_rate(animation, 30)
+            self.assertEqual(limited.duration, animation.duration)
+            self.assertTrue(all(delay > 0 for delay in limited.delays))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from PySide6.QtGui import QColor, QImage
+
+from src.animation import FRAME_FORMAT, Animation, FrameStore
+
+
+def make_frame(color):
+    frame = QImage(4, 4, FRAME_FORMAT)
+    frame.fill(QColor(color))
+    return frame
+
+
+def make_animation(colors, source=""):
+    return Animation(
+        [make_frame(color) for color in colors], [100] * len(colors), source=source
+    )
+
+
+class TestFrameStore(unittest.TestCase):
+    def test_dedup_within_animation(self):
+        """同一动画中的重复帧共享一份数据"""
+        store = FrameStore()
+        animation = store.intern(make_animation(["red", "red", "blue", "red"], "a"))
+        self.assertEqual(len(store), 2)
+        self.assertEqual(animation.frames[0].cacheKey(), animation.frames[3].cacheKey())
+        stats = store.stats("a")
+        self.assertEqual(stats["stored"], 2)
+        self.assertAlmostEqual(stats["dedup_ratio"], 0.5)
+        self.assertEqual(stats["bytes_saved"], 2 * 4 * 4 * 4)
+        self.assertEqual(animation.size_in_bytes, 2 * 4 * 4 * 4)
+        self.assertEqual(animation.logical_bytes, 4 * 4 * 4 * 4)
+
+    def test_dedup_across_animations(self):
+        """不同动画之间的相同帧同样共享"""
+        store = FrameStore()
+        first = store.intern(make_animation(["red", "blue"], "a"))
+        second = store.intern(make_animation(["blue", "green"], "b"))
+        self.assertEqual(len(store), 3)
+        self.assertEqual(first.frames[1].cacheKey(), second.frames[0].cacheKey())
+        self.assertEqual(store.stats("b")["stored"], 1)
+
+    def test_release(self):
+        """帧在不再被任何动画引用后才被回收"""
+        store = FrameStore()
+        first = store.intern(make_animation(["red", "blue"], "a"))
+        second = store.intern(make_animation(["blue"], "b"))
+        store.release(first)
+        self.assertEqual(len(store), 1)
+        store.release(second)
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
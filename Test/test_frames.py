@@ -0,0 +1,62 @@
+import sys
+import unittest
+
+from PySide6.QtCore import QPoint, QRect, Qt
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from src.animation import FRAME_FORMAT, Animation, SpriteView
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def make_frame(points):
+    """10x6 的透明帧, `points` 中的像素为不透明红色"""
+    frame = QImage(10, 6, FRAME_FORMAT)
+    frame.fill(Qt.GlobalColor.transparent)
+    for x, y in points:
+        frame.setPixelColor(x, y, QColor("red"))
+    return frame
+
+
+class TestAnimationFrames(unittest.TestCase):
+    def setUp(self):
+        self.animation = Animation(
+            [make_frame([(1, 1)]), make_frame([(1, 1), (8, 4)])], [100, 100]
+        )
+
+    def test_dirty_rects(self):
+        """相邻帧只有变化的像素需要重绘"""
+        self.assertEqual(
+            self.animation.dirty_rects(), [QRect(8, 4, 1, 1), QRect(8, 4, 1, 1)]
+        )
+
+    def test_opaque_rect(self):
+        """不透明区域为所有帧的并集"""
+        self.assertEqual(self.animation.opaque_rect(), QRect(1, 1, 8, 4))
+
+    def test_hit_test(self):
+        self.assertTrue(self.animation.hit_test(0, 1, 1))
+        self.assertFalse(self.animation.hit_test(0, 8, 4))
+        self.assertTrue(self.animation.hit_test(1, 8, 4))
+        self.assertFalse(self.animation.hit_test(1, 0, 0))
+        self.assertFalse(self.animation.hit_test(1, 10, 4))
+
+    def test_hit_test_without_frame(self):
+        """没有当前帧(解码中/解码失败)时视为点中, 有帧时按掩码判断"""
+        view = SpriteView()
+        self.assertTrue(view.hit_test(QPoint(0, 0)))
+        view.show_frame(Animation([], []), 0)
+        self.assertTrue(view.hit_test(QPoint(0, 0)))
+        view.show_frame(self.animation, 0)
+        self.assertFalse(view.hit_test(QPoint(0, 0)))
+
+    def test_hit_masks_shared(self):
+        """相同的掩码共享同一个数组"""
+        animation = Animation([make_frame([(2, 2)]), make_frame([(2, 2)])], [50, 50])
+        masks = animation.hit_masks()
+        self.assertIs(masks[0], masks[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
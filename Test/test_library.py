@@ -0,0 +1,103 @@
+import sys
+import threading
+import time
+import unittest
+
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from src.animation import FRAME_FORMAT, Animation, AnimationLibrary
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def make_animation(source):
+    frame = QImage(4, 4, FRAME_FORMAT)
+    frame.fill(QColor("red"))
+    return Animation([frame], [100], source=source)
+
+
+class TestAnimationLibrary(unittest.TestCase):
+    def setUp(self):
+        self.library = AnimationLibrary(8, 1 << 20)
+
+    def test_failed_decode_not_cached(self):
+        """解码失败(空动画)不写入缓存, 之后可以重新解码"""
+        key = ("a.gif", 4, 4, 30)
+        self.library.load(key, lambda: Animation([], [], source="a.gif"))
+        self.assertIsNone(self.library.get(key))
+        animation = self.library.load(key, lambda: make_animation("a.gif"))
+        self.assertEqual(len(animation), 1)
+        self.assertIs(self.library.get(key), animation)
+
+    def test_prefetch_counted_on_hit_only(self):
+        """未命中时不算预取命中"""
+        key = ("b.gif", 4, 4, 30)
+        self.library.prefetched.add(key)
+        self.assertIsNone(self.library.get(key))
+        self.assertEqual(self.library.prefetch_stats["used"], 0)
+        self.library.load(key, lambda: make_animation("b.gif"))
+        self.library.get(key)
+        self.assertEqual(self.library.prefetch_stats["used"], 1)
+
+    def test_request_raises_pending_priority(self):
+        """播放请求赶上排队中的预取时按更高的优先级重新排队"""
+        loader = AnimationLibrary(8, 1 << 20).loader
+        loader._pool.setMaxThreadCount(1)
+        release = threading.Event()
+        order = []
+        loader.loaded.connect(lambda key, animation: order.append(key[0]))
+
+        def decoder(source, wait=False):
+            def load():
+                if wait:
+                    release.wait(5)
+                return make_animation(source)
+
+            return load
+
+        # 占住唯一的工作线程, 之后的任务都在排队
+        loader.request(("busy", 4, 4, 30), decoder("busy", True), 10)
+        time.sleep(0.05)
+        loader.request(("prefetch", 4, 4, 30), decoder("prefetch"), -1)
+        loader.request(("play", 4, 4, 30), decoder("play"), 0)
+        loader.request(("prefetch", 4, 4, 30), decoder("prefetch"), 1)
+        release.set()
+        deadline = time.monotonic() + 5
+        while len(order) < 3 and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        self.assertEqual(order, ["busy", "prefetch", "play"])
+        self.assertEqual(loader.pending_count(), 0)
+
+    def test_retain_drops_old_frame_sets(self):
+        """设备像素比改变后, 旧尺寸的缓存被淘汰, 仍在解码的旧任务结果被丢弃"""
+        old, new = ("a.gif", 4, 4, 30), ("a.gif", 8, 8, 30)
+        self.library.load(old, lambda: make_animation("a.gif"))
+        release = threading.Event()
+
+        def slow_load():
+            release.wait(5)
+            return make_animation("b.gif")
+
+        pending = ("b.gif", 4, 4, 30)
+        self.library.request(pending, slow_load)
+        self.library.retain(lambda key: key[1:] == new[1:])
+        self.assertNotIn(old, self.library.cache)
+        self.assertFalse(self.library.loader.is_pending(pending))
+        release.set()
+        self.library.loader._pool.waitForDone(5000)
+        app.processEvents()
+        self.assertNotIn(pending, self.library.cache)
+
+    def test_near_budget(self):
+        """缓存用量接近预算时停止预取"""
+        library = AnimationLibrary(4, 1 << 20)
+        self.assertFalse(library.near_budget())
+        for i in range(3):
+            library.load((f"{i}.gif", 4, 4, 30), lambda: make_animation("x"))
+        self.assertTrue(library.near_budget())
+
+
+if __name__ == "__main__":
+    unittest.main()
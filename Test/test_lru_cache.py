@@ -0,0 +1,54 @@
+import unittest
+
+from src.animation import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.evicted = []
+        self.cache: LRUCache[str, bytes] = LRUCache(
+            max_entries=3,
+            max_bytes=100,
+            sizeof=lambda key, value: len(value),
+            on_evict=lambda key, value: self.evicted.append(key),
+        )
+
+    def test_hits_and_misses(self):
+        """未命中后写入, 再次读取应命中"""
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", b"x" * 10)
+        self.assertEqual(self.cache.get("a"), b"x" * 10)
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["bytes"], 10)
+
+    def test_entry_budget_evicts_least_recently_used(self):
+        """条目数超出预算时淘汰最久未使用的条目"""
+        for key in "abc":
+            self.cache.put(key, b"x")
+        self.cache.get("a")
+        self.cache.put("d", b"x")
+        self.assertNotIn("b", self.cache)
+        self.assertEqual(self.evicted, ["b"])
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_byte_budget(self):
+        """字节数超出预算时淘汰, 但刚写入的条目总会保留"""
+        self.cache.put("a", b"x" * 60)
+        self.cache.put("b", b"x" * 60)
+        self.assertEqual(list(self.cache), ["b"])
+        self.cache.put("c", b"x" * 200)
+        self.assertEqual(list(self.cache), ["c"])
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_resize(self):
+        """缩小预算时立即淘汰"""
+        for key in "abc":
+            self.cache.put(key, b"x")
+        self.cache.resize(1, 100)
+        self.assertEqual(list(self.cache), ["c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from src.metric_history import HISTORY_METRICS, MetricHistory
+
+
+def fill(history, values, start=0):
+    for time, value in enumerate(values, start):
+        history.append(float(time), [value] * len(HISTORY_METRICS))
+
+
+class TestMetricHistory(unittest.TestCase):
+    def test_ring_keeps_newest_in_order(self):
+        """写满后覆盖最早的样本, 读出时从旧到新"""
+        history = MetricHistory(4)
+        fill(history, [1, 2, 3])
+        np.testing.assert_array_equal(history.values("cpu"), [1, 2, 3])
+        fill(history, [4, 5, 6], start=3)
+        self.assertEqual(len(history), 4)
+        np.testing.assert_array_equal(history.values("memory"), [3, 4, 5, 6])
+        np.testing.assert_array_equal(history.times(), [2, 3, 4, 5])
+
+    def test_stats_match_naive_computation(self):
+        history = MetricHistory(50)
+        values = np.random.default_rng(0).uniform(0, 100, 80)
+        fill(history, values)
+        window = values[-50:]
+        # 归一化的指数加权平均
+        weights = np.array([(1 - 0.3) ** (49 - i) for i in range(50)])
+        expected = float((weights * window).sum() / weights.sum())
+
+        stats = history.stats("recv", alpha=0.3)
+        self.assertAlmostEqual(stats["ewma"], expected)
+        self.assertEqual(stats["last"], window[-1])
+        self.assertEqual(stats["min"], window.min())
+        self.assertEqual(stats["max"], window.max())
+        self.assertAlmostEqual(stats["p95"], float(np.percentile(window, 95)))
+        self.assertEqual(MetricHistory(3).stats("cpu")["max"], 0.0)
+
+    def test_resize_keeps_newest(self):
+        history = MetricHistory(5)
+        fill(history, range(8))
+        history.resize(3)
+        np.testing.assert_array_equal(history.values("send"), [5, 6, 7])
+        fill(history, [8])
+        np.testing.assert_array_equal(history.values("send"), [6, 7, 8])
+        history.resize(6)
+        fill(history, [9])
+        np.testing.assert_array_equal(history.values("cpu"), [6, 7, 8, 9])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import sys
+import unittest
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+from src.animation import PARTICLE_KINDS, ParticleSystem, particle_draw_list
+from src.animation.particles import FADE_LEVELS, render_particle_sprites
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestParticles(unittest.TestCase):
+    def setUp(self):
+        self.system = ParticleSystem(8, rng=np.random.default_rng(0))
+
+    def test_emit_wraps_and_expires(self):
+        """超出容量时覆盖最早的粒子, 寿命耗尽后全部回收"""
+        self.system.emit(PARTICLE_KINDS["heart"], 6, 50, 50)
+        self.system.emit(PARTICLE_KINDS["crumb"], 4, 50, 50)
+        self.assertEqual(len(self.system.alive()), 8)
+        self.assertEqual(list(self.system.sprite[:2]), [1, 1])
+        self.system.step(100)
+        self.assertTrue(np.all(self.system.position[:, 1] != 50))
+        self.system.step(10000)
+        self.assertEqual(len(self.system.alive()), 0)
+
+    def test_draw_list(self):
+        """每个存活粒子对应一张贴图, 快消失的粒子使用较淡的档位"""
+        self.assertEqual(len(particle_draw_list(self.system)[1]), 0)
+        self.system.emit(PARTICLE_KINDS["heart"], 4, 20, 20)
+        self.system.emit(PARTICLE_KINDS["crumb"], 4, 20, 20)
+        self.system.step(10)
+        positions, keys = particle_draw_list(self.system)
+        self.assertEqual(positions.shape, (8, 2))
+        # 刚发射时完全不透明
+        self.assertEqual(
+            sorted(set(keys.tolist())), [FADE_LEVELS - 1, 2 * FADE_LEVELS - 1]
+        )
+        self.system.step(PARTICLE_KINDS["crumb"]["life"] * 0.7)
+        alive = self.system.alive()
+        remaining = self.system.life[alive] / self.system.max_life[alive]
+        levels = self.system.sprite_keys()[alive] % FADE_LEVELS
+        self.assertTrue(np.any(remaining < 0.2))
+        self.assertTrue(np.all(levels[remaining < 0.2] < FADE_LEVELS // 2))
+        self.assertTrue(np.all(levels[remaining >= 0.4] == FADE_LEVELS - 1))
+        self.assertEqual(len(render_particle_sprites()), 3 * FADE_LEVELS)
+
+
+if __name__ == "__main__":
+    unittest.main()
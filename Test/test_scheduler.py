@@ -0,0 +1,128 @@
+import sys
+import unittest
+
+from PySide6.QtWidgets import QApplication
+
+from src.state import Scheduler
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+    def advance(self, ms: float):
+        self.time += ms / 1000
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = Scheduler(coarse_tolerance=100, clock=self.clock)
+        self.calls = []
+
+    def make_task(self, name, **kwargs):
+        return self.scheduler.create_task(
+            lambda: self.calls.append(name), name=name, **kwargs
+        )
+
+    def test_deadline_order(self):
+        """最早到期的任务决定下次唤醒时刻"""
+        self.make_task("slow", precise=True).start(500)
+        self.make_task("fast", precise=True).start(200)
+        self.assertEqual(self.scheduler.next_deadline(), 200)
+        self.clock.advance(200)
+        self.assertEqual(self.scheduler.run_due(), 1)
+        self.assertEqual(self.calls, ["fast"])
+
+    def test_coarse_tasks_coalesce(self):
+        """容差窗口内的粗略任务与到期任务合并执行, 精确任务不会提前"""
+        self.make_task("precise", precise=True).start(1000)
+        self.make_task("coarse").start(1050)
+        self.make_task("late_precise", precise=True).start(1050)
+        self.clock.advance(1000)
+        self.scheduler.run_due()
+        self.assertEqual(self.calls, ["precise", "coarse"])
+        self.assertEqual(self.scheduler.next_deadline(), 1050)
+
+    def test_single_shot_and_periodic(self):
+        once = self.make_task("once", single_shot=True)
+        tick = self.make_task("tick", precise=True)
+        once.start(100)
+        tick.start(100)
+        for _ in range(3):
+            self.clock.advance(100)
+            self.scheduler.run_due()
+        self.assertEqual(self.calls.count("once"), 1)
+        self.assertEqual(self.calls.count("tick"), 3)
+        self.assertFalse(once.is_active())
+        self.assertTrue(tick.is_active())
+
+    def test_stop_and_restart(self):
+        """stop 后旧的截止时间失效, 重新 start 从当前时刻计时"""
+        task = self.make_task("task", precise=True)
+        task.start(100)
+        task.stop()
+        self.assertIsNone(self.scheduler.next_deadline())
+        self.clock.advance(50)
+        task.start()
+        self.assertEqual(task.remaining_time(), 100)
+        self.clock.advance(100)
+        self.scheduler.run_due()
+        self.assertEqual(self.calls, ["task"])
+
+    def test_start_with_delay(self):
+        """首次按 delay 触发, 之后按间隔周期触发"""
+        task = self.make_task("task", precise=True)
+        task.start(100, 30)
+        self.assertEqual(task.remaining_time(), 30)
+        self.clock.advance(30)
+        self.scheduler.run_due()
+        self.assertEqual(task.remaining_time(), 100)
+        self.assertEqual(self.calls, ["task"])
+
+    def test_failing_task_does_not_starve_others(self):
+        """回调抛出异常时同批的其他任务照常执行, 定时器继续工作"""
+
+        def fail():
+            raise RuntimeError("boom")
+
+        self.scheduler.create_task(fail, precise=True, name="fail").start(100)
+        good = self.make_task("good", precise=True)
+        good.start(100)
+        self.clock.advance(100)
+        self.scheduler._on_timeout()
+        self.assertEqual(self.calls, ["good"])
+        self.assertTrue(good.is_active())
+        self.assertTrue(self.scheduler._timer.isActive())
+
+    def test_aligned_tasks_share_wakeup(self):
+        """对齐的同间隔任务即使启动时刻不同, 也在同一时刻触发"""
+        self.make_task("a", precise=True, align=True).start(50)
+        self.clock.advance(20)
+        self.make_task("b", precise=True, align=True).start(50)
+        self.assertEqual(self.scheduler.next_deadline(), 50)
+        self.clock.advance(30)
+        self.assertEqual(self.scheduler.run_due(), 2)
+        self.assertEqual(self.scheduler.next_deadline(), 100)
+
+    def test_remove_task(self):
+        """注销的任务不再触发, 也不计入统计"""
+        keep = self.make_task("keep", precise=True)
+        removed = self.make_task("removed", precise=True)
+        keep.start(100)
+        removed.start(50)
+        self.scheduler.remove_task(removed)
+        self.assertEqual(self.scheduler.next_deadline(), 100)
+        self.assertEqual(self.scheduler.stats()["tasks"], 1)
+        self.clock.advance(100)
+        self.scheduler.run_due()
+        self.assertEqual(self.calls, ["keep"])
+
+
+if __name__ == "__main__":
+    unittest.main()
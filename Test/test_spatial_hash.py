@@ -0,0 +1,37 @@
+import unittest
+
+from PySide6.QtCore import QRect
+
+from src.spatial_hash import SpatialHash
+
+
+class TestSpatialHash(unittest.TestCase):
+    def setUp(self):
+        self.index: SpatialHash[str] = SpatialHash(100)
+        self.index.update("a", QRect(0, 0, 100, 100))
+        self.index.update("b", QRect(150, 0, 100, 100))
+        self.index.update("c", QRect(1000, 1000, 100, 100))
+
+    def test_query(self):
+        """只返回真正相交的对象"""
+        self.assertEqual(self.index.query(QRect(50, 50, 120, 10)), {"a", "b"})
+        self.assertEqual(self.index.query(QRect(100, 0, 50, 100)), set())
+        self.assertEqual(self.index.neighbors("a", margin=51), {"b"})
+
+    def test_move_and_remove(self):
+        """移动后旧格子不再包含该对象"""
+        self.index.update("c", QRect(90, 50, 100, 100))
+        self.assertEqual(self.index.neighbors("c"), {"a", "b"})
+        self.assertEqual(self.index.query(QRect(1000, 1000, 10, 10)), set())
+        self.index.remove("b")
+        self.assertEqual(self.index.neighbors("c"), {"a"})
+        self.assertNotIn("b", self.index)
+
+    def test_resize(self):
+        self.index.resize(32)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.query(QRect(50, 50, 120, 10)), {"a", "b"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import sys
+import unittest
+
+from PySide6.QtWidgets import QApplication, QWidget
+
+from src.speech_bubble import SpeechBubble
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class ThemeConfig:
+    """只提供气泡用到的配置项"""
+
+    def __init__(self):
+        self.config = {"Theme": {"DefaultTheme": "light"}}
+
+    def get_theme_colors(self):
+        return {"primary": "#ff69b4", "background": "#ffffff", "text": "#333333"}
+
+
+class TestSpeechBubble(unittest.TestCase):
+    def setUp(self):
+        self.anchor = QWidget()
+        self.anchor.setGeometry(300, 300, 200, 200)
+        self.config = ThemeConfig()
+        self.bubble = SpeechBubble(self.anchor, self.config)
+
+    def tearDown(self):
+        self.bubble.hide_message()
+
+    def test_repeated_message_reuses_pixmap(self):
+        """相同消息和主题只渲染一次, 切换主题后重新渲染"""
+        self.bubble.show_message("hello")
+        first = self.bubble.pixmap
+        self.bubble.show_message("a much longer message that has to wrap " * 3)
+        self.assertLessEqual(
+            self.bubble.width(),
+            SpeechBubble.MAX_TEXT_WIDTH + SpeechBubble.PADDING * 2 + 1,
+        )
+        self.bubble.show_message("hello")
+        self.assertEqual(self.bubble.pixmap.cacheKey(), first.cacheKey())
+        self.assertEqual(len(self.bubble.cache), 2)
+
+        self.config.config["Theme"]["DefaultTheme"] = "dark"
+        self.bubble.update_theme()
+        self.assertNotEqual(self.bubble.pixmap.cacheKey(), first.cacheKey())
+        self.assertEqual(len(self.bubble.cache), 3)
+
+    def test_follows_anchor(self):
+        """气泡位于宠物窗口上方居中"""
+        self.bubble.show_message("hello")
+        anchor = self.anchor.frameGeometry()
+        geometry = self.bubble.geometry()
+        self.assertEqual(geometry.bottom() + 1, anchor.top())
+        self.assertLessEqual(abs(geometry.center().x() - anchor.center().x()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+import unittest
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QColor, QImage
+
+from src.animation import (
+    FRAME_FORMAT,
+    DEFAULT_FRAME_DELAY,
+    decode_asset,
+    decode_first_frame,
+    list_animation_files,
+)
+
+
+class TestSpriteSheet(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # 8x4 图集: 左半为红色帧, 右半左上角 2x2 蓝色为裁剪过透明边的帧
+        atlas = QImage(8, 4, FRAME_FORMAT)
+        atlas.fill(QColor("red"))
+        for x in range(4, 8):
+            for y in range(4):
+                atlas.setPixelColor(x, y, QColor(0, 0, 0, 0))
+        for x in range(4, 6):
+            for y in range(0, 2):
+                atlas.setPixelColor(x, y, QColor("blue"))
+        atlas.save(os.path.join(self.tmp.name, "walk.png"))
+        with open(os.path.join(self.tmp.name, "walk.json"), "w") as f:
+            json.dump(
+                {
+                    "frames": {
+                        "walk 0.aseprite": {
+                            "frame": {"x": 0, "y": 0, "w": 4, "h": 4},
+                            "duration": 80,
+                        },
+                        "walk 1.aseprite": {
+                            "frame": {"x": 4, "y": 0, "w": 2, "h": 2},
+                            "trimmed": True,
+                            "spriteSourceSize": {"x": 1, "y": 2, "w": 2, "h": 2},
+                            "sourceSize": {"w": 4, "h": 4},
+                        },
+                    },
+                    "meta": {"image": "walk.png"},
+                },
+                f,
+            )
+        self.path = os.path.join(self.tmp.name, "walk.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_decode(self):
+        """按描述切出各帧, 还原裁剪帧的位置, 缺省帧时长使用默认值"""
+        animation = decode_asset(self.path)
+        self.assertEqual(len(animation), 2)
+        self.assertEqual(animation.delays, [80, DEFAULT_FRAME_DELAY])
+        self.assertEqual(animation.size, QSize(4, 4))
+        trimmed = animation.frames[1]
+        self.assertEqual(trimmed.pixelColor(1, 2).name(), "#0000ff")
+        self.assertEqual(trimmed.pixelColor(0, 0).alpha(), 0)
+
+    def test_scaled_and_first_frame(self):
+        animation = decode_asset(self.path, QSize(8, 8))
+        self.assertEqual(animation.size, QSize(8, 8))
+        # 精灵表不解码占位帧, 避免在 GUI 线程中解码整张图集
+        self.assertTrue(decode_first_frame(self.path).isNull())
+
+    def test_list_files(self):
+        """精灵表分类只列出描述文件, GIF 分类不包含描述文件"""
+        self.assertEqual(
+            list_animation_files(self.tmp.name, "spritesheet"), [self.path]
+        )
+        self.assertEqual(
+            list_animation_files(self.tmp.name, "gif"),
+            [os.path.join(self.tmp.name, "walk.png")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
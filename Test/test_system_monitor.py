@@ -0,0 +1,82 @@
+import sys
+import unittest
+
+from PySide6.QtCore import QEventLoop, QThread, QTimer
+from PySide6.QtWidgets import QApplication
+
+from src.system_monitor import SystemMonitor, SystemSample
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class MonitorConfig:
+    """只提供采样器用到的配置项"""
+
+    def __init__(self):
+        self.config = {"Info": {"HistorySeconds": 10, "SampleIntervalMS": 50}}
+
+
+class TestSystemMonitor(unittest.TestCase):
+    def setUp(self):
+        self.config = MonitorConfig()
+        self.monitor = SystemMonitor(self.config)
+
+    def tearDown(self):
+        self.monitor.stop()
+
+    def test_samples_arrive_on_gui_thread(self):
+        """psutil 在后台线程中调用, 样本在 GUI 线程中发布"""
+        received = []
+        loop = QEventLoop()
+
+        def on_sampled(sample: SystemSample):
+            received.append((sample, QThread.currentThread()))
+            if len(received) == 2:
+                loop.quit()
+
+        self.monitor.sampled.connect(on_sampled)
+        self.monitor.start()
+        QTimer.singleShot(5000, loop.quit)
+        loop.exec()
+
+        self.assertEqual(len(received), 2)
+        for sample, thread in received:
+            self.assertIs(thread, app.thread())
+            self.assertGreaterEqual(sample.collect_ms, 0)
+            self.assertGreaterEqual(sample.recv_rate, 0)
+        self.assertLess(received[0][0].time, received[1][0].time)
+        self.assertIs(self.monitor.latest, received[-1][0])
+        self.assertEqual(self.monitor.get_cpu_usage(), received[-1][0].cpu)
+        self.assertEqual(len(self.monitor.history), 2)
+        self.assertEqual(self.monitor.history.values("cpu")[-1], received[-1][0].cpu)
+
+    def test_paused_sampler_stops_collecting(self):
+        """暂停后不再采样, 恢复后继续"""
+        received = []
+        self.monitor.sampled.connect(received.append)
+        self.monitor.set_paused(True)
+        self.monitor.start()
+        self.wait(300)
+        self.assertEqual(received, [])
+        self.monitor.set_paused(False)
+        self.wait(300)
+        self.assertGreater(len(received), 0)
+
+    def wait(self, ms):
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        loop.exec()
+
+    def test_interval_change_restarts_sampler(self):
+        """采样间隔改变后重启采样线程, 并按新间隔调整历史容量"""
+        self.monitor.start()
+        self.assertEqual(self.monitor.history.capacity, 200)
+        self.config.config["Info"]["SampleIntervalMS"] = 100
+        self.monitor.update_config()
+        self.assertEqual(self.monitor._sampler.interval, 100)
+        self.assertTrue(self.monitor._thread.isRunning())
+        self.assertEqual(self.monitor.history.capacity, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import sys
+import unittest
+
+from PySide6.QtGui import QColor, QIcon, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from src.tray_gauge import GAUGE_SIZES, TrayGauge, gauge_bucket
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestTrayGauge(unittest.TestCase):
+    def test_bucket(self):
+        self.assertEqual(gauge_bucket(0), 0)
+        self.assertEqual(gauge_bucket(2.4), 0)
+        self.assertEqual(gauge_bucket(7.6), 2)
+        self.assertEqual(gauge_bucket(100), 20)
+        self.assertEqual(gauge_bucket(130), 20)
+
+    def test_icons_are_precomputed(self):
+        """每档一个图标, 同一档位返回同一个缓存的 QIcon"""
+        face = QPixmap(64, 64)
+        face.fill(QColor("pink"))
+        gauge = TrayGauge(QIcon(face))
+        self.assertEqual(len(gauge.icons), 21)
+        self.assertIs(gauge.icon(41), gauge.icon(39))
+        self.assertIsNot(gauge.icon(41), gauge.icon(46))
+        self.assertEqual(
+            sorted(size.width() for size in gauge.icons[0].availableSizes()),
+            list(GAUGE_SIZES),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,7 +23,9 @@ def main() -> NoReturn:
 
     global_layer.system_tray.show_tray_icon()
     global_layer.system_tray.show_pet()
-    global_layer.pet_window.state_machine.transition_to(PetState.NORMAL)
+    for pet_window in global_layer.pets:
+        pet_window.state_machine.transition_to(PetState.NORMAL)
+        pet_window.say("你好呀~")
 
     sys.exit(app.exec())
 
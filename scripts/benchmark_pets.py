@@ -0,0 +1,126 @@
+"""
+[#name = benchmark]
+
+This script measures how memory and CPU usage grow with the number of pets.
+For each pet count it starts a fresh process, creates the pets through
+MainLayer (all of them share one ResourceManager, animation library,
+scheduler, system monitor and spatial index), lets them run for a while
+and reports the resident memory, the CPU time spent and the average time
+the shared scheduler spends per wakeup (state machines, movement and
+pet-to-pet collision checks).
+
+Usage: python scripts/benchmark_pets.py [--pets N ...] [--seconds S]
+Set QT_QPA_PLATFORM=offscreen to run it without a display.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+
+DEFAULT_COUNTS = [1, 3, 10, 50]
+DEFAULT_SECONDS = 10.0
+
+
+def run_child(count: int, seconds: float):
+    """在当前进程中运行 `count` 只宠物, 以 JSON 输出测量结果"""
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from src.MainLayer import MainLayer
+    from src.state.base_state import PetState
+
+    app = QApplication(sys.argv)
+    process = psutil.Process()
+    main_layer = MainLayer()
+    while len(main_layer.pets) < count:
+        main_layer.add_pet()
+    for pet_window in main_layer.pets:
+        pet_window.show()
+        pet_window.state_machine.transition_to(PetState.NORMAL)
+
+    # 跳过启动阶段的解码, 只统计稳定运行时的开销
+    warmup = min(2.0, seconds / 2)
+    QTimer.singleShot(int(warmup * 1000), app.quit)
+    app.exec()
+    scheduler = main_layer.scheduler
+    cpu_start = sum(process.cpu_times()[:2])
+    busy_start, wakeups_start = scheduler.busy_ms, scheduler.wakeups
+    wall_start = time.monotonic()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    wall = time.monotonic() - wall_start
+    cpu = sum(process.cpu_times()[:2]) - cpu_start
+    wakeups = scheduler.wakeups - wakeups_start
+
+    library = main_layer.animation_library
+    print(
+        json.dumps(
+            {
+                "pets": count,
+                "rss_mb": process.memory_info().rss / (1024 * 1024),
+                "cpu_percent": cpu / wall * 100,
+                "wakeups_per_second": wakeups / wall,
+                "tick_ms": (scheduler.busy_ms - busy_start) / max(wakeups, 1),
+                "animations": len(library.cache),
+                "frame_mb": library.store.bytes / (1024 * 1024),
+            }
+        ),
+        flush=True,
+    )
+    os._exit(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multiple pets.")
+    parser.add_argument("--pets", type=int, nargs="+", default=DEFAULT_COUNTS)
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.pets[0], args.seconds)
+        return
+
+    # 每个数量在独立进程中运行, 避免前一次的内存影响结果
+    results = []
+    for count in args.pets:
+        output = subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--child",
+                "--pets",
+                str(count),
+                "--seconds",
+                str(args.seconds),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    base = results[0]
+    print(
+        f"{'pets':>5} {'RSS MB':>8} {'+MB/pet':>8} {'CPU %':>7} "
+        f"{'wakeups/s':>10} {'ms/tick':>8}"
+    )
+    for result in results:
+        extra = result["pets"] - base["pets"]
+        per_pet = (result["rss_mb"] - base["rss_mb"]) / extra if extra else 0.0
+        print(
+            f"{result['pets']:>5} {result['rss_mb']:>8.1f} {per_pet:>8.2f} "
+            f"{result['cpu_percent']:>7.1f} {result['wakeups_per_second']:>10.1f} "
+            f"{result['tick_ms']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
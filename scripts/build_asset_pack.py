@@ -0,0 +1,32 @@
+"""
+[#name = assetpack]
+
+This script decodes every animation listed under Resources.Gif in
+'resources/config/file_index.json' (GIFs or sprite sheets, according to
+Resources.GifFormat) and writes them into a single
+memory-mappable asset pack (Resources.Pack). When the pack exists,
+ResourceManager reads frames from it instead of the loose GIF files.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtGui import QGuiApplication
+
+from src.config import Config
+from src.ResourceManager import build_asset_pack
+
+
+def main():
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)
+    resources = Config.PATH_CONFIG["Resources"]
+    output_path = resources["Pack"]["RelativePath"]
+    count = build_asset_pack(resources["Gif"], output_path, resources["GifFormat"])
+    size = os.path.getsize(output_path) / (1024 * 1024)
+    print(f"Packed {count} animations into {output_path} ({size:.1f} MB).")
+
+
+if __name__ == "__main__":
+    main()
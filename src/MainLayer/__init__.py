@@ -1,19 +1,118 @@
+import os
+import time
+from typing import Callable, List
+
+from PySide6.QtCore import QPoint
+
+from ..animation import AnimationLibrary
+from ..system_monitor import SystemMonitor
 from ..system_tray import SystemTray
 from ..config import Config
 from ..ResourceManager import ResourceManager
 from ..pet_window import PetWindow
+from ..spatial_hash import SpatialHash
+from ..state import Scheduler
 
 
 class MainLayer:
-    """全局管理层"""
+    """全局管理层
+
+    可同时管理多只宠物. 资源管理器, 已解码的动画库, 定时调度器, 系统指标采样器和空间索引由所有宠物共用,
+    每只宠物只持有自己的窗口, 播放器和状态机, 因此内存和 CPU 开销随宠物数量亚线性增长.
+    """
+
+    PET_SPACING = 40
+    """新宠物相对上一只宠物的错开距离(px)"""
 
-    def __init__(self) -> None:
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """`clock` 为调度器的时钟(s), 离线导出时传入虚拟时钟"""
         self.config: Config = Config(self)
         self.resource_manager: ResourceManager = ResourceManager(
             Config.PATH_CONFIG["Resources"], self
         )
-        self.pet_window: PetWindow = PetWindow(self.config, self)
+        self.animation_library: AnimationLibrary = AnimationLibrary(
+            self.config.config["Cache"]["MaxEntries"],
+            self.config.config["Cache"]["MaxMemoryMB"] * 1024 * 1024,
+        )
+        self.scheduler: Scheduler = Scheduler(clock=clock)
+        self.system_monitor: SystemMonitor = SystemMonitor(self.config)
+        self.system_monitor.start()
+        # 可见宠物的窗口区域, 格子取宠物尺寸, 移动时按邻居做碰撞检测
+        self.pet_index: SpatialHash[PetWindow] = SpatialHash(self._pet_cell_size())
+        self.pets: List[PetWindow] = []
+        self.quitting: bool = False
+        for _ in range(max(1, self.config.config["Pets"]["Count"])):
+            self.add_pet()
         self.system_tray: SystemTray = SystemTray(self.pet_window, self.config, self)
+        self.update_sampling()
+
+    @property
+    def pet_window(self) -> PetWindow:
+        """第一只宠物(设置对话框等只需一个父窗口的场景使用)"""
+        return self.pets[0]
+
+    def add_pet(self) -> PetWindow:
+        """创建一只新宠物(未显示)"""
+        pet_window = PetWindow(self.config, self)
+        if self.pets:
+            # 错开位置, 避免与上一只宠物完全重叠
+            pet_window.move(
+                self.pets[-1].pos() + QPoint(self.PET_SPACING, self.PET_SPACING)
+            )
+        self.pets.append(pet_window)
+        return pet_window
+
+    def remove_pet(self, pet_window: PetWindow):
+        """宠物窗口关闭后注销; 最后一只宠物关闭时退出程序"""
+        if pet_window in self.pets:
+            self.pets.remove(pet_window)
+        self.pet_index.remove(pet_window)
+        if not self.pets and not self.quitting:
+            self.quit()
+        elif self.pets:
+            self.update_sampling()
+
+    def quit(self):
+        """关闭所有宠物并退出程序"""
+        self.quitting = True
+        if hasattr(self, "system_tray"):
+            self.system_tray.hide_tray_icon()
+        for pet_window in list(self.pets):
+            pet_window.close()
+        self.system_monitor.stop()
+        # os._exit 不会执行析构, 需显式断开共享内存
+        self.resource_manager.close()
+        os._exit(0)
+
+    def update_sampling(self):
+        """所有宠物都挂起且托盘不显示负载时暂停系统采样, 否则恢复"""
+        idle = all(pet_window.suspended for pet_window in self.pets)
+        if hasattr(self, "system_tray"):
+            idle = idle and not self.system_tray.shows_gauge()
+        self.system_monitor.set_paused(idle)
+
+    def prune_animations(self):
+        """丢弃所有宠物都不再使用的尺寸/帧率对应的动画和解码任务"""
+        in_use = {pet_window.frame_params() for pet_window in self.pets}
+        self.animation_library.retain(lambda key: key[1:] in in_use)
+
+    def _pet_cell_size(self) -> int:
+        return max(
+            self.config.config["Window"]["Width"],
+            self.config.config["Window"]["Height"],
+        )
+
+    def update_config(self):
+        """配置改变后更新共用组件和所有宠物"""
+        self.animation_library.resize(
+            self.config.config["Cache"]["MaxEntries"],
+            self.config.config["Cache"]["MaxMemoryMB"] * 1024 * 1024,
+        )
+        self.pet_index.resize(self._pet_cell_size())
+        self.system_monitor.update_config()
+        for pet_window in self.pets:
+            pet_window.update_config()
+        self.system_tray.update_config()
 
 
 __all__ = [
@@ -1,9 +1,22 @@
 from functools import cache
 import os
-from typing import Any, Dict, List, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QGuiApplication, QImage
 
+from ..animation import (
+    FRAME_FORMAT,
+    Animation,
+    FrameCache,
+    decode_first_frame,
+    device_size,
+    list_animation_files,
+)
 from ..auto_typehint import FileIndexHint, MusicHint, GifHint
+from ..config import Config
+from .asset_pack import AssetPack, build_asset_pack, pack_key
+from .shared_pack import SharedAssetPack
 
 if TYPE_CHECKING:
     from ..MainLayer import MainLayer
@@ -20,12 +33,75 @@ def load_files(resource_dict: Any) -> Dict[str, List[str]]:
     }
 
 
+def load_gif_files(resource_dict: Any, formats: Dict[str, str]) -> Dict[str, List[str]]:
+    """按各分类配置的格式(GIF 或精灵表)列出动画文件"""
+    return {
+        key: list_animation_files(str(path), formats.get(key, "gif"))
+        for key, path in resource_dict.items()
+    }
+
+
+def load_pack_files(resource_dict: Any, pack: AssetPack) -> Dict[str, List[str]]:
+    """按资源包索引生成与散装目录一致的文件路径"""
+    categories = pack.categories()
+    return {
+        key: [os.path.join(str(path), file) for file in categories.get(key, [])]
+        for key, path in resource_dict.items()
+    }
+
+
 class ResourceManager:
     def __init__(self, config: FileIndexHint.ResourcesParam, main_layer: "MainLayer"):
         self._main_layer: MainLayer = main_layer
         self._resource_config: FileIndexHint.ResourcesParam = config
         self._music = load_files(self._resource_config.get("Music", {}))
-        self._gif = load_files(self._resource_config.get("Gif", {}))
+
+        # 动画优先从资源包读取(文件映射本身即可在进程间共享页缓存),
+        # 没有资源包时可选地由多个进程共用一份共享内存中的解码结果, 否则使用散装目录
+        self._pack: Optional[AssetPack] = AssetPack.open(
+            self._resource_config["Pack"]["RelativePath"]
+        )
+        if self._pack is None and main_layer.config.config["Cache"]["SharedFrames"]:
+            self._pack = self._open_shared_pack()
+        self._pack_keys: Dict[str, str] = {}
+        if self._pack is not None:
+            self._gif = load_pack_files(
+                self._resource_config.get("Gif", {}), self._pack
+            )
+            for category, files in self._gif.items():
+                for file in files:
+                    self._pack_keys[file] = pack_key(category, os.path.basename(file))
+        else:
+            self._gif = load_gif_files(
+                self._resource_config.get("Gif", {}),
+                self._resource_config.get("GifFormat", {}),
+            )
+
+        self.frame_cache: FrameCache = FrameCache(
+            Config.PATH_CONFIG["FrameCache"]["RelativePath"]
+        )
+
+    def _open_shared_pack(self) -> Optional[SharedAssetPack]:
+        """附加或发布按主屏幕设备像素尺寸解码的共享资源包"""
+        config = self._main_layer.config.config["Window"]
+        screen = QGuiApplication.primaryScreen()
+        ratio = screen.devicePixelRatio() if screen is not None else 1.0
+        return SharedAssetPack.attach_or_publish(
+            self._resource_config.get("Gif", {}),
+            self._resource_config.get("GifFormat", {}),
+            device_size(QSize(config["Width"], config["Height"]), ratio),
+        )
+
+    def close(self):
+        """退出前断开共享内存中的资源包, 最后一个进程断开时释放"""
+        if isinstance(self._pack, SharedAssetPack):
+            self._pack.close()
+            self._pack = None
+
+    @property
+    def uses_pack(self) -> bool:
+        """是否正在使用资源包"""
+        return self._pack is not None
 
     @cache
     def get_gif(self, key: GifHint.GifDirLiteral) -> List[str]:
@@ -36,6 +112,45 @@ class ResourceManager:
     def get_all_gif(self) -> List[str]:
         return [file for files in self._gif.values() for file in files]
 
+    def has_gif(self, path: str) -> bool:
+        """动画资源是否存在(资源包或磁盘)"""
+        return path in self._pack_keys or os.path.exists(path)
+
+    def load_animation(self, path: str, size: QSize) -> Animation:
+        """加载缩放到 `size` 的动画帧
+
+        资源包中尺寸一致的帧直接零拷贝返回; 其余情况经由磁盘帧缓存预缩放.
+        """
+        key = self._pack_keys.get(path, None)
+        if self._pack is None or key is None:
+            return self.frame_cache.load(path, size)
+
+        pack = self._pack
+        animation = pack.animation(key)
+        if animation.size == size:
+            return animation
+        return self.frame_cache.load(
+            path,
+            size,
+            digest=pack.entries[key]["Sha1"],
+            decode=lambda: pack.animation(key).scaled(size),
+        )
+
+    def load_first_frame(self, path: str, size: QSize) -> Optional[QImage]:
+        """只解码第一帧, 用于完整动画尚未就绪时的占位显示"""
+        key = self._pack_keys.get(path, None)
+        if self._pack is not None and key is not None:
+            image = self._pack.animation(key).frames[0]
+        else:
+            image = decode_first_frame(path)
+            if image.isNull():
+                return None
+        return image.convertToFormat(FRAME_FORMAT).scaled(
+            size,
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+
     @cache
     def get_music(self, key: MusicHint.MusicDirLiteral) -> List[str]:
         """获取音乐资源"""
@@ -47,5 +162,8 @@ class ResourceManager:
 
 
 __all__ = [
+    "AssetPack",
     "ResourceManager",
+    "SharedAssetPack",
+    "build_asset_pack",
 ]
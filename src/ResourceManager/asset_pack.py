@@ -0,0 +1,180 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Any, BinaryIO, Dict, List, Optional, TypedDict
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+
+from ..animation import (
+    FRAME_FORMAT,
+    Animation,
+    asset_files,
+    decode_asset,
+    list_animation_files,
+)
+
+PACK_MAGIC = b"DOROPACK"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<8sIQI")  # 魔数, 版本, 索引偏移, 索引长度
+PACK_ALIGNMENT = 64  # 帧数据按缓存行对齐
+
+
+class PackEntry(TypedDict):
+    Category: str
+    File: str
+    Sha1: str
+    Width: int
+    Height: int
+    BytesPerLine: int
+    Frames: List[List[int]]  # [[文件内偏移, 帧时长(ms)], ...]
+
+
+def _align(value: int) -> int:
+    return (value + PACK_ALIGNMENT - 1) // PACK_ALIGNMENT * PACK_ALIGNMENT
+
+
+def pack_key(category: str, file: str) -> str:
+    return f"{category}/{file}"
+
+
+class AssetPack:
+    """只读的动画资源包
+
+    文件结构: 头部(魔数/版本/索引位置) + 对齐后的帧数据 + 末尾的 JSON 索引.
+    帧以原始尺寸的 premultiplied ARGB32 存储, 通过 mmap 打开后直接包装为 QImage, 不做拷贝.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.entries: Dict[str, PackEntry] = read_pack_index(self._mmap, path)
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._mmap)
+        # 帧数据所在内存的持有者, 由 Animation 引用以保证帧存活期间不被释放
+        self._owner: Any = self._mmap
+
+    @classmethod
+    def open(cls, path: str) -> Optional["AssetPack"]:
+        """打开资源包, 不存在或格式不符时返回 None"""
+        if not os.path.isfile(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"资源包无法读取, 改用散装资源: {e}")
+            return None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def categories(self) -> Dict[str, List[str]]:
+        """按分类列出包内的文件名"""
+        result: Dict[str, List[str]] = {}
+        for entry in self.entries.values():
+            result.setdefault(entry["Category"], []).append(entry["File"])
+        return result
+
+    def animation(self, key: str) -> Animation:
+        """以零拷贝方式读取动画帧(帧数据直接引用 mmap)"""
+        entry = self.entries[key]
+        width, height = entry["Width"], entry["Height"]
+        bytes_per_line = entry["BytesPerLine"]
+        frame_bytes = bytes_per_line * height
+        frames: List[QImage] = []
+        delays: List[int] = []
+        for offset, delay in entry["Frames"]:
+            frames.append(
+                QImage(
+                    self._view[offset : offset + frame_bytes],
+                    width,
+                    height,
+                    bytes_per_line,
+                    FRAME_FORMAT,
+                )
+            )
+            delays.append(delay)
+        return Animation(frames, delays, source=key, buffer=self._owner)
+
+
+def read_pack_index(buffer: Any, name: str) -> Dict[str, PackEntry]:
+    """校验资源包头部并读取索引, 头部不符时抛出 ValueError"""
+    magic, version, index_offset, index_size = PACK_HEADER.unpack_from(buffer, 0)
+    if magic != PACK_MAGIC or version != PACK_VERSION:
+        raise ValueError(f"不支持的资源包: {name}")
+    return json.loads(bytes(buffer[index_offset : index_offset + index_size]))
+
+
+def write_asset_pack(
+    f: BinaryIO,
+    gif_dirs: Dict[str, Any],
+    formats: Optional[Dict[str, str]] = None,
+    size: Optional[QSize] = None,
+) -> int:
+    """将各分类目录下的动画解码后写入 `f`, 返回打包的动画数量
+
+    `formats` 为各分类的资源格式(GIF 或精灵表), 未指定的分类按 GIF 处理;
+    指定 `size` 时帧按该尺寸缩放后写入, 否则保留原始尺寸.
+    """
+    formats = formats or {}
+    entries: Dict[str, PackEntry] = {}
+    start = f.tell()
+    # 头部在写完索引后回填
+    f.write(bytes(PACK_HEADER.size))
+    for category, directory in gif_dirs.items():
+        files = list_animation_files(str(directory), formats.get(category, "gif"))
+        for path in sorted(files):
+            file = os.path.basename(path)
+            animation = decode_asset(path, size)
+            if not len(animation):
+                continue
+            sha1 = hashlib.sha1()
+            for source_path in asset_files(path):
+                with open(source_path, "rb") as source:
+                    sha1.update(source.read())
+            digest = sha1.hexdigest()
+
+            frames: List[List[int]] = []
+            for frame, delay in zip(animation.frames, animation.delays):
+                offset = _align(f.tell() - start)
+                f.seek(start + offset)
+                f.write(frame.constBits())
+                frames.append([offset, delay])
+            first = animation.frames[0]
+            entries[pack_key(category, file)] = {
+                "Category": category,
+                "File": file,
+                "Sha1": digest,
+                "Width": first.width(),
+                "Height": first.height(),
+                "BytesPerLine": first.bytesPerLine(),
+                "Frames": frames,
+            }
+
+    index = json.dumps(entries, ensure_ascii=False).encode("utf-8")
+    index_offset = f.tell() - start
+    f.write(index)
+    end = f.tell()
+    f.seek(start)
+    f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, index_offset, len(index)))
+    f.seek(end)
+    return len(entries)
+
+
+def build_asset_pack(
+    gif_dirs: Dict[str, Any],
+    output_path: str,
+    formats: Optional[Dict[str, str]] = None,
+) -> int:
+    """将各分类目录下的动画解码后写入资源包文件, 返回打包的动画数量"""
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        count = write_asset_pack(f, gif_dirs, formats)
+    os.replace(tmp_path, output_path)
+    return count
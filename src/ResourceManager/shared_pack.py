@@ -0,0 +1,111 @@
+import hashlib
+import io
+import os
+import time
+from typing import Any, Dict, Optional
+
+from PySide6.QtCore import QSharedMemory, QSize
+
+from ..animation import asset_files, list_animation_files
+from .asset_pack import PACK_HEADER, AssetPack, read_pack_index, write_asset_pack
+
+SHARED_PACK_PREFIX = "doro-frames-"
+SHARED_PACK_ATTACH_RETRIES = 20
+"""发布者正在写入时, 等待其完成的重试次数(每次 50ms)"""
+
+
+def shared_pack_key(
+    gif_dirs: Dict[str, Any], formats: Dict[str, str], size: QSize
+) -> str:
+    """共享内存段的名称, 由资源文件列表(路径, 大小, 修改时间)和帧尺寸决定
+
+    资源或尺寸不同的进程使用不同的段, 不会读到不匹配的帧.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{size.width()}x{size.height()}".encode())
+    for category, directory in sorted(gif_dirs.items()):
+        files = list_animation_files(str(directory), formats.get(category, "gif"))
+        for path in sorted(files):
+            for source_path in asset_files(path):
+                stat = os.stat(source_path)
+                digest.update(
+                    f"{category}|{os.path.abspath(source_path)}|"
+                    f"{stat.st_size}|{stat.st_mtime_ns}\n".encode()
+                )
+    return SHARED_PACK_PREFIX + digest.hexdigest()
+
+
+class SharedAssetPack(AssetPack):
+    """进程间共享的动画资源包
+
+    格式与 `AssetPack` 相同, 但存放在以资源内容命名的共享内存段中(QSharedMemory).
+    第一个进程解码所有动画并发布, 之后的进程只读附加, 帧直接包装为引用共享内存的 QImage.
+    共享内存段由系统按附加计数管理, 最后一个进程 `close()` 后释放.
+    """
+
+    def __init__(self, memory: QSharedMemory):
+        self.path: str = memory.key()
+        self.memory: QSharedMemory = memory
+        self._view = memory.constData()
+        self.entries = read_pack_index(self._view, self.path)
+        self._owner = memory
+
+    @classmethod
+    def attach_or_publish(
+        cls,
+        gif_dirs: Dict[str, Any],
+        formats: Dict[str, str],
+        size: QSize,
+    ) -> Optional["SharedAssetPack"]:
+        """附加到其他进程已发布的资源包, 不存在时解码并发布; 失败时返回 None"""
+        key = shared_pack_key(gif_dirs, formats, size)
+        memory = QSharedMemory(key)
+        pack = cls._attach(memory)
+        if pack is not None:
+            return pack
+
+        buffer = io.BytesIO()
+        write_asset_pack(buffer, gif_dirs, formats, size)
+        data = buffer.getbuffer()
+        if not memory.create(len(data)):
+            # 其他进程抢先发布了同一资源包
+            if memory.error() == QSharedMemory.SharedMemoryError.AlreadyExists:
+                return cls._attach(memory)
+            print(f"无法创建共享帧缓存: {memory.errorString()}")
+            return None
+
+        memory.lock()
+        try:
+            target = memory.data()
+            # 头部最后写入, 附加方看到合法头部时数据一定已完整
+            target[PACK_HEADER.size : len(data)] = data[PACK_HEADER.size :]
+            target[: PACK_HEADER.size] = data[: PACK_HEADER.size]
+        finally:
+            memory.unlock()
+        data.release()
+        return cls(memory)
+
+    @classmethod
+    def _attach(cls, memory: QSharedMemory) -> Optional["SharedAssetPack"]:
+        if not memory.attach(QSharedMemory.AccessMode.ReadOnly):
+            return None
+        for _ in range(SHARED_PACK_ATTACH_RETRIES):
+            memory.lock()
+            try:
+                return cls(memory)
+            except ValueError:
+                # 发布者创建后尚未写完
+                pass
+            finally:
+                memory.unlock()
+            time.sleep(0.05)
+        print(f"共享帧缓存未就绪: {memory.key()}")
+        memory.detach()
+        return None
+
+    def close(self):
+        """断开共享内存, 最后一个断开的进程会释放共享内存段
+
+        此后不可再使用本资源包中的帧.
+        """
+        self.memory.detach()
@@ -0,0 +1,66 @@
+from .frame_cache import FrameCache
+from .frame_store import DedupStats, FrameStore
+from .frames import (
+    DEFAULT_FRAME_DELAY,
+    FRAME_FORMAT,
+    Animation,
+    decode_animation,
+    device_size,
+)
+from .governor import limit_frame_rate
+from .library import AnimationLibrary
+from .loader import AnimationKey, AnimationLoader, PrefetchStats
+from .lru_cache import CacheStats, LRUCache
+from .particles import (
+    PARTICLE_KINDS,
+    ParticleKind,
+    ParticleLayer,
+    ParticleSystem,
+    particle_draw_list,
+)
+from .player import AnimationPlayer, SwitchStats
+from .sprite_sheet import (
+    ANIMATION_FORMATS,
+    asset_files,
+    decode_asset,
+    decode_first_frame,
+    decode_sprite_sheet,
+    is_sprite_sheet,
+    list_animation_files,
+)
+from .sprite_view import SpriteView
+from .transition import crossfade
+
+__all__ = [
+    "ANIMATION_FORMATS",
+    "DEFAULT_FRAME_DELAY",
+    "FRAME_FORMAT",
+    "PARTICLE_KINDS",
+    "Animation",
+    "AnimationKey",
+    "AnimationLibrary",
+    "AnimationLoader",
+    "AnimationPlayer",
+    "CacheStats",
+    "DedupStats",
+    "FrameCache",
+    "FrameStore",
+    "LRUCache",
+    "ParticleKind",
+    "ParticleLayer",
+    "ParticleSystem",
+    "PrefetchStats",
+    "SpriteView",
+    "SwitchStats",
+    "asset_files",
+    "particle_draw_list",
+    "crossfade",
+    "decode_animation",
+    "decode_asset",
+    "decode_first_frame",
+    "decode_sprite_sheet",
+    "device_size",
+    "is_sprite_sheet",
+    "list_animation_files",
+    "limit_frame_rate",
+]
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+
+from ..utils.FileIO import json_dump, json_load
+from .frames import FRAME_FORMAT, Animation
+from .sprite_sheet import asset_files, decode_asset
+
+
+class FrameCache:
+    """磁盘帧缓存
+
+    以源文件内容哈希 + 目标尺寸为键, 保存已解码并预缩放的 ARGB32 帧,
+    播放时直接读取原始像素, 不再逐帧解码和缩放. 可在工作线程中调用.
+    每个条目由 `<key>.json`(尺寸/帧时长等索引) 和 `<key>.bin`(连续的像素数据) 组成.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir: str = cache_dir
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def file_digest(self, path: str) -> str:
+        """源文件内容哈希(按修改时间和大小缓存)"""
+        stat = os.stat(path)
+        cached = self._digests.get(path, None)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        self._digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def source_digest(self, path: str) -> str:
+        """动画全部源文件(精灵表为描述文件 + 图集)的内容哈希"""
+        files = asset_files(path)
+        if len(files) == 1:
+            return self.file_digest(path)
+        combined = "".join(self.file_digest(file) for file in files)
+        return hashlib.sha1(combined.encode("ascii")).hexdigest()
+
+    def key(self, path: str, size: QSize, digest: Optional[str] = None) -> str:
+        digest = digest or self.source_digest(path)
+        return f"{digest}_{size.width()}x{size.height()}"
+
+    def load(
+        self,
+        path: str,
+        size: QSize,
+        digest: Optional[str] = None,
+        decode: Optional[Callable[[], Animation]] = None,
+    ) -> Animation:
+        """读取预缩放帧, 缓存不存在或失效时重新解码并写入
+
+        `digest` 和 `decode` 用于源文件不在磁盘上的情况(如资源包),
+        分别提供源内容哈希和生成预缩放帧的方法.
+        """
+        key = self.key(path, size, digest)
+        animation = self._read(key, path)
+        if animation is not None:
+            self.hits += 1
+            return animation
+
+        self.misses += 1
+        animation = decode() if decode else decode_asset(path, size)
+        if len(animation):
+            try:
+                self._write(key, animation)
+            except OSError as e:
+                print(f"帧缓存写入失败: {e}")
+        return animation
+
+    def prune(self, keep_sizes: Iterable[QSize]):
+        """删除尺寸不在 `keep_sizes` 中的缓存条目(各屏幕的设备像素尺寸各保留一份)"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        suffixes = tuple(f"_{size.width()}x{size.height()}" for size in keep_sizes)
+        for file in os.listdir(self.cache_dir):
+            name, ext = os.path.splitext(file)
+            if ext in (".json", ".bin", ".tmp") and not name.endswith(suffixes):
+                try:
+                    os.remove(os.path.join(self.cache_dir, file))
+                except OSError:
+                    pass
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".bin"
+
+    def _read(self, key: str, source: str) -> Optional[Animation]:
+        meta_path, data_path = self._paths(key)
+        meta = json_load(meta_path, replace=False)
+        if not meta or meta.get("Version") != self.VERSION:
+            return None
+        try:
+            with open(data_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        width, height = meta["Width"], meta["Height"]
+        bytes_per_line = meta["BytesPerLine"]
+        frame_bytes = bytes_per_line * height
+        delays = meta["Delays"]
+        if len(data) != frame_bytes * len(delays):
+            return None
+
+        # 帧直接引用读入的缓冲区, 不再额外拷贝
+        view = memoryview(data)
+        frames = [
+            QImage(
+                view[i * frame_bytes : (i + 1) * frame_bytes],
+                width,
+                height,
+                bytes_per_line,
+                FRAME_FORMAT,
+            )
+            for i in range(len(delays))
+        ]
+        return Animation(frames, list(delays), source=source, buffer=data)
+
+    def _write(self, key: str, animation: Animation):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, data_path = self._paths(key)
+        first = animation.frames[0]
+
+        # 先写像素数据再写索引, 索引存在即表示条目完整
+        tmp_path = f"{data_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            for frame in animation.frames:
+                f.write(frame.constBits())
+        os.replace(tmp_path, data_path)
+        json_dump(
+            meta_path,
+            {
+                "Version": self.VERSION,
+                "Source": animation.source,
+                "Width": first.width(),
+                "Height": first.height(),
+                "BytesPerLine": first.bytesPerLine(),
+                "Delays": animation.delays,
+            },
+        )
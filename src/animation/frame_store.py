@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional, TypedDict
+
+from PySide6.QtGui import QImage
+
+from .frames import Animation
+
+
+class DedupStats(TypedDict):
+    frames: int  # 动画总帧数
+    stored: int  # 新写入仓库的帧数
+    dedup_ratio: float  # 复用已有帧(同一动画内或其他动画)的帧所占比例
+    bytes_saved: int  # 因复用而少占用的字节数
+
+
+class FrameStore:
+    """按内容哈希保存帧的仓库
+
+    像素完全相同的帧(同一动画中的停顿帧/重复循环, 或不同动画之间的相同帧)只保留一份,
+    动画只持有对这些共享帧的引用和各自的帧时长. 帧按引用计数管理, 动画被释放后自动回收.
+    """
+
+    def __init__(self):
+        self._frames: Dict[bytes, QImage] = {}
+        self._refs: Dict[bytes, int] = {}
+        self.dedup: Dict[str, DedupStats] = {}  # 按动画来源记录的去重统计
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def bytes(self) -> int:
+        """仓库中帧实际占用的字节数"""
+        return sum(frame.sizeInBytes() for frame in self._frames.values())
+
+    def intern(self, animation: Animation) -> Animation:
+        """将动画的帧换成仓库中的共享帧, 返回新的动画对象"""
+        frames: List[QImage] = []
+        stored = stored_bytes = 0
+        for frame, digest in zip(animation.frames, animation.digests()):
+            shared = self._frames.get(digest, None)
+            if shared is None:
+                shared = self._frames[digest] = frame
+                stored += 1
+                stored_bytes += frame.sizeInBytes()
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+            frames.append(shared)
+
+        total = len(frames)
+        self.dedup[animation.source] = {
+            "frames": total,
+            "stored": stored,
+            "dedup_ratio": (total - stored) / total if total else 0.0,
+            "bytes_saved": animation.logical_bytes - stored_bytes,
+        }
+        return animation.with_frames(frames)
+
+    def release(self, animation: Animation):
+        """释放动画对共享帧的引用, 不再被引用的帧从仓库中移除"""
+        for digest in animation.digests():
+            count = self._refs.get(digest, 0) - 1
+            if count > 0:
+                self._refs[digest] = count
+            else:
+                self._refs.pop(digest, None)
+                self._frames.pop(digest, None)
+
+    def stats(self, source: str) -> Optional[DedupStats]:
+        """某个动画最近一次入库时的去重统计"""
+        return self.dedup.get(source, None)
+
+    def clear(self):
+        self._frames.clear()
+        self._refs.clear()
+        self.dedup.clear()
@@ -0,0 +1,239 @@
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PySide6.QtCore import QRect, QRectF, QSize, Qt
+from PySide6.QtGui import QImage, QImageReader
+
+FRAME_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+"""缓存帧统一使用的像素格式(可直接用于绘制, 无需再转换)"""
+
+DEFAULT_FRAME_DELAY = 100
+"""GIF 未声明帧时长时使用的默认值(ms)"""
+
+HIT_ALPHA = 32
+"""点击检测时视为"点中"的最小 alpha 值, 避免边缘的半透明光晕也能触发拖拽"""
+
+
+def frame_pixels(frame: QImage) -> np.ndarray:
+    """以 (高, 宽 * 4) 的字节数组查看帧像素(不拷贝)"""
+    height, bytes_per_line = frame.height(), frame.bytesPerLine()
+    pixels = np.frombuffer(frame.constBits(), np.uint8, count=height * bytes_per_line)
+    return pixels.reshape(height, bytes_per_line)[:, : frame.width() * 4]
+
+
+def device_size(size: QSize, device_pixel_ratio: float) -> QSize:
+    """逻辑尺寸 -> 设备像素尺寸"""
+    return QSize(
+        round(size.width() * device_pixel_ratio),
+        round(size.height() * device_pixel_ratio),
+    )
+
+
+def frame_diff_rect(previous: QImage, current: QImage) -> QRect:
+    """两帧之间像素有变化的最小矩形, 完全相同时返回空矩形"""
+    if previous.size() != current.size() or previous.format() != current.format():
+        return current.rect()
+    changed = frame_pixels(previous) != frame_pixels(current)
+    rows = np.flatnonzero(changed.any(axis=1))
+    if not len(rows):
+        return QRect()
+    columns = np.flatnonzero(changed.any(axis=0)) // 4
+    return QRect(
+        int(columns[0]),
+        int(rows[0]),
+        int(columns[-1] - columns[0] + 1),
+        int(rows[-1] - rows[0] + 1),
+    )
+
+
+def frame_digest(frame: QImage) -> bytes:
+    """帧内容的哈希(包含尺寸和格式), 像素完全相同的帧得到相同的值"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        f"{frame.width()}x{frame.height()}@{frame.devicePixelRatio()}:"
+        f"{frame.format().value}".encode("ascii")
+    )
+    digest.update(np.ascontiguousarray(frame_pixels(frame)))
+    return digest.digest()
+
+
+class Animation:
+    """已解码的动画: 帧序列 + 每帧时长(ms)"""
+
+    def __init__(
+        self,
+        frames: List[QImage],
+        delays: List[int],
+        source: str = "",
+        buffer: Optional[Any] = None,
+    ):
+        self.frames: List[QImage] = frames
+        self.delays: List[int] = delays
+        self.source: str = source
+        # 帧数据直接引用外部缓冲区时, 需要保证其生命周期不短于帧本身
+        self.buffer: Optional[Any] = buffer
+        self._dirty_rects: Optional[List[QRect]] = None
+        self._digests: Optional[List[bytes]] = None
+        self._opaque_rect: Optional[QRect] = None
+        self._hit_masks: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @property
+    def size(self) -> QSize:
+        """帧尺寸(设备像素)"""
+        return self.frames[0].size() if self.frames else QSize()
+
+    @property
+    def device_pixel_ratio(self) -> float:
+        """帧的设备像素比"""
+        return self.frames[0].devicePixelRatio() if self.frames else 1.0
+
+    @property
+    def logical_size(self) -> QSize:
+        """帧的逻辑尺寸(绘制时占据的大小)"""
+        return self.to_logical(
+            QRect(0, 0, self.size.width(), self.size.height())
+        ).size()
+
+    def to_logical(self, rect: QRect) -> QRect:
+        """设备像素坐标的矩形 -> 覆盖它的逻辑坐标矩形"""
+        ratio = self.device_pixel_ratio
+        if ratio == 1.0:
+            return QRect(rect)
+        return QRectF(
+            rect.x() / ratio,
+            rect.y() / ratio,
+            rect.width() / ratio,
+            rect.height() / ratio,
+        ).toAlignedRect()
+
+    def with_device_pixel_ratio(self, device_pixel_ratio: float) -> "Animation":
+        """为所有帧标记设备像素比(帧本身已按该比例解码), 绘制时按 1:1 输出, 不再缩放"""
+        for frame in self.frames:
+            frame.setDevicePixelRatio(device_pixel_ratio)
+        return self
+
+    @property
+    def duration(self) -> int:
+        """一次循环的总时长(ms)"""
+        return sum(self.delays)
+
+    @property
+    def size_in_bytes(self) -> int:
+        """帧数据占用的字节数(共享同一缓冲区的帧只计一次)"""
+        unique = {frame.cacheKey(): frame.sizeInBytes() for frame in self.frames}
+        return sum(unique.values())
+
+    @property
+    def logical_bytes(self) -> int:
+        """不去重时帧数据应占用的字节数"""
+        return sum(frame.sizeInBytes() for frame in self.frames)
+
+    def scaled(self, size: QSize) -> "Animation":
+        """缩放到目标尺寸(与 QMovie.setScaledSize 一致, 不保持宽高比)"""
+        if self.size == size:
+            return self
+        return Animation(
+            [
+                frame.scaled(
+                    size,
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+                for frame in self.frames
+            ],
+            list(self.delays),
+            source=self.source,
+        )
+
+    def digests(self) -> List[bytes]:
+        """每帧的内容哈希, 首次调用时计算"""
+        if self._digests is None:
+            self._digests = [frame_digest(frame) for frame in self.frames]
+        return self._digests
+
+    def with_frames(self, frames: List[QImage]) -> "Animation":
+        """用像素相同的另一组帧(如共享的帧)构造动画, 保留已计算的哈希和重绘区域"""
+        animation = Animation(frames, self.delays, self.source, self.buffer)
+        animation._dirty_rects = self._dirty_rects
+        animation._digests = self._digests
+        animation._opaque_rect = self._opaque_rect
+        animation._hit_masks = self._hit_masks
+        return animation
+
+    def hit_masks(self) -> List[np.ndarray]:
+        """每帧的点击掩码(按行打包的位图, 每字节 8 个像素, 高位在前), 首次调用时计算
+
+        相同的掩码共享同一个数组, 可以用 `is` 判断相邻帧的掩码是否变化.
+        """
+        if self._hit_masks is None:
+            masks: List[np.ndarray] = []
+            shared: Dict[bytes, np.ndarray] = {}
+            for frame in self.frames:
+                mask = np.packbits(frame_pixels(frame)[:, 3::4] >= HIT_ALPHA, axis=1)
+                masks.append(shared.setdefault(mask.tobytes(), mask))
+            self._hit_masks = masks
+        return self._hit_masks
+
+    def hit_test(self, index: int, x: int, y: int) -> bool:
+        """第 `index` 帧在 (x, y) 处是否不透明"""
+        if not 0 <= index < len(self.frames):
+            return False
+        mask = self.hit_masks()[index]
+        if not (0 <= y < mask.shape[0] and 0 <= x < self.frames[index].width()):
+            return False
+        return bool(mask[y, x >> 3] & (0x80 >> (x & 7)))
+
+    def opaque_rect(self) -> QRect:
+        """所有帧中不透明像素的外接矩形(各帧外接矩形的并集), 首次调用时计算"""
+        if self._opaque_rect is None:
+            self._opaque_rect = QRect()
+            if self.frames:
+                visible = np.zeros(
+                    (self.frames[0].height(), self.frames[0].width()), dtype=bool
+                )
+                for frame in self.frames:
+                    if frame.size() != self.frames[0].size():
+                        return self.frames[0].rect()
+                    # premultiplied ARGB32 按字节为 B, G, R, A
+                    visible |= frame_pixels(frame)[:, 3::4] != 0
+                rows = np.flatnonzero(visible.any(axis=1))
+                if len(rows):
+                    columns = np.flatnonzero(visible.any(axis=0))
+                    self._opaque_rect = QRect(
+                        int(columns[0]),
+                        int(rows[0]),
+                        int(columns[-1] - columns[0] + 1),
+                        int(rows[-1] - rows[0] + 1),
+                    )
+        return self._opaque_rect
+
+    def dirty_rects(self) -> List[QRect]:
+        """第 i 项为从上一帧(首帧对应末帧)切换到第 i 帧时需要重绘的区域, 首次调用时计算"""
+        if self._dirty_rects is None:
+            self._dirty_rects = [
+                frame_diff_rect(self.frames[index - 1], frame)
+                for index, frame in enumerate(self.frames)
+            ]
+        return self._dirty_rects
+
+
+def decode_animation(path: str, size: Optional[QSize] = None) -> Animation:
+    """解码动画文件, 指定 `size` 时缩放到目标尺寸"""
+    reader = QImageReader(path)
+    frames: List[QImage] = []
+    delays: List[int] = []
+    while True:
+        image = reader.read()
+        if image.isNull():
+            break
+        delay = reader.nextImageDelay()
+        frames.append(image.convertToFormat(FRAME_FORMAT))
+        delays.append(delay if delay > 0 else DEFAULT_FRAME_DELAY)
+    if not frames:
+        print(f"无法解码动画: {path} ({reader.errorString()})")
+    animation = Animation(frames, delays, source=path)
+    return animation.scaled(size) if size is not None else animation
@@ -0,0 +1,42 @@
+import math
+from itertools import accumulate
+from typing import List
+
+from PySide6.QtGui import QImage
+
+from .frames import Animation
+
+
+def limit_frame_rate(animation: Animation, fps: int) -> Animation:
+    """将动画的呈现帧率限制在 `fps` 左右
+
+    以 `1000 / fps` 为间隔对时间轴采样, 每个采样点取当时应显示的源帧,
+    未被采样到的帧被丢弃, 连续采到的同一帧合并为一帧. 每次循环的总时长保持不变.
+    `fps <= 0` 表示不限制.
+    """
+    if fps <= 0 or len(animation) <= 1:
+        return animation
+
+    min_interval = 1000 / fps
+    if min(animation.delays) >= min_interval:
+        return animation
+
+    total = animation.duration
+    # 各源帧的结束时刻
+    ends = list(accumulate(animation.delays))
+    frames: List[QImage] = []
+    starts: List[int] = []
+    index, last_index = 0, -1
+    for slot in range(math.ceil(total / min_interval)):
+        # 向下取整保证采样时刻小于总时长; 四舍五入时最后一个采样点可能等于 total, 越过最后一帧
+        time = int(slot * min_interval)
+        while index < len(ends) - 1 and ends[index] <= time:
+            index += 1
+        if index == last_index:
+            continue
+        last_index = index
+        frames.append(animation.frames[index])
+        starts.append(time)
+
+    delays = [end - start for start, end in zip(starts, starts[1:] + [total])]
+    return Animation(frames, delays, source=animation.source, buffer=animation.buffer)
@@ -0,0 +1,138 @@
+from typing import Callable, Optional, Set
+
+from PySide6.QtCore import QObject, Signal
+
+from .frame_store import FrameStore
+from .frames import Animation
+from .loader import AnimationKey, AnimationLoader, PrefetchStats
+from .lru_cache import LRUCache
+
+
+class AnimationLibrary(QObject):
+    """所有宠物共用的动画库
+
+    内存中的 LRU 按 `AnimationKey` 缓存已解码的动画, 帧本身按内容去重后保存在 `store` 中,
+    未命中时在共用的线程池中解码. 多只宠物播放同一动画时只解码一次, 帧也只占一份内存.
+    """
+
+    loaded = Signal(object, object)  # (AnimationKey, Animation)
+
+    PREFETCH_HEADROOM = 0.75
+    """缓存用量超过预算的该比例后停止预取, 为正在播放的动画留出空间"""
+
+    def __init__(
+        self, max_entries: int, max_bytes: int, parent: Optional[QObject] = None
+    ):
+        super().__init__(parent)
+        self.store: FrameStore = FrameStore()
+        self.cache: LRUCache[AnimationKey, Animation] = LRUCache(
+            max_entries,
+            max_bytes,
+            sizeof=lambda key, animation: animation.size_in_bytes,
+            on_evict=self._on_evicted,
+        )
+        self.loader: AnimationLoader = AnimationLoader(self)
+        self.loader.loaded.connect(self._on_loaded)
+        # 预取过但尚未播放的动画, 用于统计预取命中率
+        self.prefetched: Set[AnimationKey] = set()
+        self.prefetch_stats: PrefetchStats = {"issued": 0, "used": 0, "wasted": 0}
+
+    def get(self, key: AnimationKey) -> Optional[Animation]:
+        """读取已解码的动画, 命中预取的结果时记为预取命中"""
+        animation = self.cache.get(key)
+        if animation is not None and key in self.prefetched:
+            self.prefetched.discard(key)
+            self.prefetch_stats["used"] += 1
+        return animation
+
+    def has(self, key: AnimationKey) -> bool:
+        """动画已缓存或正在解码"""
+        return key in self.cache or self.loader.is_pending(key)
+
+    def near_budget(self) -> bool:
+        """缓存(含正在解码的动画, 按平均大小估算)是否已接近内存预算, 接近时不再预取"""
+        cache = self.cache
+        pending = self.loader.pending_count()
+        average = cache.bytes / len(cache) if len(cache) else 0
+        return (
+            len(cache) + pending >= cache.max_entries * self.PREFETCH_HEADROOM
+            or cache.bytes + pending * average
+            >= cache.max_bytes * self.PREFETCH_HEADROOM
+        )
+
+    def request(
+        self, key: AnimationKey, load: Callable[[], Animation], priority: int = 0
+    ):
+        """提交后台解码任务, 完成后通过 `loaded` 通知"""
+        self.loader.request(key, load, priority)
+
+    def load(self, key: AnimationKey, load: Callable[[], Animation]) -> Animation:
+        """在当前线程同步解码并写入缓存, 已缓存时直接返回(离线导出等需要确定结果的场景)"""
+        animation = self.cache.get(key)
+        if animation is None:
+            animation = self._store(key, load())
+        return animation
+
+    def prefetch(self, key: AnimationKey, load: Callable[[], Animation]):
+        """以低优先级预热动画, 已缓存或正在解码时忽略"""
+        if self.has(key):
+            return
+        self.prefetched.add(key)
+        self.prefetch_stats["issued"] += 1
+        self.request(key, load, priority=-1)
+
+    def prefetch_accuracy(self) -> float:
+        """预取命中率: 被播放的预取 / 已有结果的预取"""
+        settled = self.prefetch_stats["used"] + self.prefetch_stats["wasted"]
+        return self.prefetch_stats["used"] / settled if settled else 0.0
+
+    def resize(self, max_entries: int, max_bytes: int):
+        """调整内存预算"""
+        self.cache.resize(max_entries, max_bytes)
+
+    def retain(self, keep: Callable[[AnimationKey], bool]):
+        """只保留 `keep` 为真的动画: 其余的缓存被淘汰, 未完成的解码被放弃
+
+        宠物尺寸, 帧率或设备像素比改变后, 丢弃不再有宠物使用的帧组.
+        """
+        for key in [key for key in self.cache if not keep(key)]:
+            self._on_evicted(key, self.cache.pop(key))
+        for key in [key for key in self.loader.pending_keys() if not keep(key)]:
+            self.loader.cancel(key)
+            if key in self.prefetched:
+                self.prefetched.discard(key)
+                self.prefetch_stats["wasted"] += 1
+
+    def clear(self):
+        """丢弃所有缓存和未完成的解码任务"""
+        self.loader.cancel_all()
+        self.cache.clear()
+        # 仍在解码中的预取任务已被丢弃
+        self.prefetch_stats["wasted"] += len(self.prefetched)
+        self.prefetched.clear()
+
+    def _on_evicted(self, key: AnimationKey, animation: Animation):
+        """释放共享帧; 预取的动画未被播放就被淘汰时记为浪费"""
+        self.store.release(animation)
+        if key in self.prefetched:
+            self.prefetched.discard(key)
+            self.prefetch_stats["wasted"] += 1
+
+    def _on_loaded(self, key: AnimationKey, animation: Animation):
+        """解码完成: 帧去重后写入缓存并通知各宠物"""
+        self._store(key, animation)
+
+    def _store(self, key: AnimationKey, animation: Animation) -> Animation:
+        if not len(animation):
+            # 解码失败的结果不写入缓存, 下次播放时重新解码
+            if key in self.prefetched:
+                self.prefetched.discard(key)
+                self.prefetch_stats["wasted"] += 1
+            return animation
+        previous = self.cache.pop(key)
+        if previous is not None:
+            self.store.release(previous)
+        animation = self.store.intern(animation)
+        self.cache.put(key, animation)
+        self.loaded.emit(key, animation)
+        return animation
@@ -0,0 +1,120 @@
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from .frames import Animation
+
+AnimationKey = Tuple[str, int, int, int]
+"""(动画路径, 宽, 高(设备像素), 帧率上限), 同一动画按不同尺寸/帧率解码的结果分别缓存"""
+
+
+class PrefetchStats(TypedDict):
+    issued: int  # 发出的预取数
+    used: int  # 预取后被实际播放的数量
+    wasted: int  # 未被播放就被淘汰/丢弃的数量
+
+
+class _DecodeTask(QRunnable):
+    """在工作线程中加载动画帧(只使用 QImage, 不接触 QPixmap 等 GUI 对象)"""
+
+    def __init__(
+        self,
+        loader: "AnimationLoader",
+        key: AnimationKey,
+        load: Callable[[], Animation],
+        priority: int,
+    ):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.load = load
+        self.priority = priority
+        # 开始执行与被取代互斥, 保证同一任务只会被执行或被取代之一
+        self._lock = threading.Lock()
+        self._started = False
+        self._superseded = False
+
+    def supersede(self) -> bool:
+        """标记为已被取代(排队中的任务执行时直接返回), 已开始执行时返回 False"""
+        with self._lock:
+            if self._started:
+                return False
+            self._superseded = True
+            return True
+
+    def run(self):
+        with self._lock:
+            if self._superseded:
+                return
+            self._started = True
+        try:
+            animation = self.load()
+            # 顺便算好重绘区域, 帧哈希, 不透明区域和点击掩码, 避免在 GUI 线程中逐帧计算
+            animation.dirty_rects()
+            animation.digests()
+            animation.opaque_rect()
+            animation.hit_masks()
+        except Exception as e:
+            print(f"动画解码失败: {self.key[0]} ({e})")
+            animation = Animation([], [], source=self.key[0])
+        # loader 位于 GUI 线程, 信号会排队回到 GUI 线程处理
+        self.loader._finished.emit(self, animation)
+
+
+class AnimationLoader(QObject):
+    """在线程池中解码动画, 完成后通过 `loaded` 把帧交回 GUI 线程"""
+
+    loaded = Signal(object, object)  # (AnimationKey, Animation)
+    _finished = Signal(object, object)  # (_DecodeTask, Animation)
+
+    def __init__(self, parent: Optional[QObject] = None, max_threads: int = 2):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_threads))
+        # 每个动画最近一次提交的任务, 只接受其中任务的结果
+        self._pending: Dict[AnimationKey, _DecodeTask] = {}
+        self._finished.connect(self._on_finished)
+
+    def request(
+        self, key: AnimationKey, load: Callable[[], Animation], priority: int = 0
+    ):
+        """提交解码任务, `priority` 越大越先执行
+
+        同一动画已在排队时不会重复提交; 新请求的优先级更高时(如播放请求赶上了低优先级的预取),
+        以新的优先级重新排队, 旧任务执行时直接跳过.
+        """
+        pending = self._pending.get(key)
+        if pending is not None and (
+            priority <= pending.priority or not pending.supersede()
+        ):
+            return
+        task = _DecodeTask(self, key, load, priority)
+        self._pending[key] = task
+        self._pool.start(task, priority)
+
+    def is_pending(self, key: AnimationKey) -> bool:
+        return key in self._pending
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def pending_keys(self) -> List[AnimationKey]:
+        return list(self._pending)
+
+    def cancel(self, key: AnimationKey):
+        """放弃 `key` 未完成的任务: 排队中的任务执行时直接跳过, 已在执行的任务结果会被丢弃"""
+        task = self._pending.pop(key, None)
+        if task is not None:
+            task.supersede()
+
+    def cancel_all(self):
+        """放弃所有未完成的任务, 已在执行的任务结果会被丢弃"""
+        self._pool.clear()
+        self._pending.clear()
+
+    def _on_finished(self, task: _DecodeTask, animation: Animation):
+        if self._pending.get(task.key) is not task:
+            return
+        del self._pending[task.key]
+        self.loaded.emit(task.key, animation)
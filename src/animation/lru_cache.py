@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, Optional, TypedDict, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(TypedDict):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class LRUCache(Generic[K, V]):
+    """按条目数和字节预算淘汰的 LRU 缓存"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        sizeof: Callable[[K, V], int],
+        on_evict: Optional[Callable[[K, V], None]] = None,
+    ):
+        self.max_entries: int = max(1, max_entries)
+        self.max_bytes: int = max(0, max_bytes)
+        self._sizeof = sizeof
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._sizes: dict[K, int] = {}
+        self._bytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        """当前缓存占用的字节数(估算值)"""
+        return self._bytes
+
+    def get(self, key: K) -> Optional[V]:
+        """读取缓存并刷新其最近使用位置, 同时记录命中/未命中"""
+        value = self._entries.get(key, None)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: K) -> Optional[V]:
+        """读取缓存, 不影响 LRU 顺序和统计"""
+        return self._entries.get(key, None)
+
+    def put(self, key: K, value: V) -> None:
+        """写入缓存, 超出预算时从最久未使用的条目开始淘汰(新写入的条目不会被淘汰)"""
+        if key in self._entries:
+            self._discard(key)
+        size = self._sizeof(key, value)
+        self._entries[key] = value
+        self._sizes[key] = size
+        self._bytes += size
+        self._shrink()
+
+    def pop(self, key: K) -> Optional[V]:
+        """移除条目, 不计入淘汰统计"""
+        if key not in self._entries:
+            return None
+        return self._discard(key)
+
+    def resize(self, max_entries: int, max_bytes: int) -> None:
+        """调整预算并立即按新预算淘汰"""
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self._shrink()
+
+    def clear(self) -> None:
+        """清空缓存(逐个触发淘汰回调, 不计入淘汰统计)"""
+        for key in list(self._entries):
+            value = self._discard(key)
+            if self._on_evict:
+                self._on_evict(key, value)
+
+    def stats(self) -> CacheStats:
+        """缓存统计信息"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _discard(self, key: K) -> V:
+        value = self._entries.pop(key)
+        self._bytes -= self._sizes.pop(key)
+        return value
+
+    def _shrink(self) -> None:
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            key = next(iter(self._entries))
+            value = self._discard(key)
+            self.evictions += 1
+            if self._on_evict:
+                self._on_evict(key, value)
+
+    def __repr__(self) -> str:
+        stats = self.stats()
+        return (
+            f"LRUCache(entries={stats['entries']}/{self.max_entries}, "
+            f"bytes={stats['bytes']}/{self.max_bytes}, hits={stats['hits']}, "
+            f"misses={stats['misses']}, evictions={stats['evictions']})"
+        )
@@ -0,0 +1,316 @@
+import math
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+import numpy as np
+from PySide6.QtCore import (
+    QElapsedTimer,
+    QEvent,
+    QObject,
+    QPoint,
+    QPointF,
+    QRect,
+    Qt,
+    QTimer,
+)
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPaintEvent, QPixmap
+from PySide6.QtWidgets import QWidget
+
+PARTICLE_CAPACITY = 256
+"""粒子池容量, 超出时覆盖最早发射的粒子"""
+
+PARTICLE_SIZE = 12
+"""粒子贴图的逻辑尺寸(px)"""
+
+FADE_LEVELS = 8
+"""淡出的不透明度档位数, 每档预先绘制一张贴图"""
+
+FADE_TAIL = 0.4
+"""在寿命的最后这一比例内线性淡出"""
+
+
+class ParticleKind(TypedDict):
+    sprite: int  # 贴图序号(见 PARTICLE_SPRITES)
+    speed: Tuple[float, float]  # 初速度范围(px/s)
+    angle: Tuple[float, float]  # 发射角范围(度, 0 为向右, -90 为向上)
+    life: float  # 平均寿命(ms)
+    gravity: float  # 竖直加速度(px/s²)
+
+
+PARTICLE_SPRITES = ("heart", "crumb", "drop")
+
+PARTICLE_KINDS: Dict[str, ParticleKind] = {
+    # 双击时向上飘散的爱心
+    "heart": {
+        "sprite": 0,
+        "speed": (40, 90),
+        "angle": (-130, -50),
+        "life": 1400,
+        "gravity": -20,
+    },
+    # 喂食时溅出的橘子碎屑
+    "crumb": {
+        "sprite": 1,
+        "speed": (60, 140),
+        "angle": (-160, -20),
+        "life": 900,
+        "gravity": 320,
+    },
+    # 被拖拽时甩出的汗滴
+    "drop": {
+        "sprite": 2,
+        "speed": (50, 110),
+        "angle": (-170, -10),
+        "life": 800,
+        "gravity": 400,
+    },
+}
+
+
+class ParticleSystem:
+    """预分配的粒子池
+
+    所有粒子的状态保存在固定容量的 NumPy 数组中, 不创建逐粒子的 Python 对象.
+    发射时按环形游标写入数组切片(随机数也写入预分配的缓冲区), 不分配新数组;
+    `step` 对整个池做一次向量化更新. 寿命 <= 0 的槽位视为空闲.
+    """
+
+    def __init__(
+        self,
+        capacity: int = PARTICLE_CAPACITY,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        self.capacity: int = capacity
+        self.position = np.zeros((capacity, 2), np.float32)  # 逻辑坐标(px)
+        self.velocity = np.zeros((capacity, 2), np.float32)  # px/s
+        self.gravity = np.zeros(capacity, np.float32)  # px/s²
+        self.life = np.zeros(capacity, np.float32)  # 剩余寿命(ms)
+        self.max_life = np.ones(capacity, np.float32)
+        self.sprite = np.zeros(capacity, np.int16)
+        self._rng = rng or np.random.default_rng()
+        self._random = np.zeros((2, capacity), np.float32)
+        self._delta = np.zeros((capacity, 2), np.float32)
+        self._fade = np.zeros(capacity, np.float32)
+        self._keys = np.zeros(capacity, np.intp)
+        self._cursor: int = 0
+
+    def emit(
+        self,
+        kind: ParticleKind,
+        count: int,
+        x: float,
+        y: float,
+    ):
+        """在 (x, y) 发射 `count` 个粒子"""
+        count = min(count, self.capacity)
+        end = self._cursor + count
+        if end <= self.capacity:
+            self._emit_range(kind, self._cursor, end, x, y)
+        else:
+            self._emit_range(kind, self._cursor, self.capacity, x, y)
+            self._emit_range(kind, 0, end - self.capacity, x, y)
+        self._cursor = end % self.capacity
+
+    def _emit_range(self, kind: ParticleKind, start: int, end: int, x: float, y: float):
+        count = end - start
+        angle, speed = self._random[0, :count], self._random[1, :count]
+        low, high = kind["angle"]
+        self._rng.random(out=angle, dtype=np.float32)
+        angle *= math.radians(high - low)
+        angle += math.radians(low)
+        low, high = kind["speed"]
+        self._rng.random(out=speed, dtype=np.float32)
+        speed *= high - low
+        speed += low
+
+        np.cos(angle, out=self.velocity[start:end, 0])
+        self.velocity[start:end, 0] *= speed
+        np.sin(angle, out=self.velocity[start:end, 1])
+        self.velocity[start:end, 1] *= speed
+        self.position[start:end, 0] = x
+        self.position[start:end, 1] = y
+        # 寿命在平均值的 ±25% 内浮动, 避免同一批粒子同时消失
+        life = self._random[0, :count]
+        self._rng.random(out=life, dtype=np.float32)
+        life *= kind["life"] * 0.5
+        life += kind["life"] * 0.75
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        self.gravity[start:end] = kind["gravity"]
+        self.sprite[start:end] = kind["sprite"]
+
+    def step(self, dt_ms: float):
+        """推进 `dt_ms` 毫秒"""
+        dt = dt_ms / 1000
+        np.multiply(self.gravity, dt, out=self._delta[:, 0])
+        self.velocity[:, 1] += self._delta[:, 0]
+        np.multiply(self.velocity, dt, out=self._delta)
+        self.position += self._delta
+        self.life -= dt_ms
+        np.maximum(self.life, 0, out=self.life)
+
+    def alive(self) -> np.ndarray:
+        """存活粒子的下标"""
+        return np.flatnonzero(self.life > 0)
+
+    def sprite_keys(self) -> np.ndarray:
+        """各槽位在贴图表中的下标 `贴图序号 * FADE_LEVELS + 淡出档位`(写入预分配的缓冲区)"""
+        np.divide(self.life, self.max_life, out=self._fade)
+        self._fade *= FADE_LEVELS / FADE_TAIL
+        np.ceil(self._fade, out=self._fade)
+        np.clip(self._fade, 1, FADE_LEVELS, out=self._fade)
+        np.multiply(self.sprite, FADE_LEVELS, out=self._keys)
+        np.add(self._keys, self._fade, out=self._keys, casting="unsafe")
+        self._keys -= 1
+        return self._keys
+
+    def clear(self):
+        self.life[:] = 0
+
+
+def render_particle_sprites(ratio: float = 1.0) -> List[QPixmap]:
+    """按设备像素比绘制各粒子贴图的各淡出档位
+
+    返回的列表按 `贴图序号 * FADE_LEVELS + 档位` 排列, 第 `level` 档的不透明度为
+    `(level + 1) / FADE_LEVELS`, 绘制时无需再设置不透明度.
+    """
+    size = max(1, round(PARTICLE_SIZE * ratio))
+    pixmaps: List[QPixmap] = []
+    for name in PARTICLE_SPRITES:
+        for level in range(FADE_LEVELS):
+            pixmap = QPixmap(size, size)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setOpacity((level + 1) / FADE_LEVELS)
+            painter.scale(size / PARTICLE_SIZE, size / PARTICLE_SIZE)
+            path = QPainterPath()
+            if name == "heart":
+                painter.setBrush(QColor("#ff5c8a"))
+                path.moveTo(6, 11)
+                path.cubicTo(0, 7, 0, 2, 3, 1.5)
+                path.cubicTo(4.7, 1.2, 5.6, 2.2, 6, 3.2)
+                path.cubicTo(6.4, 2.2, 7.3, 1.2, 9, 1.5)
+                path.cubicTo(12, 2, 12, 7, 6, 11)
+            elif name == "crumb":
+                painter.setBrush(QColor("#ffa631"))
+                path.addEllipse(QPointF(6, 6), 3, 2.5)
+            else:
+                painter.setBrush(QColor(120, 190, 255, 220))
+                path.moveTo(6, 1)
+                path.cubicTo(8, 5, 9.5, 6.5, 9.5, 8)
+                path.cubicTo(9.5, 10, 8, 11, 6, 11)
+                path.cubicTo(4, 11, 2.5, 10, 2.5, 8)
+                path.cubicTo(2.5, 6.5, 4, 5, 6, 1)
+            painter.drawPath(path)
+            painter.end()
+            pixmap.setDevicePixelRatio(ratio)
+            pixmaps.append(pixmap)
+    return pixmaps
+
+
+def particle_draw_list(system: ParticleSystem) -> Tuple[np.ndarray, np.ndarray]:
+    """存活粒子的 (贴图左上角的逻辑坐标, 贴图表下标), 按发射槽位的顺序排列"""
+    alive = system.alive()
+    return system.position[alive] - PARTICLE_SIZE / 2, system.sprite_keys()[alive]
+
+
+class ParticleLayer(QWidget):
+    """覆盖在整个父窗口上方的粒子层, 不接收鼠标事件
+
+    粒子不受精灵控件裁剪区域的限制, 默认从 `anchor`(精灵控件) 上部中央发射.
+    只在有存活粒子时运行定时器; 每次更新只重绘粒子覆盖的区域.
+    贴图按淡出档位预先绘制, 绘制时每个粒子调用一次 drawPixmap, 不分配像素缓冲区.
+    (PySide6 的 drawPixmapFragments 只接受单个片段, 无法一次提交一批粒子.)
+    """
+
+    TICK_INTERVAL = 33
+    """粒子更新间隔(ms)"""
+
+    def __init__(
+        self,
+        parent: QWidget,
+        anchor: Optional[QWidget] = None,
+        capacity: int = PARTICLE_CAPACITY,
+    ):
+        super().__init__(parent)
+        self.anchor: QWidget = anchor or parent
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.system: ParticleSystem = ParticleSystem(capacity)
+        self._sprites: Dict[float, List[QPixmap]] = {}  # 设备像素比 -> 贴图表
+        self._dirty: QRect = QRect()  # 上一次绘制的区域(逻辑坐标)
+        self._clock = QElapsedTimer()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self.resize(parent.size())
+        self.raise_()
+        parent.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        # 始终与父控件同样大小
+        if watched is self.parent() and event.type() == QEvent.Type.Resize:
+            self.resize(self.parentWidget().size())
+        return False
+
+    def burst(self, name: str, count: int, origin: Optional[QPointF] = None):
+        """发射一批粒子, `origin` 为本控件坐标, 默认为 `anchor` 上部中央"""
+        if origin is None:
+            origin = QPointF(
+                self.anchor.mapTo(
+                    self.parentWidget(),
+                    QPoint(self.anchor.width() // 2, self.anchor.height() // 3),
+                )
+            )
+        self.system.emit(PARTICLE_KINDS[name], count, origin.x(), origin.y())
+        if not self._timer.isActive():
+            self._clock.start()
+            self._timer.start(self.TICK_INTERVAL)
+        self._tick()
+
+    def clear(self):
+        """清除所有粒子"""
+        self.system.clear()
+        self._timer.stop()
+        self.update(self._dirty)
+        self._dirty = QRect()
+
+    def pause(self):
+        self._timer.stop()
+
+    def resume(self):
+        if len(self.system.alive()):
+            self._clock.start()
+            self._timer.start(self.TICK_INTERVAL)
+
+    def sprites(self, ratio: float) -> List[QPixmap]:
+        """按设备像素比缓存的粒子贴图表"""
+        if ratio not in self._sprites:
+            self._sprites[ratio] = render_particle_sprites(ratio)
+        return self._sprites[ratio]
+
+    def _tick(self):
+        self.system.step(self._clock.restart())
+        alive = self.system.alive()
+        if not len(alive):
+            self._timer.stop()
+            self.update(self._dirty)
+            self._dirty = QRect()
+            return
+        position = self.system.position[alive]
+        half = PARTICLE_SIZE // 2 + 1
+        x0, y0 = np.floor(position.min(axis=0)).astype(int) - half
+        x1, y1 = np.ceil(position.max(axis=0)).astype(int) + half
+        rect = QRect(int(x0), int(y0), int(x1 - x0), int(y1 - y0))
+        self.update(rect.united(self._dirty))
+        self._dirty = rect
+
+    def paintEvent(self, event: QPaintEvent):
+        positions, keys = particle_draw_list(self.system)
+        if not len(keys):
+            return
+        sprites = self.sprites(self.devicePixelRatioF())
+        painter = QPainter(self)
+        for (x, y), key in zip(positions.tolist(), keys.tolist()):
+            painter.drawPixmap(QPointF(x, y), sprites[key])
+        painter.end()
@@ -0,0 +1,223 @@
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Optional, Tuple, TypedDict
+
+from PySide6.QtCore import QMetaObject, QObject, QTimer, Signal
+from PySide6.QtGui import QImage
+
+from .frames import Animation
+
+if TYPE_CHECKING:
+    from ..state import ScheduledTask, Scheduler
+
+
+class SwitchStats(TypedDict):
+    switches: int  # 统计窗口内的切换次数
+    last_ms: float
+    mean_ms: float
+    max_ms: float
+
+
+class AnimationPlayer(QObject):
+    """按帧时长循环播放 `Animation`, 每切换一帧发出一次 `frame_changed`
+
+    `switch_to` 以双缓冲方式切换动画: 当前帧保持显示, 到下一帧边界时直接换成新动画的第一帧,
+    中途不会出现空白帧. 可附带只播放一次的过渡帧(如淡入淡出).
+    """
+
+    frame_changed = Signal(object, int)  # (Animation, 帧序号)
+    switched = Signal()  # 新动画(或其过渡帧)的第一帧即将呈现
+
+    FPS_WINDOW = 2.0
+    """统计实际呈现帧率的时间窗口(s)"""
+
+    SWITCH_MAX_WAIT = 50
+    """等待帧边界的最长时间(ms), 当前帧剩余时间更长时立即切换"""
+
+    SWITCH_HISTORY = 32
+    """保留最近多少次切换的延迟"""
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.animation: Optional[Animation] = None
+        self.frame_index: int = 0
+        self.paused: bool = False
+        self._remaining: int = -1
+        self._presented: Deque[float] = deque()
+        # 过渡帧播放完后要循环播放的动画
+        self._after_lead_in: Optional[Animation] = None
+        # 等待下一帧边界切换的 (动画, 过渡帧)
+        self._queued: Optional[Tuple[Animation, Optional[Animation]]] = None
+        self._switch_started: Optional[float] = None
+        self.switch_latencies: Deque[float] = deque(maxlen=self.SWITCH_HISTORY)
+        self._connection: Optional[QMetaObject.Connection] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._next_frame)
+        # 设置后改由调度器任务计时(见 `use_scheduler`)
+        self._task: Optional["ScheduledTask"] = None
+
+    def use_scheduler(self, scheduler: "Scheduler"):
+        """改由 `scheduler` 中的精确任务为帧计时
+
+        离线导出时调度器使用虚拟时钟, 帧切换与状态机的定时任务按同一时间线推进.
+        """
+        self._timer.stop()
+        self._task = scheduler.create_task(
+            self._next_frame, single_shot=True, precise=True, name="frame"
+        )
+
+    def attach(self, presenter: Callable[[Animation, int], None]):
+        """绑定帧的显示目标, 同一时间只保留一个连接"""
+        self.detach()
+        self._connection = self.frame_changed.connect(presenter)
+
+    def detach(self):
+        """解除显示目标绑定并停止播放"""
+        self.stop()
+        if self._connection is not None:
+            self.frame_changed.disconnect(self._connection)
+            self._connection = None
+
+    def play(self, animation: Animation, lead_in: Optional[Animation] = None):
+        """立即从第一帧开始播放, 有 `lead_in` 时先播放一遍过渡帧"""
+        self.stop()
+        if lead_in is not None and len(lead_in):
+            self._after_lead_in = animation
+            animation = lead_in
+        self.animation = animation
+        self.frame_index = 0
+        if len(animation):
+            self.switched.emit()
+            self._record_switch()
+            self._show_frame()
+
+    def switch_to(self, animation: Animation, lead_in: Optional[Animation] = None):
+        """在下一帧边界切换到 `animation`, 当前未在计时(单帧/暂停)时立即切换"""
+        if self.is_playing() and self._remaining_time() <= self.SWITCH_MAX_WAIT:
+            self._queued = (animation, lead_in)
+        else:
+            self.play(animation, lead_in)
+
+    def retarget(self, animation: Animation):
+        """替换即将循环播放的动画(如占位帧被完整动画取代), 不打断正在等待的切换或过渡帧"""
+        if self._queued is not None:
+            self._queued = (animation, self._queued[1])
+        elif self._after_lead_in is not None:
+            self._after_lead_in = animation
+        else:
+            self.play(animation)
+
+    def stop(self):
+        """停止播放"""
+        self._stop_timer()
+        self._remaining = -1
+        self._queued = None
+        self._after_lead_in = None
+
+    def mark_switch(self):
+        """标记一次切换的起点, 新动画第一帧呈现时记录延迟. 已有未完成的标记时保留较早者"""
+        if self._switch_started is None:
+            self._switch_started = time.perf_counter()
+
+    def switch_stats(self) -> SwitchStats:
+        """最近几次切换从标记到第一帧呈现的延迟(ms)"""
+        latencies = self.switch_latencies
+        return {
+            "switches": len(latencies),
+            "last_ms": latencies[-1] if latencies else 0.0,
+            "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+            "max_ms": max(latencies, default=0.0),
+        }
+
+    def pause(self):
+        """暂停播放, 保留当前帧和剩余时长. 暂停期间 `play` 只显示第一帧"""
+        if self.paused:
+            return
+        self.paused = True
+        if self.is_playing():
+            self._remaining = self._remaining_time()
+            self._stop_timer()
+
+    def resume(self):
+        """从暂停处继续播放"""
+        if not self.paused:
+            return
+        self.paused = False
+        if not self.animation or len(self.animation) <= 1:
+            return
+        if self._remaining < 0:
+            self._remaining = self.animation.delays[self.frame_index]
+        self._start_timer(self._remaining)
+        self._remaining = -1
+
+    def is_playing(self) -> bool:
+        if self._task is not None:
+            return self._task.is_active()
+        return self._timer.isActive()
+
+    def current_frame(self) -> Optional[QImage]:
+        """当前帧"""
+        if not self.animation or not len(self.animation):
+            return None
+        return self.animation.frames[self.frame_index]
+
+    def presented_fps(self) -> float:
+        """最近一段时间内实际呈现的帧率"""
+        self._expire_presented(time.monotonic())
+        if len(self._presented) < 2:
+            return 0.0
+        span = self._presented[-1] - self._presented[0]
+        return (len(self._presented) - 1) / span if span > 0 else 0.0
+
+    def _remaining_time(self) -> int:
+        if self._task is not None:
+            return self._task.remaining_time()
+        return self._timer.remainingTime()
+
+    def _start_timer(self, interval: int):
+        if self._task is not None:
+            self._task.start(interval)
+        else:
+            self._timer.start(interval)
+
+    def _stop_timer(self):
+        if self._task is not None:
+            self._task.stop()
+        self._timer.stop()
+
+    def _record_switch(self):
+        if self._switch_started is None:
+            return
+        self.switch_latencies.append(
+            (time.perf_counter() - self._switch_started) * 1000
+        )
+        self._switch_started = None
+
+    def _expire_presented(self, now: float):
+        while self._presented and now - self._presented[0] > self.FPS_WINDOW:
+            self._presented.popleft()
+
+    def _show_frame(self):
+        assert self.animation is not None
+        now = time.monotonic()
+        self._presented.append(now)
+        self._expire_presented(now)
+        self.frame_changed.emit(self.animation, self.frame_index)
+        # 单帧动画或暂停时无需继续计时
+        if len(self.animation) > 1 and not self.paused:
+            self._start_timer(self.animation.delays[self.frame_index])
+
+    def _next_frame(self):
+        if not self.animation:
+            return
+        if self._queued is not None:
+            self.play(*self._queued)
+            return
+        if self._after_lead_in is not None and self.frame_index + 1 >= len(
+            self.animation
+        ):
+            self.play(self._after_lead_in)
+            return
+        self.frame_index = (self.frame_index + 1) % len(self.animation)
+        self._show_frame()
@@ -0,0 +1,123 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QRect, QSize, Qt
+from PySide6.QtGui import QImage, QImageReader, QPainter
+
+from .frames import DEFAULT_FRAME_DELAY, FRAME_FORMAT, Animation, decode_animation
+
+SPRITE_SHEET_EXTENSION = ".json"
+"""精灵表以描述文件(与图集同名的 .json)作为动画路径"""
+
+ANIMATION_FORMATS = ("gif", "spritesheet")
+"""file_index.json 中 `Resources.GifFormat` 可选的分类资源格式"""
+
+
+def is_sprite_sheet(path: str) -> bool:
+    return path.lower().endswith(SPRITE_SHEET_EXTENSION)
+
+
+def list_animation_files(directory: str, fmt: str = "gif") -> List[str]:
+    """列出目录中指定格式的动画文件, 精灵表只列出描述文件"""
+    if fmt not in ANIMATION_FORMATS:
+        raise ValueError(f"未知的动画格式: {fmt}")
+    if not os.path.isdir(directory):
+        return []
+    sprite_sheet = fmt == "spritesheet"
+    return [
+        os.path.join(directory, file)
+        for file in os.listdir(directory)
+        if os.path.isfile(os.path.join(directory, file))
+        and is_sprite_sheet(file) == sprite_sheet
+    ]
+
+
+def sheet_image_path(path: str, sheet: Optional[Dict[str, Any]] = None) -> str:
+    """精灵表对应的图集路径(优先使用描述中的 meta.image, 否则为同名 .png)"""
+    if sheet is None:
+        with open(path, "r", encoding="utf-8") as f:
+            sheet = json.load(f)
+    image = sheet.get("meta", {}).get("image", "")
+    if not image:
+        image = os.path.splitext(os.path.basename(path))[0] + ".png"
+    return os.path.join(os.path.dirname(path), image)
+
+
+def asset_files(path: str) -> List[str]:
+    """动画依赖的全部源文件, 用于计算内容哈希"""
+    if is_sprite_sheet(path):
+        return [path, sheet_image_path(path)]
+    return [path]
+
+
+def _rect(value: Dict[str, Any]) -> QRect:
+    return QRect(int(value["x"]), int(value["y"]), int(value["w"]), int(value["h"]))
+
+
+def _read_sheet(path: str) -> Tuple[QImage, List[Dict[str, Any]]]:
+    """读取描述文件并解码图集, 返回 (图集, 帧描述列表)"""
+    with open(path, "r", encoding="utf-8") as f:
+        sheet: Dict[str, Any] = json.load(f)
+
+    entries = sheet["frames"]
+    if isinstance(entries, dict):
+        entries = list(entries.values())
+    image_path = sheet_image_path(path, sheet)
+    atlas = QImage(image_path)
+    if atlas.isNull():
+        print(f"无法解码精灵表图集: {image_path}")
+        return atlas, []
+    return atlas.convertToFormat(FRAME_FORMAT), entries
+
+
+def _slice(atlas: QImage, entry: Dict[str, Any]) -> QImage:
+    """从图集中切出一帧"""
+    if entry.get("rotated", False):
+        raise ValueError("不支持旋转的精灵帧")
+    frame = atlas.copy(_rect(entry["frame"]))
+    if not entry.get("trimmed", False):
+        return frame
+    # 还原被裁掉的透明边, 保证所有帧尺寸一致
+    source_size = entry["sourceSize"]
+    canvas = QImage(int(source_size["w"]), int(source_size["h"]), FRAME_FORMAT)
+    canvas.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(canvas)
+    painter.drawImage(_rect(entry["spriteSourceSize"]).topLeft(), frame)
+    painter.end()
+    return canvas
+
+
+def decode_sprite_sheet(path: str, size: Optional[QSize] = None) -> Animation:
+    """解码 PNG 图集 + Aseprite 格式的 JSON 描述
+
+    图集只解码一次, 各帧按描述中的矩形从图集中切出(内存拷贝, 不再逐帧解码).
+    支持 Aseprite 导出的 hash/array 两种 `frames` 写法, 以及裁剪掉透明边(trimmed)的帧.
+    """
+    atlas, entries = _read_sheet(path)
+    frames: List[QImage] = []
+    delays: List[int] = []
+    for entry in entries:
+        duration = int(entry.get("duration", 0))
+        frames.append(_slice(atlas, entry))
+        delays.append(duration if duration > 0 else DEFAULT_FRAME_DELAY)
+    animation = Animation(frames, delays, source=path)
+    return animation.scaled(size) if size is not None else animation
+
+
+def decode_asset(path: str, size: Optional[QSize] = None) -> Animation:
+    """按文件类型解码动画资源(GIF 等图片动画或精灵表)"""
+    if is_sprite_sheet(path):
+        return decode_sprite_sheet(path, size)
+    return decode_animation(path, size)
+
+
+def decode_first_frame(path: str) -> QImage:
+    """只解码动画的第一帧(原始尺寸), 失败时返回空图像
+
+    PNG 不支持按区域解码(QImageReader.setClipRect 会先解码整张图), 取精灵表的第一格
+    也要在调用线程中解码整张图集, 因此精灵表返回空图像, 不做占位, 等待后台解码的结果.
+    """
+    if is_sprite_sheet(path):
+        return QImage()
+    return QImageReader(path).read()
@@ -0,0 +1,143 @@
+from typing import Optional
+
+import numpy as np
+from PySide6.QtCore import QPoint, QRect, QSize
+from PySide6.QtGui import QBitmap, QImage, QPainter, QPaintEvent, QRegion
+from PySide6.QtWidgets import QWidget
+
+from .frames import Animation
+
+
+class SpriteView(QWidget):
+    """直接绘制动画帧的精灵控件
+
+    帧已是 premultiplied ARGB32, 在 `paintEvent` 中原样绘制, 不再经过 QPixmap 转换.
+    相邻帧只重绘像素有变化的区域(见 `Animation.dirty_rects`), 镜像作为绘制时的变换, 不生成新帧.
+    设置 `viewport` 后只显示帧中的这一部分(如裁掉透明边), 控件大小由调用方保持与之一致.
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.animation: Optional[Animation] = None
+        self.frame_index: int = -1
+        self.mirrored: bool = False
+        self.viewport: QRect = (
+            QRect()
+        )  # 显示坐标(镜像后)下的可见区域, 为空时居中显示整帧
+
+    def show_frame(self, animation: Animation, index: int):
+        """显示 `animation` 的第 `index` 帧, 连续播放时只重绘变化区域"""
+        previous, previous_index = self.animation, self.frame_index
+        self.animation, self.frame_index = animation, index
+        if animation is previous and index == (previous_index + 1) % len(animation):
+            dirty = animation.dirty_rects()[index]
+            if not dirty.isEmpty():
+                self.update(self._map_rect(dirty))
+        else:
+            self.update()
+
+    def clear(self):
+        """清空显示"""
+        self.animation, self.frame_index = None, -1
+        self.update()
+
+    def set_mirrored(self, mirrored: bool):
+        """设置是否水平镜像绘制"""
+        if mirrored == self.mirrored:
+            return
+        self.mirrored = mirrored
+        self.update()
+
+    def set_viewport(self, viewport: QRect):
+        """设置可见区域"""
+        if viewport == self.viewport:
+            return
+        self.viewport = QRect(viewport)
+        self.update()
+
+    def current_frame_rect(self) -> QRect:
+        """当前帧在控件中的位置(有可见区域时按其偏移, 否则居中)"""
+        if self.animation is None or not len(self.animation):
+            return QRect()
+        size: QSize = self.animation.logical_size
+        if not self.viewport.isNull():
+            return QRect(-self.viewport.topLeft(), size)
+        return QRect(
+            QPoint(
+                (self.width() - size.width()) // 2,
+                (self.height() - size.height()) // 2,
+            ),
+            size,
+        )
+
+    def map_to_frame(self, pos: QPoint) -> QPoint:
+        """控件坐标 -> 帧的像素坐标(考虑居中, 镜像和设备像素比)"""
+        if self.animation is None:
+            return QPoint(-1, -1)
+        target = self.current_frame_rect()
+        ratio = self.animation.device_pixel_ratio
+        # 取逻辑像素的中心对应的设备像素
+        x = pos.x() - target.x() + 0.5
+        if self.mirrored:
+            x = target.width() - x
+        return QPoint(int(x * ratio), int((pos.y() - target.y() + 0.5) * ratio))
+
+    def hit_test(self, pos: QPoint) -> bool:
+        """控件坐标 `pos` 处当前帧是否不透明
+
+        还没有可显示的帧(解码中或解码失败)时没有掩码, 视为点中, 保证宠物仍可拖动和打开右键菜单.
+        """
+        if self.animation is None or not 0 <= self.frame_index < len(self.animation):
+            return True
+        point = self.map_to_frame(pos)
+        return self.animation.hit_test(self.frame_index, point.x(), point.y())
+
+    def mask_region(self) -> QRegion:
+        """当前帧不透明部分在控件坐标下的区域(用于 setMask)"""
+        if self.animation is None or not len(self.animation):
+            return QRegion()
+        mask = self.animation.hit_masks()[self.frame_index]
+        size: QSize = self.animation.size
+        if self.mirrored:
+            bits = np.unpackbits(mask, axis=1, count=size.width())[:, ::-1]
+            mask = np.packbits(bits, axis=1)
+        data = np.ascontiguousarray(mask).tobytes()
+        if self.animation.device_pixel_ratio == 1.0:
+            bitmap = QBitmap.fromData(size, data, QImage.Format.Format_Mono)
+        else:
+            # 掩码按设备像素生成, 窗口掩码使用逻辑坐标
+            image = QImage(
+                data,
+                size.width(),
+                size.height(),
+                mask.shape[1],
+                QImage.Format.Format_Mono,
+            )
+            image.setColorTable([0xFFFFFFFF, 0xFF000000])
+            bitmap = QBitmap.fromImage(image.scaled(self.animation.logical_size))
+        region = QRegion(bitmap)
+        region.translate(self.current_frame_rect().topLeft())
+        return region.intersected(self.rect())
+
+    def _map_rect(self, rect: QRect) -> QRect:
+        """帧的像素坐标 -> 控件坐标(考虑居中, 镜像和设备像素比)"""
+        assert self.animation is not None
+        rect = self.animation.to_logical(rect)
+        target = self.current_frame_rect()
+        x = rect.x()
+        if self.mirrored:
+            x = target.width() - rect.x() - rect.width()
+        return QRect(target.x() + x, target.y() + rect.y(), rect.width(), rect.height())
+
+    def paintEvent(self, event: QPaintEvent):
+        if self.animation is None or not len(self.animation):
+            return
+        frame = self.animation.frames[self.frame_index]
+        target = self.current_frame_rect()
+        painter = QPainter(self)
+        # 帧已按设备像素比解码并标记, 此处按 1:1 输出, 不会再缩放
+        if self.mirrored:
+            painter.translate(target.x() * 2 + target.width(), 0)
+            painter.scale(-1, 1)
+        painter.drawImage(target.topLeft(), frame)
+        painter.end()
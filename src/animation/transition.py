@@ -0,0 +1,35 @@
+from typing import List, Optional
+
+import numpy as np
+from PySide6.QtGui import QImage
+
+from .frames import FRAME_FORMAT, Animation, frame_pixels
+
+
+def crossfade(
+    previous: QImage, target: QImage, duration: int, fps: int, source: str = ""
+) -> Optional[Animation]:
+    """预先计算从 `previous` 淡入到 `target` 的过渡帧, 时长或尺寸不合适时返回 None
+
+    帧为 premultiplied 格式, 逐像素线性插值即可得到正确的半透明混合结果.
+    """
+    if duration <= 0 or fps <= 0 or previous.size() != target.size():
+        return None
+    interval = max(1, 1000 // fps)
+    steps = duration // interval
+    if steps < 1:
+        return None
+
+    width, height = target.width(), target.height()
+    start = frame_pixels(previous.convertToFormat(FRAME_FORMAT)).astype(np.float32)
+    end = frame_pixels(target.convertToFormat(FRAME_FORMAT)).astype(np.float32)
+    frames: List[QImage] = []
+    for step in range(1, steps + 1):
+        t = step / (steps + 1)
+        pixels = np.ascontiguousarray(
+            (start + (end - start) * t + 0.5).astype(np.uint8)
+        )
+        frame = QImage(pixels.data, width, height, width * 4, FRAME_FORMAT).copy()
+        frame.setDevicePixelRatio(target.devicePixelRatio())
+        frames.append(frame)
+    return Animation(frames, [interval] * steps, source=source)
@@ -8,10 +8,12 @@ class WindowParam(TypedDict):
     Height: int
     StaysOnTop: bool
     Frameless: bool
+    ClickThrough: bool
 
 
 class AnimationParam(TypedDict):
     FPS: int
+    CrossfadeMS: int
 
 
 class RandomParam(TypedDict):
@@ -20,6 +22,8 @@ class RandomParam(TypedDict):
 
 class InfoParam(TypedDict):
     ShowInfo: bool
+    HistorySeconds: int
+    SampleIntervalMS: int
 
 
 class ThemeParam(TypedDict):
@@ -34,6 +38,24 @@ class HungerParam(TypedDict):
     Rate: int
 
 
+class CacheParam(TypedDict):
+    MaxEntries: int
+    MaxMemoryMB: int
+    SharedFrames: bool
+
+
+class PetsParam(TypedDict):
+    Count: int
+
+
+class ChatParam(TypedDict):
+    Enabled: bool
+
+
+class TrayParam(TypedDict):
+    Gauge: str
+
+
 class ConfigParam(TypedDict):
     Window: WindowParam
     Animation: AnimationParam
@@ -42,18 +64,36 @@ class ConfigParam(TypedDict):
     Theme: ThemeParam
     Workspace: WorkspaceParam
     Hunger: HungerParam
+    Cache: CacheParam
+    Pets: PetsParam
+    Chat: ChatParam
+    Tray: TrayParam
 
 
 ConfigLiteral = Literal[
-    "Window", "Animation", "Random", "Info", "Theme", "Workspace", "Hunger"
+    "Window",
+    "Animation",
+    "Random",
+    "Info",
+    "Theme",
+    "Workspace",
+    "Hunger",
+    "Cache",
+    "Pets",
+    "Chat",
+    "Tray",
 ]
-WindowLiteral = Literal["Width", "Height", "StaysOnTop", "Frameless"]
-AnimationLiteral = Literal["FPS"]
+WindowLiteral = Literal["Width", "Height", "StaysOnTop", "Frameless", "ClickThrough"]
+AnimationLiteral = Literal["FPS", "CrossfadeMS"]
 RandomLiteral = Literal["Interval"]
-InfoLiteral = Literal["ShowInfo"]
+InfoLiteral = Literal["ShowInfo", "HistorySeconds", "SampleIntervalMS"]
 ThemeLiteral = Literal["DefaultTheme"]
 WorkspaceLiteral = Literal["AllowRandomMovement"]
 HungerLiteral = Literal["Rate"]
+CacheLiteral = Literal["MaxEntries", "MaxMemoryMB", "SharedFrames"]
+PetsLiteral = Literal["Count"]
+ChatLiteral = Literal["Enabled"]
+TrayLiteral = Literal["Gauge"]
 ConfigParamLiteral = Literal[
     WindowParam,
     AnimationParam,
@@ -62,4 +102,8 @@ ConfigParamLiteral = Literal[
     ThemeParam,
     WorkspaceParam,
     HungerParam,
+    CacheParam,
+    PetsParam,
+    ChatParam,
+    TrayParam,
 ]
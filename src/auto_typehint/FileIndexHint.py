@@ -19,6 +19,10 @@ class IconParam(TypedDict):
     RelativePath: str
 
 
+class FrameCacheParam(TypedDict):
+    RelativePath: str
+
+
 class MusicParam(TypedDict):
     DoubleClick: str
 
@@ -33,9 +37,24 @@ class GifParam(TypedDict):
     Move: str
 
 
+class GifFormatParam(TypedDict):
+    Click: str
+    Common: str
+    Drag: str
+    Eat: str
+    Hungry: str
+    Move: str
+
+
+class PackParam(TypedDict):
+    RelativePath: str
+
+
 class ResourcesParam(TypedDict):
     Music: MusicParam
     Gif: GifParam
+    GifFormat: GifFormatParam
+    Pack: PackParam
 
 
 class FileIndexParam(TypedDict):
@@ -43,18 +62,29 @@ class FileIndexParam(TypedDict):
     Config: ConfigParam
     Theme: ThemeParam
     Icon: IconParam
+    FrameCache: FrameCacheParam
     Resources: ResourcesParam
 
 
-FileIndexLiteral = Literal["DefaultConfig", "Config", "Theme", "Icon", "Resources"]
+FileIndexLiteral = Literal[
+    "DefaultConfig", "Config", "Theme", "Icon", "FrameCache", "Resources"
+]
 DefaultConfigLiteral = Literal["RelativePath"]
 ConfigLiteral = Literal["RelativePath"]
 ThemeLiteral = Literal["RelativePath"]
 IconLiteral = Literal["RelativePath"]
-ResourcesLiteral = Literal["Music", "Gif"]
+FrameCacheLiteral = Literal["RelativePath"]
+ResourcesLiteral = Literal["Music", "Gif", "GifFormat", "Pack"]
 MusicLiteral = Literal["DoubleClick"]
 GifLiteral = Literal["RelativePath", "Click", "Common", "Drag", "Eat", "Hungry", "Move"]
-ResourcesParamLiteral = Literal[MusicParam, GifParam]
+GifFormatLiteral = Literal["Click", "Common", "Drag", "Eat", "Hungry", "Move"]
+PackLiteral = Literal["RelativePath"]
+ResourcesParamLiteral = Literal[MusicParam, GifParam, GifFormatParam, PackParam]
 FileIndexParamLiteral = Literal[
-    DefaultConfigParam, ConfigParam, ThemeParam, IconParam, ResourcesParam
+    DefaultConfigParam,
+    ConfigParam,
+    ThemeParam,
+    IconParam,
+    FrameCacheParam,
+    ResourcesParam,
 ]
@@ -37,6 +37,10 @@ class Config:
         for key, value in self._default_config.items():
             if key not in self._config:
                 self._config[key] = value
+            elif isinstance(value, dict):
+                # 补全旧配置文件中缺少的子项
+                for sub_key, sub_value in value.items():
+                    self._config[key].setdefault(sub_key, sub_value)
 
         return self._config
 
@@ -0,0 +1,22 @@
+from .encoders import (
+    EXPORT_FORMATS,
+    ExportFormat,
+    FrameEncoder,
+    compress_rgba,
+    encode_png,
+    write_apng,
+)
+from .recorder import AnimationRecorder, ExportStep, VirtualClock, parse_script
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "AnimationRecorder",
+    "ExportFormat",
+    "ExportStep",
+    "FrameEncoder",
+    "VirtualClock",
+    "compress_rgba",
+    "encode_png",
+    "parse_script",
+    "write_apng",
+]
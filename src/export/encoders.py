@@ -0,0 +1,226 @@
+import multiprocessing
+import os
+import struct
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Literal, Optional, Tuple
+
+import numpy as np
+
+ExportFormat = Literal["png", "apng", "gif"]
+EXPORT_FORMATS: Tuple[ExportFormat, ...] = ("png", "apng", "gif")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+MAX_FRAME_DURATION = 0xFFFF
+"""APNG 单帧时长上限(ms), 相同的连续帧合并时不超过该值"""
+
+GIF_TRANSPARENT_INDEX = 255
+"""GIF 调色板中保留给透明像素的索引"""
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + tag
+        + data
+        + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+    )
+
+
+def _png_header(width: int, height: int) -> bytes:
+    """8 位 RGBA 的 IHDR"""
+    return _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+
+
+def compress_rgba(pixels: bytes, width: int, height: int) -> bytes:
+    """RGBA 像素 -> PNG 图像数据(逐行 Up 滤波 + zlib), 在工作进程中执行"""
+    rows = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width * 4)
+    filtered = np.empty((height, width * 4 + 1), dtype=np.uint8)
+    filtered[:, 0] = 2  # Up: 与上一行逐字节相减, 静止的背景和轮廓压缩后几乎不占空间
+    filtered[0, 1:] = rows[0]
+    np.subtract(rows[1:], rows[:-1], out=filtered[1:, 1:])
+    return zlib.compress(filtered.tobytes(), 6)
+
+
+def encode_png(pixels: bytes, width: int, height: int) -> bytes:
+    """RGBA 像素 -> PNG 文件内容"""
+    return (
+        PNG_SIGNATURE
+        + _png_header(width, height)
+        + _png_chunk(b"IDAT", compress_rgba(pixels, width, height))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def write_png(path: str, pixels: bytes, width: int, height: int) -> str:
+    """编码并写出一帧 PNG, 在工作进程中执行"""
+    with open(path, "wb") as f:
+        f.write(encode_png(pixels, width, height))
+    return path
+
+
+def write_apng(
+    path: str, width: int, height: int, frames: List[Tuple[bytes, int]]
+) -> None:
+    """由已压缩的帧数据 (图像数据, 时长 ms) 写出循环播放的 APNG"""
+    sequence = 0
+    chunks = [
+        PNG_SIGNATURE,
+        _png_header(width, height),
+        _png_chunk(b"acTL", struct.pack(">II", len(frames), 0)),
+    ]
+    for index, (data, duration) in enumerate(frames):
+        # 每帧覆盖整个画布(dispose none, blend source)
+        chunks.append(
+            _png_chunk(
+                b"fcTL",
+                struct.pack(
+                    ">IIIIIHHBB", sequence, width, height, 0, 0, duration, 1000, 0, 0
+                ),
+            )
+        )
+        sequence += 1
+        if index == 0:
+            chunks.append(_png_chunk(b"IDAT", data))
+        else:
+            chunks.append(_png_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+            sequence += 1
+    chunks.append(_png_chunk(b"IEND", b""))
+    with open(path, "wb") as f:
+        f.writelines(chunks)
+
+
+def quantize_gif_frame(pixels: bytes, width: int, height: int) -> Tuple[bytes, bytes]:
+    """RGBA 像素 -> (调色板索引, RGB 调色板), 在工作进程中执行
+
+    颜色量化是 GIF 编码中最耗时的部分. 透明度只保留开/关两档, 透明像素使用保留索引.
+    """
+    from PIL import Image
+
+    rgba = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 4)
+    image = Image.fromarray(np.ascontiguousarray(rgba[..., :3]), "RGB")
+    paletted = image.quantize(
+        GIF_TRANSPARENT_INDEX, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE
+    )
+    indices = np.asarray(paletted, dtype=np.uint8).copy()
+    indices[rgba[..., 3] < 128] = GIF_TRANSPARENT_INDEX
+    palette = paletted.getpalette() or []
+    palette = palette[: GIF_TRANSPARENT_INDEX * 3]
+    palette += [0] * (256 * 3 - len(palette))
+    return indices.tobytes(), bytes(palette)
+
+
+def write_gif(
+    path: str, width: int, height: int, frames: List[Tuple[bytes, bytes, int]]
+) -> None:
+    """由量化后的帧 (调色板索引, 调色板, 时长 ms) 写出循环播放的 GIF"""
+    from PIL import Image
+
+    images = []
+    for indices, palette, _ in frames:
+        image = Image.frombytes("P", (width, height), indices)
+        image.putpalette(palette)
+        image.info["transparency"] = GIF_TRANSPARENT_INDEX
+        images.append(image)
+    images[0].save(
+        path,
+        save_all=True,
+        append_images=images[1:],
+        duration=[duration for _, _, duration in frames],
+        loop=0,
+        disposal=2,
+        transparency=GIF_TRANSPARENT_INDEX,
+        optimize=False,
+    )
+
+
+class FrameEncoder:
+    """把渲染好的 RGBA 帧提交到进程池编码, 结束时按顺序写出
+
+    - png: 每帧一个文件(`path` 为目录), 压缩和写文件都在工作进程中完成
+    - apng: 工作进程压缩各帧, 主进程只拼接数据块
+    - gif: 工作进程量化颜色, 主进程写出(需要 Pillow)
+
+    动画格式中相同的连续帧合并为一帧并累加时长.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        export_format: ExportFormat,
+        width: int,
+        height: int,
+        workers: Optional[int] = None,
+    ):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"不支持的导出格式: {export_format}")
+        self.path: str = path
+        self.format: ExportFormat = export_format
+        self.width: int = width
+        self.height: int = height
+        self.frames: int = 0  # 已提交的帧数(合并前)
+        # 工作进程只做 numpy/zlib/Pillow 计算, 以 spawn 启动, 不继承 GUI 线程的状态
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._futures: List[Future] = []
+        self._durations: List[int] = []
+        self._pending: Optional[bytes] = None  # 等待与后续相同帧合并的帧
+        if export_format == "png":
+            os.makedirs(path, exist_ok=True)
+
+    def add(self, pixels: bytes, duration: int):
+        """追加一帧(RGBA, 非预乘), 显示 `duration` 毫秒"""
+        index = self.frames
+        self.frames += 1
+        if self.format == "png":
+            path = os.path.join(self.path, f"frame_{index:05d}.png")
+            self._futures.append(
+                self._pool.submit(write_png, path, pixels, self.width, self.height)
+            )
+            self._durations.append(duration)
+            return
+        if (
+            self._pending == pixels
+            and self._durations[-1] + duration <= MAX_FRAME_DURATION
+        ):
+            self._durations[-1] += duration
+            return
+        self._submit_pending()
+        self._pending = pixels
+        self._durations.append(duration)
+
+    def close(self) -> int:
+        """等待编码完成并写出文件, 返回写出的帧数"""
+        self._submit_pending()
+        try:
+            results = [future.result() for future in self._futures]
+        finally:
+            self._pool.shutdown()
+        if not results:
+            return 0
+        if self.format == "apng":
+            write_apng(
+                self.path, self.width, self.height, list(zip(results, self._durations))
+            )
+        elif self.format == "gif":
+            write_gif(
+                self.path,
+                self.width,
+                self.height,
+                [
+                    (indices, palette, duration)
+                    for (indices, palette), duration in zip(results, self._durations)
+                ],
+            )
+        return len(results)
+
+    def _submit_pending(self):
+        if self._pending is None:
+            return
+        encode = compress_rgba if self.format == "apng" else quantize_gif_frame
+        self._futures.append(
+            self._pool.submit(encode, self._pending, self.width, self.height)
+        )
+        self._pending = None
@@ -0,0 +1,155 @@
+import random
+import sys
+from typing import TYPE_CHECKING, Iterable, List, TypedDict
+
+import numpy as np
+from PySide6.QtCore import QPoint, QSize, Qt
+from PySide6.QtGui import QImage, QPainter, QRegion
+from PySide6.QtWidgets import QWidget
+
+from ..animation import FRAME_FORMAT, ParticleSystem, device_size
+from ..state import StateMachine
+from ..state.base_state import PetState
+from .encoders import FrameEncoder
+
+if TYPE_CHECKING:
+    from ..MainLayer import MainLayer
+
+
+class ExportStep(TypedDict):
+    state: str  # PetState 的名称, 如 "HUNGRY"
+    duration: int  # 停留时长(ms)
+
+
+def parse_script(script: str) -> List[ExportStep]:
+    """解析 "NORMAL:3000,HUNGRY:2000,EATING:1500" 形式的状态序列"""
+    steps: List[ExportStep] = []
+    for item in script.split(","):
+        if not item.strip():
+            continue
+        state, _, duration = item.partition(":")
+        state = state.strip().upper()
+        if state not in PetState.__members__:
+            raise ValueError(f"未知状态: {state}")
+        steps.append({"state": state, "duration": int(duration or 1000)})
+    return steps
+
+
+class VirtualClock:
+    """可手动推进的时钟, 作为调度器的时钟使用(单位 s, 与 time.monotonic 一致)"""
+
+    def __init__(self):
+        self.ms: float = 0.0
+
+    def __call__(self) -> float:
+        return self.ms / 1000
+
+    def set(self, ms: float):
+        self.ms = ms
+
+
+class AnimationRecorder:
+    """离线回放状态序列并按精确时间戳渲染宠物
+
+    宠物窗口不显示, 也不运行 Qt 事件循环: 状态机的定时任务和帧切换都挂在使用虚拟时钟的调度器上,
+    渲染每一帧前按截止时刻依次执行到期的任务, 因此同一脚本每次导出的结果相同, 与机器快慢无关.
+    """
+
+    def __init__(self, main_layer: "MainLayer", clock: VirtualClock, seed: int = 0):
+        self.main_layer: MainLayer = main_layer
+        self.clock: VirtualClock = clock
+        self.scheduler = main_layer.scheduler
+        # 任务严格在截止时刻执行, 不做合并
+        self.scheduler.coarse_tolerance = 0
+        # 不运行事件循环, 采样结果不会被显示
+        main_layer.system_monitor.stop()
+        self.pet_window = main_layer.pet_window
+        self.pet_window.player.use_scheduler(self.scheduler)
+        self.pet_window.set_chat_enabled(False)
+        random.seed(seed)
+        self.pet_window.particles.system = ParticleSystem(
+            self.pet_window.particles.system.capacity,
+            rng=np.random.default_rng(seed),
+        )
+
+    @property
+    def frame_size(self) -> QSize:
+        """输出帧的尺寸(设备像素), 与宠物的完整帧一致, 不随裁剪变化"""
+        return device_size(
+            self.pet_window.frame_size, self.pet_window.device_pixel_ratio
+        )
+
+    def preload(self):
+        """同步解码所有状态的动画, 导出期间不淘汰, 回放时不会出现占位帧"""
+        library = self.main_layer.animation_library
+        resource_manager = self.main_layer.resource_manager
+        gif_paths = [
+            gif_path
+            for category in StateMachine.STATE_ANIMATIONS.values()
+            for gif_path in resource_manager.get_gif(category)
+        ]
+        library.resize(library.cache.max_entries + len(gif_paths), sys.maxsize)
+        for gif_path in gif_paths:
+            self.pet_window.preload_gif(gif_path)
+
+    def record(self, steps: Iterable[ExportStep], fps: int, encoder: FrameEncoder):
+        """依次进入各状态, 以 `fps` 帧率渲染并交给 `encoder`"""
+        state_machine = self.pet_window.state_machine
+        start = self.clock.ms
+        elapsed, index = 0, 0
+        for step in steps:
+            self._advance_to(start + elapsed)
+            state_machine.transition_to(PetState[step["state"]])
+            elapsed += step["duration"]
+            while index * 1000 / fps < elapsed:
+                timestamp = round(index * 1000 / fps)
+                duration = round((index + 1) * 1000 / fps) - timestamp
+                self._advance_to(start + timestamp)
+                encoder.add(self.render_frame(), duration)
+                index += 1
+
+    def render_frame(self) -> bytes:
+        """当前画面(动画帧和粒子)的 RGBA 像素(非预乘)"""
+        ratio = self.pet_window.device_pixel_ratio
+        image = QImage(self.frame_size, FRAME_FORMAT)
+        image.setDevicePixelRatio(ratio)
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        # 精灵控件只显示裁剪后的区域, 按其在完整帧中的位置绘制
+        # 不绘制窗口背景, 透明部分保持透明
+        self.pet_window.sprite_view.render(
+            painter,
+            QPoint(self.pet_window.crop_rect.topLeft()),
+            QRegion(),
+            QWidget.RenderFlag.DrawChildren,
+        )
+        # 粒子层覆盖整个窗口, 按精灵控件在窗口中的位置对齐到完整帧
+        particles = self.pet_window.particles
+        particles.render(
+            painter,
+            self.pet_window.crop_rect.topLeft()
+            - self.pet_window.sprite_view.mapTo(self.pet_window, QPoint(0, 0)),
+            QRegion(),
+            QWidget.RenderFlag.DrawChildren,
+        )
+        painter.end()
+        image = image.convertToFormat(QImage.Format.Format_RGBA8888)
+        return bytes(image.constBits())
+
+    def _advance_to(self, ms: float):
+        """按截止时刻顺序执行 `ms` 之前到期的所有任务, 再把时钟推进到 `ms`"""
+        while True:
+            deadline = self.scheduler.next_deadline()
+            if deadline is None or deadline > ms:
+                break
+            self._set_time(deadline)
+            if not self.scheduler.run_due():
+                # 毫秒与秒换算的浮点误差使任务看起来尚未到期
+                self._set_time(deadline + 0.001)
+                self.scheduler.run_due()
+        self._set_time(ms)
+
+    def _set_time(self, ms: float):
+        if ms > self.clock.ms:
+            self.pet_window.particles.system.step(ms - self.clock.ms)
+        self.clock.set(ms)
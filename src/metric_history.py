@@ -0,0 +1,97 @@
+from typing import Dict, Literal, Sequence, Tuple, TypedDict
+
+import numpy as np
+
+HistoryMetric = Literal["cpu", "memory", "recv", "send"]
+HISTORY_METRICS: Tuple[HistoryMetric, ...] = ("cpu", "memory", "recv", "send")
+"""记录的指标: CPU/内存使用率(%), 下载/上传速度(B/s)"""
+
+EWMA_ALPHA = 0.2
+"""指数加权平均中最新样本的权重"""
+
+
+class MetricStats(TypedDict):
+    last: float
+    ewma: float
+    min: float
+    max: float
+    p95: float
+
+
+class MetricHistory:
+    """固定容量的指标环形缓冲区
+
+    所有指标共用一块预分配的 NumPy 数组(每行一个指标), 追加样本只写入游标所在的一列,
+    写满后覆盖最早的样本, 因此内存占用只取决于容量, 与运行时长无关.
+    统计量在需要时对整个窗口做一次向量化计算.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity: int = max(2, int(capacity))
+        self._index: Dict[HistoryMetric, int] = {
+            metric: row for row, metric in enumerate(HISTORY_METRICS)
+        }
+        self._values = np.zeros((len(HISTORY_METRICS), self.capacity), np.float64)
+        self._times = np.zeros(self.capacity, np.float64)
+        self._cursor: int = 0  # 下一次写入的列
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, time: float, values: Sequence[float]):
+        """追加一个样本, `values` 按 `HISTORY_METRICS` 的顺序排列"""
+        self._values[:, self._cursor] = values
+        self._times[self._cursor] = time
+        self._cursor = (self._cursor + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def values(self, metric: HistoryMetric) -> np.ndarray:
+        """窗口内 `metric` 的样本, 从旧到新"""
+        return self._ordered(self._values[self._index[metric]])
+
+    def times(self) -> np.ndarray:
+        """窗口内各样本的时刻(time.monotonic), 从旧到新"""
+        return self._ordered(self._times)
+
+    def stats(self, metric: HistoryMetric, alpha: float = EWMA_ALPHA) -> MetricStats:
+        """窗口内 `metric` 的最新值, 指数加权平均, 最小值, 最大值和 95 分位数"""
+        values = self.values(metric)
+        if not len(values):
+            return {"last": 0.0, "ewma": 0.0, "min": 0.0, "max": 0.0, "p95": 0.0}
+        # 第 i 个样本的权重为 (1 - alpha) ^ (距最新样本的个数), 归一化后加权求和
+        weights = (1 - alpha) ** np.arange(len(values) - 1, -1, -1, dtype=np.float64)
+        return {
+            "last": float(values[-1]),
+            "ewma": float(weights @ values / weights.sum()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "p95": float(np.percentile(values, 95)),
+        }
+
+    def resize(self, capacity: int):
+        """修改容量, 保留最新的样本"""
+        capacity = max(2, int(capacity))
+        if capacity == self.capacity:
+            return
+        count = min(self._count, capacity)
+        values = np.zeros((len(HISTORY_METRICS), capacity), np.float64)
+        times = np.zeros(capacity, np.float64)
+        if count:
+            values[:, :count] = np.stack(
+                [self.values(metric)[-count:] for metric in HISTORY_METRICS]
+            )
+            times[:count] = self.times()[-count:]
+        self.capacity = capacity
+        self._values, self._times = values, times
+        self._cursor = count % capacity
+        self._count = count
+
+    def clear(self):
+        self._cursor = 0
+        self._count = 0
+
+    def _ordered(self, row: np.ndarray) -> np.ndarray:
+        if self._count < self.capacity:
+            return row[: self._count].copy()
+        return np.concatenate((row[self._cursor :], row[: self._cursor]))
@@ -1,8 +1,17 @@
 import os
 import random
-from typing import Dict, List, Optional, TYPE_CHECKING
-from PySide6.QtCore import Qt, QSize, QUrl, QEvent, Signal
-from PySide6.QtGui import QMovie, QIcon, QTransform
+from typing import Any, Callable, List, Optional, Tuple, TYPE_CHECKING
+from PySide6.QtCore import Qt, QPoint, QRect, QSize, QUrl, QEvent, Signal
+from PySide6.QtGui import (
+    QColor,
+    QGuiApplication,
+    QHideEvent,
+    QIcon,
+    QMoveEvent,
+    QRegion,
+    QResizeEvent,
+    QShowEvent,
+)
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PySide6.QtWidgets import (
     QMainWindow,
@@ -12,8 +21,22 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
 )
 
+from .animation import (
+    DEFAULT_FRAME_DELAY,
+    Animation,
+    AnimationKey,
+    AnimationLibrary,
+    AnimationPlayer,
+    ParticleLayer,
+    SpriteView,
+    crossfade,
+    device_size,
+    limit_frame_rate,
+)
 from .state import StateMachine
 from .config import Config
+from .sparkline import Sparkline
+from .speech_bubble import SpeechBubble
 from .style_sheet import generate_pet_info_css
 
 if TYPE_CHECKING:
@@ -28,12 +51,32 @@ class PetWindow(QMainWindow):
     def __init__(self, config: Config, main_layer: "MainLayer"):
         super().__init__()
         self.config: Config = config
-        self.movie: Optional[QMovie] = None  # 当前动画
-        self.movie_cache: Dict[str, QMovie] = {}
         self.main_layer: MainLayer = main_layer
+        self.animation: Optional[Animation] = None  # 当前动画
+        self.gif_path: Optional[str] = None
+        self.mirror: bool = False
+        self.frame_size: QSize = QSize(
+            self.config.config["Window"]["Width"],
+            self.config.config["Window"]["Height"],
+        )
+        self.fps: int = self.config.config["Animation"]["FPS"]
+        # 帧按所在屏幕的设备像素比解码, 绘制时无需再缩放
+        self.device_pixel_ratio: float = 1.0
+        # 窗口只覆盖当前动画的不透明区域(帧坐标, 已按镜像翻转), 减少合成面积
+        self.crop_rect: QRect = QRect(QPoint(0, 0), self.frame_size)
+        # 点击穿透模式下当前窗口掩码对应的 (点击掩码, 镜像, 裁剪区域, 信息框可见)
+        self._input_mask: Optional[Tuple[Any, bool, QRect, bool]] = None
+        self.suspended: bool = False  # 隐藏/最小化时挂起渲染和定时器
+        # 已解码的动画由所有宠物共用, 未命中时经由 ResourceManager 的资源包/磁盘帧缓存加载
+        # 镜像在绘制时处理, 因此只按 (路径, 设备像素尺寸, 帧率) 缓存
+        self.library: AnimationLibrary = main_layer.animation_library
+        self.library.loaded.connect(self._on_animation_loaded)
+        self.player: AnimationPlayer = AnimationPlayer(self)
+        self.player.switched.connect(self._on_animation_switched)
 
         # 初始化UI组件
         self._setup_ui()
+        self.player.attach(self._present_frame)
         # 初始化窗口属性
         self._setup_window()
         # 加载资源
@@ -42,6 +85,10 @@ class PetWindow(QMainWindow):
         self._setup_audio()
         # 初始化状态机
         self._setup_state_machine()
+        # 跟随所在屏幕的设备像素比
+        self.device_pixel_ratio = self.devicePixelRatioF()
+        if self.windowHandle() is not None:
+            self.windowHandle().screenChanged.connect(self._update_frame_size)
 
     def _setup_window(self):
         """设置窗口属性"""
@@ -64,28 +111,32 @@ class PetWindow(QMainWindow):
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.setSpacing(0)
 
-        # 动画标签
-        self.animation_label = QLabel()
-        self.animation_label.setFixedSize(
-            self.config.config["Window"]["Width"],
-            self.config.config["Window"]["Height"],
-        )
-        self.animation_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # 动画控件
+        self.sprite_view = SpriteView()
+        self.sprite_view.setFixedSize(self.frame_size)
+        # 对话气泡是独立的小窗口, 不影响本窗口的布局
+        self.speech_bubble = SpeechBubble(self, self.config)
+        self.chat_enabled: bool = self.config.config["Chat"]["Enabled"]
 
         # 信息窗口
         self._setup_info_widget()
 
         # 添加组件到布局
-        self.main_layout.addWidget(self.animation_label)
+        self.main_layout.addWidget(
+            self.sprite_view,
+            alignment=Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+        )
         self.main_layout.addWidget(self.info_widget)
 
         # 更新窗口大小
         self._update_window_size()
+        # 互动反馈的粒子效果, 覆盖整个窗口(不受精灵裁剪区域限制), 在中央控件之后创建, 位于其上方
+        self.particles = ParticleLayer(self, self.sprite_view)
 
     def _setup_info_widget(self):
         """初始化信息窗口"""
         self.info_widget = QWidget()
-        self.info_widget.setFixedSize(150, 100)
+        self.info_widget.setFixedSize(150, 128)
         self.info_layout = QVBoxLayout(self.info_widget)
         self.info_layout.setContentsMargins(10, 5, 10, 5)
         self.info_layout.setSpacing(2)
@@ -102,12 +153,17 @@ class PetWindow(QMainWindow):
         ]:
             self.info_layout.addWidget(label)
 
+        # 最近一段时间的 CPU 使用率曲线
+        self.cpu_sparkline = Sparkline(
+            self.main_layer.system_monitor.history, "cpu", "CPU"
+        )
+        self.cpu_sparkline.setFixedHeight(24)
+        self.info_layout.addWidget(self.cpu_sparkline)
+
         self.update_theme()
 
     def _load_resources(self):
         """加载资源文件"""
-        self._load_gif_files()
-
         # 鼠标交互属性
         self.setMouseTracking(True)
 
@@ -140,22 +196,192 @@ class PetWindow(QMainWindow):
 
     def _update_window_size(self):
         """更新窗口大小"""
+        total_width = self.sprite_view.width()
+        total_height = self.sprite_view.height()
         if self.config.config["Info"]["ShowInfo"]:
-            total_width = (
-                self.config.config["Window"]["Width"]
-                + self.info_widget.width()
-                + self.main_layout.spacing()
-            )
-        else:
-            total_width = self.config.config["Window"]["Width"]
-        total_height = self.config.config["Window"]["Height"]
+            total_width += self.info_widget.width() + self.main_layout.spacing()
+            total_height = max(total_height, self.info_widget.height())
         self.setFixedSize(total_width, total_height)
 
-    def _load_gif_files(self):
-        """加载GIF文件"""
-        for gif_path in self.main_layer.resource_manager.get_all_gif():
-            self.movie_cache[gif_path] = QMovie(gif_path)
-            self.movie_cache[gif_path].stop()
+    def _present_frame(self, animation: Animation, index: int):
+        """显示一帧"""
+        self.sprite_view.show_frame(animation, index)
+        if self._input_mask is not None or self.config.config["Window"]["ClickThrough"]:
+            self._update_input_mask()
+
+    def _update_input_mask(self):
+        """点击穿透模式: 用当前帧的不透明区域作为窗口掩码, 只在掩码变化时更新"""
+        animation = self.sprite_view.animation
+        if (
+            not self.config.config["Window"]["ClickThrough"]
+            or not self.config.config["Window"]["Frameless"]
+            or animation is None
+            or not len(animation)
+        ):
+            if self._input_mask is not None:
+                self._input_mask = None
+                self.clearMask()
+            return
+
+        mask = animation.hit_masks()[self.sprite_view.frame_index]
+        state = (
+            mask,
+            self.sprite_view.mirrored,
+            QRect(self.crop_rect),
+            self.info_widget.isVisible(),
+        )
+        previous = self._input_mask
+        if previous is not None and previous[0] is mask and previous[1:] == state[1:]:
+            return
+        self._input_mask = state
+
+        region = self.sprite_view.mask_region()
+        region.translate(self.sprite_view.mapTo(self, QPoint(0, 0)))
+        if self.info_widget.isVisible():
+            region = region.united(
+                QRegion(
+                    QRect(
+                        self.info_widget.mapTo(self, QPoint(0, 0)),
+                        self.info_widget.size(),
+                    )
+                )
+            )
+        self.setMask(region)
+
+    def hit_test(self, pos: QPoint) -> bool:
+        """窗口坐标 `pos` 处是否点中了宠物(精灵的透明像素不算, 信息框区域总是算)"""
+        if not self.sprite_view.geometry().contains(
+            self.sprite_view.parentWidget().mapFrom(self, pos)
+        ):
+            return True
+        return self.sprite_view.hit_test(self.sprite_view.mapFrom(self, pos))
+
+    def _update_crop(self, animation: Optional[Animation] = None):
+        """将窗口裁剪到动画的不透明区域, 并移动窗口使精灵在屏幕上的位置保持不变
+
+        标准窗口模式(便于录屏)下保持完整尺寸.
+        """
+        crop = QRect(QPoint(0, 0), self.frame_size)
+        if (
+            animation is not None
+            and animation.logical_size == self.frame_size
+            and self.config.config["Window"]["Frameless"]
+        ):
+            opaque = animation.to_logical(animation.opaque_rect())
+            if not opaque.isEmpty():
+                crop = opaque
+                if self.mirror:
+                    crop.moveLeft(self.frame_size.width() - opaque.right() - 1)
+        if crop == self.crop_rect and self.sprite_view.size() == crop.size():
+            return
+        offset = crop.topLeft() - self.crop_rect.topLeft()
+        self.crop_rect = crop
+        if not offset.isNull():
+            self.move(self.pos() + offset)
+        self.sprite_view.set_viewport(crop)
+        self.sprite_view.setFixedSize(crop.size())
+        self._update_window_size()
+
+    def frame_params(self) -> Tuple[int, int, int]:
+        """当前的 (宽, 高(设备像素), 帧率), 即动画库键中除路径外的部分"""
+        size = device_size(self.frame_size, self.device_pixel_ratio)
+        return (size.width(), size.height(), self.fps)
+
+    def _animation_key(self, gif_path: str) -> AnimationKey:
+        """当前窗口尺寸, 设备像素比和帧率下 `gif_path` 在动画库中的键"""
+        return (gif_path, *self.frame_params())
+
+    def _get_animation(self, gif_path: str) -> Animation:
+        """获取动画帧: 命中缓存时直接复用, 否则提交后台解码并先返回只含第一帧的占位动画"""
+        animation = self.library.get(self._animation_key(gif_path))
+        if animation is not None:
+            return animation
+
+        self._request_animation(gif_path)
+        first_frame = self.main_layer.resource_manager.load_first_frame(
+            gif_path, device_size(self.frame_size, self.device_pixel_ratio)
+        )
+        if first_frame is None:
+            return Animation([], [], source=gif_path)
+        return Animation(
+            [first_frame], [DEFAULT_FRAME_DELAY], source=gif_path
+        ).with_device_pixel_ratio(self.device_pixel_ratio)
+
+    def _request_animation(self, gif_path: str, priority: int = 0):
+        """提交后台解码任务"""
+        self.library.request(
+            self._animation_key(gif_path), self._decoder(gif_path), priority
+        )
+
+    def _decoder(self, gif_path: str) -> Callable[[], Animation]:
+        """按当前尺寸, 设备像素比和帧率解码动画的任务(在工作线程中执行)"""
+        resource_manager = self.main_layer.resource_manager
+        ratio, fps = self.device_pixel_ratio, self.fps
+        size = device_size(self.frame_size, ratio)
+        return lambda: limit_frame_rate(
+            resource_manager.load_animation(gif_path, size), fps
+        ).with_device_pixel_ratio(ratio)
+
+    def _on_animation_loaded(self, key: AnimationKey, animation: Animation):
+        """后台解码完成: 若仍是当前动画则替换占位帧"""
+        if (
+            self.gif_path is not None
+            and key == self._animation_key(self.gif_path)
+            and animation is not self.animation
+        ):
+            self.animation = animation
+            self.player.retarget(animation)
+
+    def _on_animation_switched(self):
+        """新动画开始呈现时才切换镜像和裁剪区域, 保证旧动画的最后一帧按原样显示"""
+        self.sprite_view.set_mirrored(self.mirror)
+        self._update_crop(self.player.animation)
+
+    def _crossfade_to(self, animation: Animation, mirror: bool) -> Optional[Animation]:
+        """由当前显示的帧淡入到新动画第一帧的过渡帧, 未启用时返回 None"""
+        duration = self.config.config["Animation"]["CrossfadeMS"]
+        previous = self.player.current_frame()
+        if duration <= 0 or previous is None or not len(animation):
+            return None
+        if mirror != self.sprite_view.mirrored:
+            # 过渡帧按新动画的方向绘制
+            previous = previous.flipped(Qt.Orientation.Horizontal)
+        return crossfade(
+            previous, animation.frames[0], duration, self.fps, animation.source
+        )
+
+    def _update_frame_size(self):
+        """宠物尺寸, 帧率或设备像素比(移动到其他屏幕)改变时更新动画控件并按新参数重新加载动画
+
+        磁盘帧缓存保留每块屏幕对应尺寸的帧, 在屏幕之间来回拖动时只需重新读取, 无需重新解码.
+        """
+        size = QSize(
+            self.config.config["Window"]["Width"],
+            self.config.config["Window"]["Height"],
+        )
+        fps = self.config.config["Animation"]["FPS"]
+        ratio = self.devicePixelRatioF()
+        if (
+            size == self.frame_size
+            and fps == self.fps
+            and ratio == self.device_pixel_ratio
+        ):
+            return
+        if size != self.frame_size:
+            self.frame_size = size
+            self._update_crop()
+            self.main_layer.resource_manager.frame_cache.prune(
+                {
+                    device_size(size, screen.devicePixelRatio())
+                    for screen in QGuiApplication.screens()
+                }
+            )
+        self.fps = fps
+        self.device_pixel_ratio = ratio
+        # 丢弃没有宠物再使用的旧帧组和仍在解码的旧任务(其他宠物仍在使用的保留)
+        self.main_layer.prune_animations()
+        if self.gif_path:
+            self.play_gif(self.gif_path, self.mirror)
 
     def _load_gif_from_folder(self, folder_path: str) -> List[str]:
         """从文件夹加载GIF文件"""
@@ -171,41 +397,30 @@ class PetWindow(QMainWindow):
     # ========== 公共方法 ==========
     def play_gif(self, gif_path: str, mirror: bool = False):
         """播放GIF动画"""
-        if not os.path.exists(gif_path):
+        if not self.main_layer.resource_manager.has_gif(gif_path):
             print(f"GIF文件不存在: {gif_path}")
             return
 
-        if self.movie:
-            self.movie.stop()
-            self.animation_label.clear()
+        self.player.mark_switch()
+        animation = self._get_animation(gif_path)
+        lead_in = self._crossfade_to(animation, mirror)
+        self.gif_path = gif_path
+        self.mirror = mirror
+        self.animation = animation
+        # 当前帧保持显示, 到下一帧边界再换成新动画, 避免切换时闪烁
+        self.player.switch_to(animation, lead_in)
 
-        movie = self.movie_cache.get(gif_path, None)
-        if movie is None:
-            movie = QMovie(gif_path)
-            self.movie_cache[gif_path] = movie
+    def preload_gif(self, gif_path: str):
+        """在当前线程解码动画并放入动画库, 之后播放时直接是完整动画(离线导出使用)"""
+        self.library.load(self._animation_key(gif_path), self._decoder(gif_path))
 
-        movie.setScaledSize(
-            QSize(
-                self.config.config["Window"]["Width"],
-                self.config.config["Window"]["Height"],
-            )
-        )
-        self.movie = movie
-
-        if mirror:
-            # 连接帧变化信号，实现逐帧镜像
-            def update_frame():
-                if not self.movie:
-                    return
-                frame = self.movie.currentPixmap()
-                mirrored = frame.transformed(QTransform().scale(-1, 1))
-                self.animation_label.setPixmap(mirrored)
-
-            self.movie.frameChanged.connect(update_frame)
-            self.movie.start()
-        else:
-            self.animation_label.setMovie(self.movie)
-            self.movie.start()
+    def gif_requested(self, gif_path: str) -> bool:
+        """动画在当前尺寸下已缓存或正在解码"""
+        return self.library.has(self._animation_key(gif_path))
+
+    def prefetch_gif(self, gif_path: str):
+        """在后台预热动画(低优先级), 已缓存或正在解码时忽略"""
+        self.library.prefetch(self._animation_key(gif_path), self._decoder(gif_path))
 
     def set_info_visible(self):
         """设置信息窗口可见性"""
@@ -237,6 +452,7 @@ class PetWindow(QMainWindow):
             flags |= Qt.WindowType.FramelessWindowHint
 
         self.setWindowFlags(flags)
+        self._update_crop(self.player.animation)
         self.show()
 
     def update_theme(self):
@@ -246,9 +462,25 @@ class PetWindow(QMainWindow):
         # 设置信息窗口样式
         self.info_widget.setStyleSheet(generate_pet_info_css(colors))
         self.info_widget.setObjectName("PetInfoWindowInfoWidget")
+        self.cpu_sparkline.set_color(QColor(colors.get("primary", "#ff69b4")))
+        self.speech_bubble.update_theme()
+
+    def say(self, text: str, duration: int = 3000):
+        """在头顶的气泡中显示一条消息(对话关闭或宠物挂起时忽略)"""
+        if not self.chat_enabled or self.suspended:
+            return
+        self.speech_bubble.show_message(text, duration)
+
+    def set_chat_enabled(self, enabled: bool):
+        """开启/关闭对话气泡"""
+        self.chat_enabled = enabled
+        if not enabled:
+            self.speech_bubble.hide_message()
 
     def update_config(self):
         """更新配置"""
+        # 更新宠物尺寸
+        self._update_frame_size()
         # 更新信息框显示状态
         self.set_info_visible()
         # 更新窗口模式
@@ -256,20 +488,89 @@ class PetWindow(QMainWindow):
         self.set_frameless_mode(self.config.config["Window"]["Frameless"])
         # 更新主题
         self.update_theme()
+        # 更新点击穿透
+        self._update_input_mask()
         self.state_machine.update_config()
 
+    def suspend(self):
+        """挂起: 暂停动画解码和非必要的定时器"""
+        if self.suspended or not hasattr(self, "state_machine"):
+            return
+        self.suspended = True
+        self.player.pause()
+        self.particles.pause()
+        self.speech_bubble.hide_message()
+        self.state_machine.suspend()
+        self._update_spatial_index()
+        self.main_layer.update_sampling()
+
+    def resume(self):
+        """恢复: 继续播放动画, 并让状态机补偿挂起期间的变化"""
+        if not self.suspended:
+            return
+        self.suspended = False
+        self.player.resume()
+        self.particles.resume()
+        self.main_layer.update_sampling()
+        self.state_machine.resume()
+        self._update_spatial_index()
+
+    def _update_spatial_index(self):
+        """在所有宠物共用的空间索引中登记窗口区域(隐藏/挂起时移除), 用于宠物之间的碰撞检测"""
+        index = self.main_layer.pet_index
+        if self.suspended or not self.isVisible():
+            index.remove(self)
+        else:
+            index.update(self, self.frameGeometry())
+
     # ========== 事件处理 ==========
     def event(self, event: QEvent) -> bool:
         """事件处理"""
+        if event.type() == QEvent.Type.DevicePixelRatioChange:
+            self._update_frame_size()
         if hasattr(self, "state_machine") and self.state_machine.handle_event(event):
             return True
         return super().event(event)
 
+    def moveEvent(self, event: QMoveEvent):
+        super().moveEvent(event)
+        self._update_spatial_index()
+        self.speech_bubble.follow()
+
+    def resizeEvent(self, event: QResizeEvent):
+        super().resizeEvent(event)
+        self._update_spatial_index()
+        self.speech_bubble.follow()
+
+    def hideEvent(self, event: QHideEvent):
+        """窗口隐藏时挂起"""
+        self.suspend()
+        super().hideEvent(event)
+
+    def showEvent(self, event: QShowEvent):
+        """窗口显示时恢复"""
+        super().showEvent(event)
+        if not self.isMinimized():
+            self.resume()
+
+    def changeEvent(self, event: QEvent):
+        """最小化时挂起, 还原时恢复"""
+        if event.type() == QEvent.Type.WindowStateChange:
+            if self.isMinimized():
+                self.suspend()
+            elif self.isVisible():
+                self.resume()
+        super().changeEvent(event)
+
     def closeEvent(self, event: QEvent):
-        """窗口关闭事件"""
-        if self.movie:
-            self.movie.stop()
-            self.movie.deleteLater()
+        """窗口关闭事件: 只释放本宠物, 最后一只宠物关闭时由 MainLayer 退出程序"""
+        self.player.detach()
+        self.particles.pause()
+        self.speech_bubble.hide_message()
+        self.speech_bubble.deleteLater()
+        self.library.loaded.disconnect(self._on_animation_loaded)
+        if hasattr(self, "state_machine"):
+            self.state_machine.close()
 
         if hasattr(self, "audio_player"):
             self.audio_player.stop()
@@ -278,4 +579,5 @@ class PetWindow(QMainWindow):
             self.audio_output.deleteLater()
 
         event.accept()
-        os._exit(0)
+        self.deleteLater()
+        self.main_layer.remove_pet(self)
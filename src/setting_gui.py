@@ -16,6 +16,7 @@ from PySide6.QtWidgets import (
 from .auto_typehint import ThemeHint
 from .config import Config
 from .style_sheet import generate_full_css, generate_preview_css
+from .tray_gauge import GAUGE_METRICS
 
 if TYPE_CHECKING:
     from .pet_window import PetWindow  # 仅用于类型检查，不会实际导入
@@ -26,7 +27,7 @@ class SettingsDialog(QDialog):
         super().__init__(parent)
         self.config: Config = config
         self.setWindowTitle("设置")
-        self.setFixedSize(400, 350)
+        self.setFixedSize(400, 530)
 
         # 设置对话框样式
         self.update_theme()
@@ -89,6 +90,23 @@ class SettingsDialog(QDialog):
         self.show_info_checkbox.setChecked(config.config["Info"]["ShowInfo"])
         form_layout.addRow("显示系统信息:", self.show_info_checkbox)
 
+        # 系统信息曲线时长
+        self.history_seconds_spin = QSpinBox()
+        self.history_seconds_spin.setRange(10, 3600)
+        self.history_seconds_spin.setSuffix(" 秒")
+        self.history_seconds_spin.setValue(self.config.config["Info"]["HistorySeconds"])
+        form_layout.addRow("曲线时长:", self.history_seconds_spin)
+
+        # 系统信息采样间隔
+        self.sample_interval_spin = QSpinBox()
+        self.sample_interval_spin.setRange(500, 10000)
+        self.sample_interval_spin.setSingleStep(500)
+        self.sample_interval_spin.setSuffix(" 毫秒")
+        self.sample_interval_spin.setValue(
+            self.config.config["Info"]["SampleIntervalMS"]
+        )
+        form_layout.addRow("采样间隔:", self.sample_interval_spin)
+
         # 随机移动设置
         self.allow_random_movement_checkbox = QCheckBox()
         self.allow_random_movement_checkbox.setChecked(
@@ -108,6 +126,27 @@ class SettingsDialog(QDialog):
         self.window_mode_checkbox.setChecked(self.config.config["Window"]["Frameless"])
         form_layout.addRow("无边框模式:", self.window_mode_checkbox)
 
+        # 点击穿透设置
+        self.click_through_checkbox = QCheckBox()
+        self.click_through_checkbox.setChecked(
+            self.config.config["Window"]["ClickThrough"]
+        )
+        form_layout.addRow("透明区域点击穿透:", self.click_through_checkbox)
+
+        # 对话气泡设置
+        self.chat_checkbox = QCheckBox()
+        self.chat_checkbox.setChecked(self.config.config["Chat"]["Enabled"])
+        form_layout.addRow("显示对话气泡:", self.chat_checkbox)
+
+        # 托盘图标模式
+        self.tray_gauge_combo = QComboBox()
+        for mode, label in GAUGE_METRICS.items():
+            self.tray_gauge_combo.addItem(label, mode)
+        self.tray_gauge_combo.setCurrentIndex(
+            self.tray_gauge_combo.findData(self.config.config["Tray"]["Gauge"])
+        )
+        form_layout.addRow("托盘图标:", self.tray_gauge_combo)
+
         main_layout.addLayout(form_layout)
 
         # 添加按钮布局
@@ -152,10 +191,19 @@ class SettingsDialog(QDialog):
         self.config.config["Window"][
             "Frameless"
         ] = self.window_mode_checkbox.isChecked()
+        self.config.config["Window"][
+            "ClickThrough"
+        ] = self.click_through_checkbox.isChecked()
         self.config.config["Theme"]["DefaultTheme"] = self.theme_combo.currentText()
         self.config.config["Random"]["Interval"] = self.random_interval_spin.value()
         self.config.config["Hunger"]["Rate"] = self.hunger_rate_spin.value()
         self.config.config["Info"]["ShowInfo"] = self.show_info_checkbox.isChecked()
+        self.config.config["Info"]["HistorySeconds"] = self.history_seconds_spin.value()
+        self.config.config["Info"][
+            "SampleIntervalMS"
+        ] = self.sample_interval_spin.value()
+        self.config.config["Chat"]["Enabled"] = self.chat_checkbox.isChecked()
+        self.config.config["Tray"]["Gauge"] = self.tray_gauge_combo.currentData()
         self.config.config["Workspace"][
             "AllowRandomMovement"
         ] = self.allow_random_movement_checkbox.isChecked()
@@ -165,10 +213,11 @@ class SettingsDialog(QDialog):
         self.parent_window: PetWindow = self.parent()  # type: ignore[assignment]
 
         # 更新窗口大小
-        self.parent_window.setFixedSize(
-            self.config.config["Window"]["Width"],
-            self.config.config["Window"]["Height"],
-        )
+        for pet_window in self.parent_window.main_layer.pets:
+            pet_window.setFixedSize(
+                self.config.config["Window"]["Width"],
+                self.config.config["Window"]["Height"],
+            )
 
         # # 更新随机切换间隔
         # parent_window.random_move_timer.setInterval(
@@ -176,10 +225,10 @@ class SettingsDialog(QDialog):
         # )
 
         # 更新对话功能状态
-        # TODO: 这里原版本里是有这个的, 但似乎并未实现(NotImplemented)
-        # parent_window.set_chat_enabled(self.config.enable_chat)
+        for pet_window in self.parent_window.main_layer.pets:
+            pet_window.set_chat_enabled(self.config.config["Chat"]["Enabled"])
 
-        self.parent_window.update_config()
+        self.parent_window.main_layer.update_config()
 
         # 显示保存成功提示
         QMessageBox.information(self, "提示", "设置已保存！")
@@ -0,0 +1,86 @@
+from typing import Callable, Optional
+
+import numpy as np
+from PySide6.QtCore import QEvent, QPointF, Qt
+from PySide6.QtGui import QColor, QHelpEvent, QPainter, QPaintEvent, QPen, QPolygonF
+from PySide6.QtWidgets import QToolTip, QWidget
+
+from .metric_history import HistoryMetric, MetricHistory
+
+
+def format_percent(value: float) -> str:
+    return f"{value:.0f}%"
+
+
+class Sparkline(QWidget):
+    """信息框中的迷你折线图
+
+    直接读取所有宠物共用的 `MetricHistory`, 自身不保存样本. 横轴固定为整个窗口的长度,
+    最新的样本在最右侧. 悬停时显示窗口内的统计量(按需计算).
+    """
+
+    def __init__(
+        self,
+        history: MetricHistory,
+        metric: HistoryMetric,
+        label: str,
+        maximum: Optional[float] = 100.0,
+        formatter: Callable[[float], str] = format_percent,
+        parent: Optional[QWidget] = None,
+    ):
+        super().__init__(parent)
+        self.history: MetricHistory = history
+        # 不能命名为 metric: 会覆盖 QPaintDevice.metric, 导致 QPainter 崩溃
+        self.series: HistoryMetric = metric
+        self.label: str = label
+        # 纵轴上限, None 表示按窗口内的最大值缩放
+        self.maximum: Optional[float] = maximum
+        self.formatter = formatter
+        self.color: QColor = QColor("#ff69b4")
+
+    def set_color(self, color: QColor):
+        self.color = QColor(color)
+        self.update()
+
+    def event(self, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.ToolTip and isinstance(event, QHelpEvent):
+            QToolTip.showText(event.globalPos(), self.tooltip_text(), self)
+            return True
+        return super().event(event)
+
+    def tooltip_text(self) -> str:
+        stats = self.history.stats(self.series)
+        f = self.formatter
+        return (
+            f"{self.label} (最近 {len(self.history)} 次采样)\n"
+            f"当前 {f(stats['last'])}  平均 {f(stats['ewma'])}\n"
+            f"最低 {f(stats['min'])}  最高 {f(stats['max'])}  P95 {f(stats['p95'])}"
+        )
+
+    def paintEvent(self, event: QPaintEvent):
+        values = self.history.values(self.series)
+        if len(values) < 2:
+            return
+        width, height = self.width() - 1, self.height() - 1
+        maximum = self.maximum or float(values.max())
+        if maximum <= 0:
+            maximum = 1.0
+        xs = np.linspace(0, width, self.history.capacity)[-len(values) :]
+        ys = height - np.clip(values / maximum, 0, 1) * height
+        line = QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # 折线下方填充半透明区域
+        area = QPolygonF(line)
+        area.append(QPointF(xs[-1], height))
+        area.append(QPointF(xs[0], height))
+        fill = QColor(self.color)
+        fill.setAlpha(60)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(fill)
+        painter.drawPolygon(area)
+        painter.setPen(QPen(self.color, 1.2))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPolyline(line)
+        painter.end()
@@ -0,0 +1,106 @@
+from typing import Dict, Generic, Hashable, Iterator, List, Set, Tuple, TypeVar
+
+from PySide6.QtCore import QRect
+
+T = TypeVar("T", bound=Hashable)
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash(Generic[T]):
+    """均匀网格空间索引
+
+    屏幕被划分为 `cell_size` 大小的格子, 每个对象登记在其矩形覆盖的所有格子中.
+    查询只检查矩形覆盖的格子, 对象移动时只更新进出的格子, 单次更新/查询的开销与对象总数无关.
+    格子大小取对象的典型尺寸时, 每个对象最多覆盖 4 个格子.
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size: int = max(1, int(cell_size))
+        self._cells: Dict[Cell, Set[T]] = {}
+        self._rects: Dict[T, QRect] = {}
+        self._item_cells: Dict[T, List[Cell]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._rects
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._rects)
+
+    def rect(self, item: T) -> QRect:
+        return QRect(self._rects[item])
+
+    def update(self, item: T, rect: QRect):
+        """插入或移动对象"""
+        cells = self._covered(rect)
+        previous = self._item_cells.get(item)
+        self._rects[item] = QRect(rect)
+        if previous == cells:
+            return
+        if previous is not None:
+            for cell in set(previous).difference(cells):
+                self._discard(cell, item)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(item)
+        self._item_cells[item] = cells
+
+    def remove(self, item: T):
+        """移除对象, 不存在时忽略"""
+        cells = self._item_cells.pop(item, None)
+        if cells is None:
+            return
+        del self._rects[item]
+        for cell in cells:
+            self._discard(cell, item)
+
+    def query(self, rect: QRect) -> Set[T]:
+        """与 `rect` 相交的所有对象"""
+        found: Set[T] = set()
+        for cell in self._covered(rect):
+            for item in self._cells.get(cell, ()):
+                if item not in found and self._rects[item].intersects(rect):
+                    found.add(item)
+        return found
+
+    def neighbors(self, item: T, margin: int = 0) -> Set[T]:
+        """与 `item` 的矩形(向外扩展 `margin`)相交的其他对象"""
+        rect = self._rects[item].adjusted(-margin, -margin, margin, margin)
+        found = self.query(rect)
+        found.discard(item)
+        return found
+
+    def resize(self, cell_size: int):
+        """修改格子大小并重建索引"""
+        cell_size = max(1, int(cell_size))
+        if cell_size == self.cell_size:
+            return
+        rects = self._rects
+        self.cell_size = cell_size
+        self.clear()
+        for item, rect in rects.items():
+            self.update(item, rect)
+
+    def clear(self):
+        self._cells = {}
+        self._rects = {}
+        self._item_cells = {}
+
+    def _covered(self, rect: QRect) -> List[Cell]:
+        """矩形覆盖的格子"""
+        if rect.isEmpty():
+            return []
+        size = self.cell_size
+        left, top = rect.left() // size, rect.top() // size
+        right, bottom = rect.right() // size, rect.bottom() // size
+        return [(x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)]
+
+    def _discard(self, cell: Cell, item: T):
+        items = self._cells.get(cell)
+        if items is None:
+            return
+        items.discard(item)
+        if not items:
+            del self._cells[cell]
@@ -0,0 +1,161 @@
+from typing import Optional, Tuple
+
+from PySide6.QtCore import QPoint, QPointF, QRectF, QSize, Qt, QTimer
+from PySide6.QtGui import (
+    QColor,
+    QFont,
+    QFontMetrics,
+    QPainter,
+    QPainterPath,
+    QPaintEvent,
+    QPen,
+    QPixmap,
+    QStaticText,
+    QTextOption,
+)
+from PySide6.QtWidgets import QWidget
+
+from .animation import LRUCache
+from .config import Config
+
+BubbleKey = Tuple[str, str, int, float]
+"""(文本, 主题名, 最大宽度, 设备像素比)"""
+
+
+class SpeechBubble(QWidget):
+    """宠物头顶的对话气泡
+
+    独立的无边框透明窗口, 跟随宠物窗口移动, 不参与宠物窗口的布局.
+    每条消息的文本排版(QStaticText)和气泡背景按 (文本, 主题, 尺寸) 渲染成 QPixmap 缓存,
+    重复出现的消息以及之后的每次重绘都只是一次贴图.
+    """
+
+    MAX_TEXT_WIDTH = 180
+    """文本最大宽度(px), 超出时自动换行"""
+
+    PADDING = 8
+    TAIL_HEIGHT = 8
+    """指向宠物的小三角高度"""
+
+    CACHE_ENTRIES = 32
+    CACHE_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, anchor: QWidget, config: Config):
+        super().__init__(
+            None,
+            Qt.WindowType.ToolTip
+            | Qt.WindowType.FramelessWindowHint
+            | Qt.WindowType.WindowStaysOnTopHint,
+        )
+        self.anchor: QWidget = anchor
+        self.config: Config = config
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.text_font: QFont = QFont()
+        self.text_font.setPixelSize(13)
+        self.cache: LRUCache[BubbleKey, QPixmap] = LRUCache(
+            self.CACHE_ENTRIES,
+            self.CACHE_BYTES,
+            sizeof=lambda key, pixmap: pixmap.width() * pixmap.height() * 4,
+        )
+        self.pixmap: Optional[QPixmap] = None
+        self.text: str = ""
+        self._hide_timer = QTimer(self)
+        self._hide_timer.setSingleShot(True)
+        self._hide_timer.timeout.connect(self.hide)
+
+    def update_theme(self):
+        """主题改变后重绘正在显示的消息, 已缓存的其他主题气泡仍保留"""
+        if self.isVisible() and self.text:
+            self._present(self.text)
+
+    def show_message(self, text: str, duration: int = 3000):
+        """显示消息, `duration` 毫秒后自动隐藏"""
+        self.text = text
+        self._present(text)
+        self._hide_timer.start(duration)
+
+    def hide_message(self):
+        self._hide_timer.stop()
+        self.hide()
+
+    def follow(self):
+        """移动到宠物上方居中(宠物窗口移动或改变大小时调用)"""
+        if self.pixmap is None:
+            return
+        anchor = self.anchor.frameGeometry()
+        x = anchor.center().x() - self.width() // 2
+        y = anchor.top() - self.height()
+        screen = self.anchor.screen()
+        if screen is not None:
+            # 宠物贴近屏幕边缘时保持气泡完整可见
+            area = screen.availableGeometry()
+            x = max(area.left(), min(x, area.right() - self.width() + 1))
+            y = max(area.top(), y)
+        self.move(QPoint(x, y))
+
+    def _present(self, text: str):
+        ratio = self.anchor.devicePixelRatioF()
+        theme = self.config.config["Theme"]["DefaultTheme"]
+        key: BubbleKey = (text, theme, self.MAX_TEXT_WIDTH, ratio)
+        pixmap = self.cache.get(key)
+        if pixmap is None:
+            pixmap = self._render(text, ratio)
+            self.cache.put(key, pixmap)
+        self.pixmap = pixmap
+        self.setFixedSize(pixmap.deviceIndependentSize().toSize())
+        self.follow()
+        self.show()
+        self.update()
+
+    def _render(self, text: str, ratio: float) -> QPixmap:
+        """排版文本并画出气泡背景"""
+        static_text = QStaticText(text)
+        option = QTextOption()
+        option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+        static_text.setTextOption(option)
+        metrics = QFontMetrics(self.text_font)
+        static_text.setTextWidth(
+            min(self.MAX_TEXT_WIDTH, metrics.horizontalAdvance(text) + 1)
+        )
+        static_text.prepare(font=self.text_font)
+        text_size = static_text.size()
+
+        size = QSize(
+            int(text_size.width()) + self.PADDING * 2,
+            int(text_size.height()) + self.PADDING * 2 + self.TAIL_HEIGHT,
+        )
+        pixmap = QPixmap(size * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        body = QRectF(0.5, 0.5, size.width() - 1, size.height() - self.TAIL_HEIGHT - 1)
+        path = QPainterPath()
+        path.addRoundedRect(body, 8, 8)
+        tail = QPainterPath()
+        center = body.center().x()
+        tail.moveTo(center - self.TAIL_HEIGHT, body.bottom() - 1)
+        tail.lineTo(center, body.bottom() + self.TAIL_HEIGHT)
+        tail.lineTo(center + self.TAIL_HEIGHT, body.bottom() - 1)
+        tail.closeSubpath()
+        path = path.united(tail)
+
+        colors = self.config.get_theme_colors()
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(QColor(colors.get("primary", "#aaaaaa")), 1))
+        painter.setBrush(QColor(colors.get("background", "#ffffff")))
+        painter.drawPath(path)
+        painter.setFont(self.text_font)
+        painter.setPen(QColor(colors.get("text", "#333333")))
+        painter.drawStaticText(QPointF(self.PADDING, self.PADDING), static_text)
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event: QPaintEvent):
+        if self.pixmap is None:
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.pixmap)
+        painter.end()
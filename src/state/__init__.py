@@ -1,6 +1,8 @@
+import random
 import time
-from typing import Any, Dict, List, Optional, Callable
-from PySide6.QtCore import QTimer, QEvent
+from typing import Any, Dict, List, Optional, Callable, Set, Type
+from PySide6.QtCore import QEvent
+from PySide6.QtGui import QMouseEvent
 from PySide6.QtWidgets import (
     QLabel,
 )
@@ -19,7 +21,9 @@ from .clicked_state_handler import ClickedStateHandler
 from .dragging_state_handler import DraggingStateHandler
 from .eating_state_handler import EatingStateHandler
 from .moving_state_handler import MovingStateHandler
-from ..system_monitor import SystemMonitor
+from .scheduler import ScheduledTask, Scheduler, SchedulerStats
+from ..auto_typehint import GifHint
+from ..system_monitor import SystemMonitor, SystemSample
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -29,6 +33,45 @@ if TYPE_CHECKING:
 class StateMachine:
     """状态机核心类"""
 
+    TRANSITIONS: Dict[PetState, Set[PetState]] = {
+        PetState.NORMAL: {
+            PetState.DRAGGING,
+            PetState.CLICKED,
+            PetState.MOVING,
+            PetState.HUNGRY,
+            PetState.EATING,
+        },
+        PetState.HUNGRY: {PetState.DRAGGING, PetState.EATING},
+        PetState.MOVING: {PetState.DRAGGING, PetState.EATING},
+        PetState.DRAGGING: set(),
+        PetState.EATING: {PetState.DRAGGING, PetState.CLICKED},
+        PetState.CLICKED: {PetState.DRAGGING, PetState.EATING},
+    }
+    """各状态可直接到达的下一状态(与处理器中的 transition_to 调用对应, 不含出栈返回;
+    喂食为全局右键菜单, 因此大部分状态都可进入 EATING)"""
+
+    STATE_ANIMATIONS: Dict[PetState, GifHint.GifDirLiteral] = {
+        PetState.NORMAL: "Common",
+        PetState.HUNGRY: "Hungry",
+        PetState.MOVING: "Move",
+        PetState.DRAGGING: "Drag",
+        PetState.EATING: "Eat",
+        PetState.CLICKED: "Click",
+    }
+    """各状态播放的动画分类"""
+
+    PREFETCH_DELAY = 1000
+    """进入空闲状态后开始预取的延迟(ms)"""
+
+    PREFETCH_PER_CATEGORY = 2
+    """每个可达分类最多预热的动画数(含已缓存的)"""
+
+    CPU_ALERT_PERCENT = 90
+    """CPU 使用率达到该值时在气泡中提醒"""
+
+    CPU_ALERT_COOLDOWN = 60.0
+    """两次 CPU 提醒之间的最短间隔(s)"""
+
     def __init__(self, pet_window: "PetWindow"):
         self.pet_window = pet_window
         self.current_state: Optional[PetState] = None
@@ -36,19 +79,46 @@ class StateMachine:
         self.state_handlers: Dict[PetState, StateHandler] = {}
         self.event_handlers: Dict[QEvent.Type, List[Callable[[QEvent], bool]]] = {}
         self.ui_components: Dict[str, QLabel] = {}
-        self.timers: Dict[str, QTimer] = {}
+        # 所有宠物的状态处理器定时任务统一由 MainLayer 的调度器管理, 共用同一个节拍
+        self.scheduler: Scheduler = self.pet_window.main_layer.scheduler
+        # 本宠物在共用调度器中注册的任务, 关闭时注销
+        self.tasks: List[ScheduledTask] = []
+        self.suspended_at: Optional[float] = None  # 挂起时刻, None 表示未挂起
 
-        # 网络监控初始化
-        self.system_monitor = SystemMonitor(self.pet_window.config)
-        self.last_net_io = self.system_monitor.get_network_usage()
-        self.last_net_time = time.time()
+        # 系统指标由所有宠物共用的后台采样器提供
+        self.system_monitor: SystemMonitor = self.pet_window.main_layer.system_monitor
+        self.last_cpu_alert: float = -self.CPU_ALERT_COOLDOWN
 
         # 初始化所有状态处理器
         self._init_state_handlers(self.pet_window.main_layer)
         # # 从正常状态开始
         # self.transition_to(PetState.NORMAL)
-        # 初始化系统监控定时器
-        self._init_system_monitor()
+        # 每次采样后刷新信息框
+        self.system_monitor.sampled.connect(self._update_system_info)
+        # 空闲时预取下一状态可能用到的动画
+        self.prefetch_task = self.create_task(
+            self.prefetch_next_animations, single_shot=True
+        )
+
+    def create_task(
+        self,
+        callback: Callable[[], object],
+        single_shot: bool = False,
+        precise: bool = False,
+        name: str = "",
+        align: bool = False,
+    ) -> ScheduledTask:
+        """在共用调度器中注册本宠物的任务(参数同 `Scheduler.create_task`)"""
+        task = self.scheduler.create_task(callback, single_shot, precise, name, align)
+        self.tasks.append(task)
+        return task
+
+    def close(self):
+        """宠物关闭: 注销定时任务, 不再接收系统采样"""
+        for task in self.tasks:
+            self.scheduler.remove_task(task)
+        self.tasks.clear()
+        self.system_monitor.sampled.disconnect(self._update_system_info)
 
     def _init_state_handlers(self, *args: Any, **kwargs: Dict[Any, Any]):
         """初始化所有状态处理器"""
@@ -64,16 +134,13 @@ class StateMachine:
 
         for state, instance in handler_classes.items():
             self.register_state_handler(state, instance)
-            for decorator in StateHandler.global_menu_decorators:
-                if decorator["cls"] == instance.__class__:
-                    decorator["cls"] = instance
 
-    def _init_system_monitor(self):
-        """初始化系统监控定时器"""
-        monitor_timer = QTimer()
-        monitor_timer.timeout.connect(self._update_system_info)
-        monitor_timer.start(2000)
-        self.timers["monitor"] = monitor_timer
+    def handler_of(self, cls: Type[StateHandler]) -> StateHandler:
+        """本状态机中 `cls` 类型的处理器实例(用于绑定全局右键菜单)"""
+        for handler in self.state_handlers.values():
+            if isinstance(handler, cls):
+                return handler
+        raise KeyError(cls.__name__)
 
     def register_state_handler(self, state: PetState, handler: StateHandler):
         """注册状态处理器"""
@@ -96,6 +163,8 @@ class StateMachine:
         """状态转换"""
         if self.current_state == new_state:
             return
+        # 从这里开始计算动画切换延迟, 到新动画第一帧呈现为止
+        self.pet_window.player.mark_switch()
 
         can_append_flag = True
         # 退出当前状态
@@ -124,6 +193,35 @@ class StateMachine:
 
         if res is False:
             self.pop_state()
+        elif new_state == PetState.NORMAL:
+            self.prefetch_task.start(self.PREFETCH_DELAY)
+
+    def reachable_states(self, state: Optional[PetState] = None) -> Set[PetState]:
+        """从 `state`(默认当前状态) 可直接到达的状态"""
+        state = state or self.current_state
+        if state is None:
+            return set()
+        return set(self.TRANSITIONS.get(state, set()))
+
+    def prefetch_next_animations(self):
+        """空闲时在后台预热可达状态的动画, 使切换时第一帧即可就绪
+
+        每个分类只预热少量随机挑选的动画, 缓存接近预算时停止, 避免挤掉正在播放的动画.
+        """
+        if self.current_state != PetState.NORMAL or self.suspended_at is not None:
+            return
+        library = self.pet_window.library
+        for state in sorted(self.reachable_states(), key=lambda state: state.value):
+            category = self.STATE_ANIMATIONS[state]
+            gif_paths = self.pet_window.main_layer.resource_manager.get_gif(category)
+            missing = [
+                path for path in gif_paths if not self.pet_window.gif_requested(path)
+            ]
+            count = self.PREFETCH_PER_CATEGORY - (len(gif_paths) - len(missing))
+            for gif_path in random.sample(missing, max(0, min(count, len(missing)))):
+                if library.near_budget():
+                    return
+                self.pet_window.prefetch_gif(gif_path)
 
     def pop_state(self):
         """从堆栈弹出上一个状态"""
@@ -136,6 +234,15 @@ class StateMachine:
 
     def handle_event(self, event: QEvent) -> bool:
         """处理事件"""
+        # 点在精灵透明像素上的按键不交给任何处理器
+        if (
+            event.type()
+            in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick)
+            and isinstance(event, QMouseEvent)
+            and not self.pet_window.hit_test(event.position().toPoint())
+        ):
+            return False
+
         # 先处理全局事件处理器
         if event.type() in self.event_handlers:
             for handler in self.event_handlers[event.type()]:
@@ -155,45 +262,60 @@ class StateMachine:
         if self.current_state in self.state_handlers:
             self.state_handlers[self.current_state].update_config()
 
-    def _update_system_info(self):
-        """更新系统信息"""
+    def suspend(self):
+        """挂起: 不再刷新系统信息, 并通知所有状态处理器暂停定时器"""
+        if self.suspended_at is not None:
+            return
+        self.suspended_at = time.monotonic()
+        for handler in self.state_handlers.values():
+            handler.on_suspend()
+
+    def resume(self):
+        """从挂起中恢复, 各处理器按挂起时长补偿状态"""
+        if self.suspended_at is None:
+            return
+        suspended_ms = int((time.monotonic() - self.suspended_at) * 1000)
+        self.suspended_at = None
+        for handler in self.state_handlers.values():
+            handler.on_resume(suspended_ms)
+
+    def _update_system_info(self, sample: SystemSample):
+        """显示一次采样结果(挂起和拖拽时跳过)"""
+        if self.suspended_at is not None or self.current_state == PetState.DRAGGING:
+            return
+        # CPU使用率(过高时无论信息框是否显示都会提醒)
+        self._check_cpu_alert(sample.cpu)
+
         if (
             "cpu_label" not in self.ui_components
             or not self.pet_window.config.config["Info"]["ShowInfo"]
         ):
             return
 
-        # CPU使用率
-        cpu_usage = self.system_monitor.get_cpu_usage()
-        self.ui_components["cpu_label"].setText(f"CPU: {cpu_usage}%")
+        self.ui_components["cpu_label"].setText(f"CPU: {sample.cpu}%")
 
         # 内存使用率
-        memory_usage = self.system_monitor.get_memory_usage()
-        self.ui_components["memory_label"].setText(f"内存: {memory_usage}%")
+        self.ui_components["memory_label"].setText(f"内存: {sample.memory}%")
 
         # 网络速度
-        current_net_io = self.system_monitor.get_network_usage()
-        current_time = time.time()
-        time_diff = current_time - self.last_net_time
-
-        if time_diff > 0:
-            bytes_sent = (
-                current_net_io["bytes_sent"] - self.last_net_io["bytes_sent"]
-            ) / time_diff
-            bytes_recv = (
-                current_net_io["bytes_recv"] - self.last_net_io["bytes_recv"]
-            ) / time_diff
-            total_speed = bytes_sent + bytes_recv
-
-            if total_speed < 1024 * 1024:
-                speed_str = f"{total_speed / 1024:.1f} KB/s"
-            else:
-                speed_str = f"{total_speed / (1024 * 1024):.1f} MB/s"
-
-            self.ui_components["network_label"].setText(f"网速: {speed_str}")
-
-        self.last_net_io = current_net_io
-        self.last_net_time = current_time
+        total_speed = sample.send_rate + sample.recv_rate
+        if total_speed < 1024 * 1024:
+            speed_str = f"{total_speed / 1024:.1f} KB/s"
+        else:
+            speed_str = f"{total_speed / (1024 * 1024):.1f} MB/s"
+        self.ui_components["network_label"].setText(f"网速: {speed_str}")
+        self.pet_window.cpu_sparkline.update()
+
+    def _check_cpu_alert(self, cpu_usage: float):
+        """CPU 使用率过高时在气泡中提醒(有冷却时间)"""
+        now = time.monotonic()
+        if (
+            cpu_usage < self.CPU_ALERT_PERCENT
+            or now - self.last_cpu_alert < self.CPU_ALERT_COOLDOWN
+        ):
+            return
+        self.last_cpu_alert = now
+        self.pet_window.say(f"CPU 好忙呀 ({cpu_usage:.0f}%)")
 
 
 __all__ = [
@@ -208,4 +330,7 @@ __all__ = [
     "HungryStateHandler",
     "MovingStateHandler",
     "NormalStateHandler",
+    "ScheduledTask",
+    "Scheduler",
+    "SchedulerStats",
 ]
@@ -12,6 +12,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from state import StateMachine
     from ..MainLayer import MainLayer
+    from ..pet_window import PetWindow
 
 
 class PetState(Enum):
@@ -39,7 +40,7 @@ class GlobalMenuDecoratorsType(TypedDict):
     label: str
     handler: str
     separator: bool
-    cls: Type["StateHandler"] | "StateHandler"
+    cls: Type["StateHandler"]
 
 
 class StateHandler(ABC):
@@ -57,6 +58,11 @@ class StateHandler(ABC):
             self.menu_decorators = []
         self._init_state()
 
+    @property
+    def pet_window(self) -> "PetWindow":
+        """处理器所属宠物的窗口"""
+        return self.state_machine.pet_window
+
     @abstractmethod
     def _init_state(self):
         """初始化状态特定的资源"""
@@ -82,6 +88,14 @@ class StateHandler(ABC):
         """更新配置钩子, 仅通知当前状态机, 不会触发状态切换. 正常配置应在 `on_enter` 时更新"""
         pass
 
+    def on_suspend(self):
+        """宠物隐藏/最小化时调用(所有处理器都会收到), 应暂停非必要的定时器"""
+        pass
+
+    def on_resume(self, suspended_ms: int):
+        """宠物重新显示时调用, `suspended_ms` 为挂起时长"""
+        pass
+
     def default_handle(self, event: QEvent) -> bool:
         """默认的全局事件处理方法"""
         if isinstance(event, QMouseEvent):
@@ -94,7 +108,7 @@ class StateHandler(ABC):
 
     def create_base_context_menu(self) -> QMenu:
         """创建右键菜单"""
-        menu = QMenu(self.main_layer.pet_window)
+        menu = QMenu(self.pet_window)
         menu.setStyleSheet(generate_menu_css())
 
         # 有特殊右键菜单的优先使用特殊菜单, 否则沿用全局注册的菜单
@@ -103,7 +117,7 @@ class StateHandler(ABC):
                 if decorator["separator"]:
                     menu.addSeparator()
                 try:
-                    action = QAction(decorator["label"], self.main_layer.pet_window)
+                    action = QAction(decorator["label"], self.pet_window)
                     if decorator["handler"]:
                         handler = getattr(self, decorator["handler"])
                         action.triggered.connect(handler)
@@ -115,9 +129,11 @@ class StateHandler(ABC):
                 if decorator["separator"]:
                     menu.addSeparator()
                 try:
-                    action = QAction(decorator["label"], self.main_layer.pet_window)
+                    action = QAction(decorator["label"], self.pet_window)
                     if decorator["handler"]:
-                        handler = getattr(decorator["cls"], decorator["handler"])
+                        # 全局菜单按类注册, 回调绑定到本宠物状态机中对应的处理器实例
+                        instance = self.state_machine.handler_of(decorator["cls"])
+                        handler = getattr(instance, decorator["handler"])
                         action.triggered.connect(handler)
                     menu.addAction(action)
                 except Exception as e:
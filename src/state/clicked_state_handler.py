@@ -1,6 +1,6 @@
 import os
 import random
-from PySide6.QtCore import QTimer, QUrl, QEvent, Qt
+from PySide6.QtCore import QUrl, QEvent, Qt
 from PySide6.QtGui import QMouseEvent
 
 from ..config import Config
@@ -11,29 +11,30 @@ class ClickedStateHandler(StateHandler):
     """点击状态处理器"""
 
     def _init_state(self):
-        self.click_end_timer = QTimer()
-        self.click_end_timer.setSingleShot(True)
-        self.click_end_timer.timeout.connect(self._on_click_end)
+        self.click_end_timer = self.state_machine.create_task(
+            self._on_click_end, single_shot=True
+        )
         return super()._init_state()
 
     def on_enter(self):
-        self.main_layer.pet_window.play_gif(
+        self.pet_window.play_gif(
             random.choice(self.main_layer.resource_manager.get_gif("Click"))
         )
+        self.pet_window.particles.burst("heart", 8)
         if os.path.exists(Config.PATH_CONFIG["Resources"]["Music"]["DoubleClick"]):
-            self.main_layer.pet_window.audio_player.setSource(
+            self.pet_window.audio_player.setSource(
                 QUrl.fromLocalFile(
                     random.choice(
                         self.main_layer.resource_manager.get_music("DoubleClick")
                     )
                 )
             )
-            self.main_layer.pet_window.audio_player.play()
+            self.pet_window.audio_player.play()
             self.click_end_timer.start(18000)
 
     def on_exit(self):
         self.click_end_timer.stop()
-        self.main_layer.pet_window.audio_player.stop()
+        self.pet_window.audio_player.stop()
         return False
 
     def handle_event(self, event: QEvent) -> bool:
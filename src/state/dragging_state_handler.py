@@ -1,6 +1,6 @@
 import random
 from typing import Optional
-from PySide6.QtCore import Qt, QEvent, QTimer, QPoint
+from PySide6.QtCore import Qt, QEvent, QPoint
 from PySide6.QtGui import QMouseEvent
 from PySide6.QtWidgets import QApplication
 
@@ -13,9 +13,9 @@ class DraggingStateHandler(StateHandler):
     def _init_state(self):
         self.is_dragging = False
         self.old_pos: Optional[QPoint] = None
-        self.debounce_drag_end_timer = QTimer()
-        self.debounce_drag_end_timer.setSingleShot(True)
-        self.debounce_drag_end_timer.timeout.connect(self._real_end_dragging)
+        self.debounce_drag_end_timer = self.state_machine.create_task(
+            self._real_end_dragging, single_shot=True
+        )
         return super()._init_state()
 
     def on_enter(self):
@@ -23,16 +23,15 @@ class DraggingStateHandler(StateHandler):
             return False
         self.is_dragging = True
         self.debounce_end_dragging()
-        self.main_layer.pet_window.play_gif(
+        self.pet_window.play_gif(
             random.choice(self.main_layer.resource_manager.get_gif("Drag"))
         )
         self.old_pos = None
-        self.state_machine.timers["monitor"].stop()
+        self.pet_window.particles.burst("drop", 6)
         return True
 
     def on_exit(self):
         self.is_dragging = False
-        self.state_machine.timers["monitor"].start(2000)
         return False
 
     def debounce_end_dragging(self):
@@ -74,7 +73,7 @@ class DraggingStateHandler(StateHandler):
 
         current_pos = event.globalPos()
         delta = current_pos - self.old_pos
-        new_pos = self.main_layer.pet_window.pos() + delta
+        new_pos = self.pet_window.pos() + delta
 
         # 多显示器适配
         screen_geometry = QApplication.screenAt(current_pos).availableGeometry()
@@ -83,7 +82,7 @@ class DraggingStateHandler(StateHandler):
                 screen_geometry.left(),
                 min(
                     new_pos.x(),
-                    screen_geometry.right() - self.main_layer.pet_window.width(),
+                    screen_geometry.right() - self.pet_window.width(),
                 ),
             )
         )
@@ -92,12 +91,12 @@ class DraggingStateHandler(StateHandler):
                 screen_geometry.top(),
                 min(
                     new_pos.y(),
-                    screen_geometry.bottom() - self.main_layer.pet_window.height(),
+                    screen_geometry.bottom() - self.pet_window.height(),
                 ),
             )
         )
 
-        self.main_layer.pet_window.move(new_pos)
+        self.pet_window.move(new_pos)
         self.old_pos = current_pos
         return True
 
@@ -1,5 +1,5 @@
 import random
-from PySide6.QtCore import QTimer, QEvent, Qt
+from PySide6.QtCore import QEvent, Qt
 from PySide6.QtGui import QMouseEvent
 from .base_state import StateHandler, PetState
 
@@ -8,14 +8,14 @@ class EatingStateHandler(StateHandler):
     """进食状态处理器"""
 
     def _init_state(self):
-        self.eating_end_timer = QTimer()
-        self.eating_end_timer.setSingleShot(True)
-        self.eating_end_timer.timeout.connect(self._on_eating_end)
+        self.eating_end_timer = self.state_machine.create_task(
+            self._on_eating_end, single_shot=True
+        )
         return super()._init_state()
 
     def on_enter(self):
         self.eating_end_timer.start(3000)
-        self.main_layer.pet_window.play_gif(
+        self.pet_window.play_gif(
             random.choice(self.main_layer.resource_manager.get_gif("Eat"))
         )
 
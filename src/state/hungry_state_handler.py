@@ -1,5 +1,5 @@
 import random
-from PySide6.QtCore import QTimer, QEvent, Qt
+from PySide6.QtCore import QEvent, Qt
 from PySide6.QtGui import QMouseEvent
 from PySide6.QtWidgets import QLabel
 from .base_state import StateHandler, menu_item, PetState
@@ -13,11 +13,11 @@ class HungryStateHandler(StateHandler):
         """初始化饥饿状态特定的资源"""
         # 创建饥饿标签
         self.hunger_label = QLabel("饥饿值: 100")
-        self.hunger_timer = QTimer()
-        self.hunger_timer.timeout.connect(self._update_hunger)
+        self.hunger_timer = self.state_machine.create_task(self._update_hunger)
         self.hunger_number = 100
         self.hunger_rate = self.main_layer.config.config["Hunger"]["Rate"]
         self.hunger_timer.start(int(20000 / self.hunger_rate))
+        self.hunger_remaining: int = -1  # 挂起时距离下一次变化的剩余时间
 
         # 注册到状态机的UI组件
         self.state_machine.register_ui_component("hunger_label", self.hunger_label)
@@ -31,9 +31,10 @@ class HungryStateHandler(StateHandler):
             return False
         elif self.state_machine.state_stack[-1] == PetState.DRAGGING:
             return False
-        self.main_layer.pet_window.play_gif(
+        self.pet_window.play_gif(
             random.choice(self.main_layer.resource_manager.get_gif("Hungry"))
         )
+        self.pet_window.say("饿了…想吃哦润吉 🍊")
 
     def on_exit(self):
         return super().on_exit()
@@ -67,9 +68,31 @@ class HungryStateHandler(StateHandler):
         ]:
             self.state_machine.transition_to(PetState.HUNGRY)
 
+    def on_suspend(self):
+        # 记录距离下一次饥饿值变化的剩余时间, 恢复时据此补齐
+        self.hunger_remaining = self.hunger_timer.remaining_time()
+        self.hunger_timer.stop()
+
+    def on_resume(self, suspended_ms: int):
+        interval = int(20000 / self.hunger_rate)
+        remaining = self.hunger_remaining if self.hunger_remaining >= 0 else interval
+        self.hunger_remaining = -1
+        if suspended_ms < remaining:
+            # 接着挂起前的进度计时, 反复隐藏/显示不会推迟饥饿
+            self.hunger_timer.start(interval, remaining - suspended_ms)
+            return
+        # 补上挂起期间错过的饥饿值变化, 最后一次交给 _update_hunger 处理状态切换
+        elapsed = suspended_ms - remaining
+        missed = 1 + elapsed // interval
+        self.hunger_number = max(0, self.hunger_number - (missed - 1))
+        self._update_hunger()
+        if not self.hunger_timer.is_active():
+            self.hunger_timer.start(interval, interval - elapsed % interval)
+
     def handle_feed(self):
         """处理喂食"""
         self.state_machine.transition_to(PetState.EATING)
+        self.pet_window.particles.burst("crumb", 16)
         self.hunger_number += 40
         if self.hunger_number > 100:
             self.hunger_number = 100
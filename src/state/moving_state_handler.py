@@ -1,17 +1,26 @@
 import random
-from typing import Literal, Optional
-from PySide6.QtCore import QTimer, QEvent, Qt, QPoint
+from typing import Dict, Literal, Optional
+from PySide6.QtCore import QEvent, Qt, QPoint
 from PySide6.QtGui import QMouseEvent
 from .base_state import StateHandler, PetState
 
+Direction = Literal["left", "right", "up", "down"]
+
+OPPOSITE: Dict[Direction, Direction] = {
+    "left": "right",
+    "right": "left",
+    "up": "down",
+    "down": "up",
+}
+
 
 class MovingStateHandler(StateHandler):
     """移动状态处理器"""
 
     def _init_state(self):
         # 开始定时器
-        self.random_start_timer = QTimer()
-        self.random_start_timer.timeout.connect(self.start_random_movement)
+        create_task = self.state_machine.create_task
+        self.random_start_timer = create_task(self.start_random_movement)
         # 根据配置决定是否启动随机移动
         if self.main_layer.config.config["Workspace"]["AllowRandomMovement"]:
             self.random_start_timer.start(
@@ -20,15 +29,13 @@ class MovingStateHandler(StateHandler):
 
         # 移动计时器
         self.is_moving = False
-        self.move_direction: Optional[Literal["left", "right", "up", "down"]] = None
+        self.move_direction: Optional[Direction] = None
         self.move_speed = 3  # 速度
-        self.move_timer = QTimer()
-        self.move_timer.timeout.connect(self.move_pet)
+        self.move_timer = create_task(self.move_pet, precise=True, align=True)
 
         # 停止计时器
-        self.stop_timer = QTimer()
-        self.stop_timer.setSingleShot(True)
-        self.stop_timer.timeout.connect(self.stop_movement)
+        self.stop_timer = create_task(self.stop_movement, single_shot=True)
+        self.stop_remaining: int = -1  # 挂起时剩余的移动时长
 
         return super()._init_state()
 
@@ -62,6 +69,23 @@ class MovingStateHandler(StateHandler):
             self.state_machine.pop_state()
         return super().update_config()
 
+    def on_suspend(self):
+        self.random_start_timer.stop()
+        if self.stop_timer.is_active():
+            self.stop_remaining = self.stop_timer.remaining_time()
+        self.stop_timer.stop()
+        self.move_timer.stop()
+
+    def on_resume(self, suspended_ms: int):
+        if self.main_layer.config.config["Workspace"]["AllowRandomMovement"]:
+            self.random_start_timer.start(
+                self.main_layer.config.config["Random"]["Interval"] * 1000
+            )
+        if self.is_moving and self.state_machine.current_state == PetState.MOVING:
+            self.move_timer.start(50)
+            self.stop_timer.start(max(self.stop_remaining, 0))
+        self.stop_remaining = -1
+
     def check_can_random_move(self):
         """检查是否可以随机移动"""
         return (
@@ -85,7 +109,7 @@ class MovingStateHandler(StateHandler):
 
         # 右移时镜像
         mirror = self.move_direction == "right"
-        self.main_layer.pet_window.play_gif(move_gif, mirror=mirror)
+        self.pet_window.play_gif(move_gif, mirror=mirror)
 
         move_duration = random.randint(5000, 10000)
         self.is_moving = True
@@ -102,32 +126,54 @@ class MovingStateHandler(StateHandler):
         if not self.move_direction:
             return
 
-        current_pos = self.main_layer.pet_window.pos()
+        current_pos = self.pet_window.pos()
         new_pos = current_pos
 
         if self.move_direction == "left":
             new_pos += QPoint(-self.move_speed, 0)
-            if new_pos.x() < self.main_layer.pet_window.screen_geometry.left():
+            if new_pos.x() < self.pet_window.screen_geometry.left():
                 self.move_direction = "right"
         elif self.move_direction == "right":
             new_pos += QPoint(self.move_speed, 0)
             if (
                 new_pos.x()
-                > self.main_layer.pet_window.screen_geometry.right()
-                - self.main_layer.pet_window.width()
+                > self.pet_window.screen_geometry.right() - self.pet_window.width()
             ):
                 self.move_direction = "left"
         elif self.move_direction == "up":
             new_pos += QPoint(0, -self.move_speed)
-            if new_pos.y() < self.main_layer.pet_window.screen_geometry.top():
+            if new_pos.y() < self.pet_window.screen_geometry.top():
                 self.move_direction = "down"
         elif self.move_direction == "down":
             new_pos += QPoint(0, self.move_speed)
             if (
                 new_pos.y()
-                > self.main_layer.pet_window.screen_geometry.bottom()
-                - self.main_layer.pet_window.height()
+                > self.pet_window.screen_geometry.bottom() - self.pet_window.height()
             ):
                 self.move_direction = "up"
 
-        self.main_layer.pet_window.move(new_pos)
+        # 撞上其他宠物时掉头
+        if self.bumps_into_pet(new_pos):
+            self.move_direction = OPPOSITE[self.move_direction]
+            return
+
+        self.pet_window.move(new_pos)
+
+    def bumps_into_pet(self, new_pos: QPoint) -> bool:
+        """移动到 `new_pos` 是否会撞上其他宠物
+
+        只检查空间索引中与新位置相交的宠物, 每次移动的开销与宠物总数无关.
+        只有靠近对方才算碰撞, 已经重叠的宠物(如刚创建时)仍可以互相分开.
+        """
+        current = self.pet_window.frameGeometry()
+        target = current.translated(new_pos - current.topLeft())
+        index = self.main_layer.pet_index
+        for other in index.query(target):
+            if other is self.pet_window:
+                continue
+            center = index.rect(other).center()
+            if (target.center() - center).manhattanLength() < (
+                current.center() - center
+            ).manhattanLength():
+                return True
+        return False
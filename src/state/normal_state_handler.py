@@ -1,6 +1,6 @@
 import os
 import random
-from PySide6.QtCore import QEvent, Qt, QTimer
+from PySide6.QtCore import QEvent, Qt
 from PySide6.QtGui import QMouseEvent, QIcon
 from PySide6.QtWidgets import QMessageBox
 from ..setting_gui import SettingsDialog
@@ -18,8 +18,7 @@ class NormalStateHandler(StateHandler):
     """正常状态处理器"""
 
     def _init_state(self):
-        self.normal_timer = QTimer()
-        self.normal_timer.timeout.connect(self.change_gif)
+        self.normal_timer = self.state_machine.create_task(self.change_gif)
         return super()._init_state()
 
     def on_enter(self):
@@ -27,7 +26,7 @@ class NormalStateHandler(StateHandler):
             1000 * self.main_layer.config.config["Random"]["Interval"]
         )
         gif_path = random.choice(self.main_layer.resource_manager.get_gif("Common"))
-        self.main_layer.pet_window.play_gif(gif_path)
+        self.pet_window.play_gif(gif_path)
 
     def on_exit(self):
         self.normal_timer.stop()
@@ -48,6 +47,15 @@ class NormalStateHandler(StateHandler):
         )
         return super().update_config()
 
+    def on_suspend(self):
+        self.normal_timer.stop()
+
+    def on_resume(self, suspended_ms: int):
+        if self.state_machine.current_state == PetState.NORMAL:
+            self.normal_timer.start(
+                1000 * self.main_layer.config.config["Random"]["Interval"]
+            )
+
     def _handle_mouse_press(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton:
             self.state_machine.transition_to(PetState.DRAGGING)
@@ -64,7 +72,7 @@ class NormalStateHandler(StateHandler):
     def change_gif(self):
         if self.state_machine.current_state == PetState.NORMAL:
             gif_path = random.choice(self.main_layer.resource_manager.get_gif("Common"))
-            self.main_layer.pet_window.play_gif(gif_path)
+            self.pet_window.play_gif(gif_path)
 
     def handle_about(self):
         """处理关于"""
@@ -76,13 +84,13 @@ class NormalStateHandler(StateHandler):
 
     def show_settings(self):
         """显示设置对话框"""
-        dialog = SettingsDialog(self.main_layer.config, self.main_layer.pet_window)
+        dialog = SettingsDialog(self.main_layer.config, self.pet_window)
         dialog.exec()
 
     def show_about_info(self):
         """显示关于信息"""
         about_text = get_page("about.html")
-        msg_box = QMessageBox(self.main_layer.pet_window)
+        msg_box = QMessageBox(self.pet_window)
         msg_box.setWindowTitle("关于 Doro 宠物")
         msg_box.setText(about_text)
         icon_path = os.path.join(
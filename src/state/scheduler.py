@@ -0,0 +1,242 @@
+import heapq
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple, TypedDict
+
+from PySide6.QtCore import QObject, Qt, QTimer
+
+
+class SchedulerStats(TypedDict):
+    tasks: int
+    wakeups: int
+    runs: int
+    wakeups_per_second: float
+    busy_ms: float
+
+
+class ScheduledTask:
+    """调度器中的任务句柄, 用法与 QTimer 相近(start/stop), 但不持有独立的系统定时器"""
+
+    def __init__(
+        self,
+        scheduler: "Scheduler",
+        callback: Callable[[], object],
+        single_shot: bool,
+        precise: bool,
+        name: str,
+        align: bool = False,
+    ):
+        self.scheduler: Scheduler = scheduler
+        self.callback = callback
+        self.single_shot: bool = single_shot
+        self.precise: bool = precise
+        # 截止时刻对齐到间隔的整数倍, 同间隔的任务(如多只宠物的移动)在同一次唤醒中执行
+        self.align: bool = align
+        self.name: str = name
+        self.interval: int = 0
+        self.deadline: Optional[float] = None  # 下次触发的时刻(ms), None 表示未激活
+        self.generation: int = 0  # 每次 start/stop 递增, 用于惰性删除堆中的旧条目
+
+    @property
+    def tolerance(self) -> float:
+        """允许提前触发的时间窗口(ms)"""
+        return 0 if self.precise else self.scheduler.coarse_tolerance
+
+    def start(self, interval: Optional[int] = None, delay: Optional[int] = None):
+        """(重新)开始计时, 不传参时沿用上一次的间隔
+
+        `delay` 为首次触发前的等待时间(ms), 默认为一个间隔; 之后按间隔周期触发.
+        """
+        if interval is not None:
+            self.interval = max(0, int(interval))
+        now = self.scheduler.now()
+        if delay is None:
+            deadline = self.next_deadline(now)
+        else:
+            deadline = now + max(0, int(delay))
+        self.scheduler._schedule(self, deadline)
+
+    def next_deadline(self, now: float) -> float:
+        """从 `now` 开始计时的下次触发时刻"""
+        if self.align and self.interval > 0:
+            return (now // self.interval + 1) * self.interval
+        return now + self.interval
+
+    def stop(self):
+        """停止计时"""
+        if self.deadline is None:
+            return
+        self.deadline = None
+        self.generation += 1
+        self.scheduler._rearm()
+
+    def is_active(self) -> bool:
+        return self.deadline is not None
+
+    def remaining_time(self) -> int:
+        """距离下次触发的剩余时间(ms), 未激活时返回 -1"""
+        if self.deadline is None:
+            return -1
+        return max(0, int(self.deadline - self.scheduler.now()))
+
+    def __repr__(self) -> str:
+        return (
+            f"ScheduledTask({self.name!r}, interval={self.interval}, "
+            f"precise={self.precise}, active={self.is_active()})"
+        )
+
+
+class Scheduler(QObject):
+    """基于最小堆的统一定时调度器
+
+    所有任务共用一个系统定时器, 每次只为最早到期的任务唤醒进程.
+    唤醒时, 除已到期的任务外, 截止时间落在容差窗口内的粗略任务(`precise=False`)
+    也会被提前合并执行, 从而减少唤醒次数.
+    """
+
+    COARSE_TOLERANCE = 100
+    """粗略任务默认允许提前的时间(ms)"""
+
+    STATS_WINDOW = 10.0
+    """统计唤醒频率的时间窗口(s)"""
+
+    def __init__(
+        self,
+        parent: Optional[QObject] = None,
+        coarse_tolerance: float = COARSE_TOLERANCE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(parent)
+        self.coarse_tolerance: float = coarse_tolerance
+        self._clock = clock
+        self._heap: List[Tuple[float, int, int, ScheduledTask]] = []
+        self._sequence: int = 0
+        self._tasks: List[ScheduledTask] = []
+
+        self.wakeups: int = 0
+        self.runs: int = 0
+        self.busy_ms: float = 0.0  # 执行任务回调累计耗时
+        self._wakeup_times: Deque[float] = deque()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def now(self) -> float:
+        """当前时刻(ms)"""
+        return self._clock() * 1000
+
+    def create_task(
+        self,
+        callback: Callable[[], object],
+        single_shot: bool = False,
+        precise: bool = False,
+        name: str = "",
+        align: bool = False,
+    ) -> ScheduledTask:
+        """注册任务(未启动), 需要时调用 `task.start(interval)`"""
+        task = ScheduledTask(
+            self, callback, single_shot, precise, name or callback.__name__, align
+        )
+        self._tasks.append(task)
+        return task
+
+    def remove_task(self, task: ScheduledTask):
+        """停止并注销任务(如宠物关闭时)"""
+        task.stop()
+        if task in self._tasks:
+            self._tasks.remove(task)
+
+    def next_deadline(self) -> Optional[float]:
+        """最早的有效截止时刻(ms)"""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self) -> int:
+        """执行所有已到期(含容差窗口内)的任务, 返回执行的任务数"""
+        now = self.now()
+        due: List[ScheduledTask] = []
+        deferred: List[Tuple[float, int, int, ScheduledTask]] = []
+        horizon = now + max(self.coarse_tolerance, 0)
+        while self._heap and self._heap[0][0] <= horizon:
+            entry = heapq.heappop(self._heap)
+            deadline, _, generation, task = entry
+            if generation != task.generation:
+                continue
+            if deadline <= now + task.tolerance:
+                due.append(task)
+            else:
+                deferred.append(entry)
+        for entry in deferred:
+            heapq.heappush(self._heap, entry)
+
+        for task in due:
+            # 回调中可能已经重新 start/stop 过该任务, 因此先更新状态再执行
+            deadline = task.deadline
+            if task.single_shot or deadline is None:
+                task.deadline = None
+                task.generation += 1
+            else:
+                # 按固定节拍推进, 错过太多时(如挂起后)从当前时刻重新开始
+                next_deadline = deadline + max(task.interval, 1)
+                if next_deadline < now:
+                    next_deadline = max(task.next_deadline(now), now + 1)
+                self._push(task, next_deadline)
+            self.runs += 1
+            try:
+                task.callback()
+            except Exception as e:
+                # 任务由所有宠物共用, 单个回调出错不能影响同批的其他任务和之后的调度
+                print(f"定时任务出错: {task.name} ({e})")
+        return len(due)
+
+    def wakeups_per_second(self) -> float:
+        """最近一段时间内的平均唤醒次数"""
+        self._expire_wakeups(self._clock())
+        return len(self._wakeup_times) / self.STATS_WINDOW
+
+    def stats(self) -> SchedulerStats:
+        return {
+            "tasks": sum(task.is_active() for task in self._tasks),
+            "wakeups": self.wakeups,
+            "runs": self.runs,
+            "wakeups_per_second": self.wakeups_per_second(),
+            "busy_ms": self.busy_ms,
+        }
+
+    def _schedule(self, task: ScheduledTask, deadline: float):
+        self._push(task, deadline)
+        self._rearm()
+
+    def _push(self, task: ScheduledTask, deadline: float):
+        task.generation += 1
+        task.deadline = deadline
+        self._sequence += 1
+        heapq.heappush(self._heap, (deadline, self._sequence, task.generation, task))
+
+    def _drop_stale(self):
+        while self._heap and self._heap[0][2] != self._heap[0][3].generation:
+            heapq.heappop(self._heap)
+
+    def _rearm(self):
+        deadline = self.next_deadline()
+        if deadline is None:
+            self._timer.stop()
+            return
+        self._timer.start(max(0, int(deadline - self.now() + 0.999)))
+
+    def _expire_wakeups(self, now: float):
+        while self._wakeup_times and now - self._wakeup_times[0] > self.STATS_WINDOW:
+            self._wakeup_times.popleft()
+
+    def _on_timeout(self):
+        self.wakeups += 1
+        now = self._clock()
+        self._wakeup_times.append(now)
+        self._expire_wakeups(now)
+        try:
+            self.run_due()
+        finally:
+            self.busy_ms += (self._clock() - now) * 1000
+            self._rearm()
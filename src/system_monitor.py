@@ -1,25 +1,198 @@
+import time
+from typing import Dict, NamedTuple, Optional
+
 import psutil
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
 
 from .config import Config
+from .metric_history import MetricHistory
 
 
-class SystemMonitor:
-    def __init__(self, config: Config):
-        pass
+class SystemSample(NamedTuple):
+    """一次采样的系统指标(不可变, 可在线程间传递)"""
 
-    def get_cpu_usage(self):
-        """获取CPU使用率"""
-        return psutil.cpu_percent()
+    time: float  # 采样时刻(time.monotonic)
+    cpu: float  # CPU 使用率(%)
+    memory: float  # 内存使用率(%)
+    bytes_sent: int
+    bytes_recv: int
+    send_rate: float  # 与上一次采样之间的平均上传速度(B/s)
+    recv_rate: float  # 平均下载速度(B/s)
+    collect_ms: float  # 本次采集耗时
 
-    def get_memory_usage(self):
-        """获取内存使用率"""
-        return psutil.virtual_memory().percent
 
-    def get_disk_usage(self):
-        """获取磁盘使用率"""
-        return psutil.disk_usage("/").percent
+class _Sampler(QObject):
+    """在工作线程中定时调用 psutil"""
+
+    sampled = Signal(object)  # SystemSample
+
+    def __init__(self, interval: int):
+        super().__init__()
+        self.interval: int = interval
+        self._previous: Optional[SystemSample] = None
+        self._timer: Optional[QTimer] = None
+
+    def start(self):
+        """在工作线程启动后执行, 定时器属于工作线程"""
+        # cpu_percent 按两次调用之间的间隔计算, 第一次调用只建立基准
+        psutil.cpu_percent()
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.collect)
+        self._timer.start(self.interval)
+
+    def pause(self):
+        """暂停定时采样(在工作线程中执行)"""
+        if self._timer is not None:
+            self._timer.stop()
+
+    def resume(self):
+        """恢复定时采样, 重新建立 CPU 和网速的基准"""
+        if self._timer is None or self._timer.isActive():
+            return
+        psutil.cpu_percent()
+        self._previous = None
+        self._timer.start(self.interval)
 
-    def get_network_usage(self):
-        """获取网络使用情况"""
+    def shutdown(self):
+        """在工作线程中停止定时器并结束线程的事件循环"""
+        if self._timer is not None:
+            self._timer.stop()
+        self.thread().quit()
+
+    def collect(self):
+        started = time.perf_counter()
+        cpu = psutil.cpu_percent()
+        memory = psutil.virtual_memory().percent
         net_io = psutil.net_io_counters()
-        return {"bytes_sent": net_io.bytes_sent, "bytes_recv": net_io.bytes_recv}
+        now = time.monotonic()
+        send_rate = recv_rate = 0.0
+        previous = self._previous
+        if previous is not None and now > previous.time:
+            send_rate = max(0, net_io.bytes_sent - previous.bytes_sent) / (
+                now - previous.time
+            )
+            recv_rate = max(0, net_io.bytes_recv - previous.bytes_recv) / (
+                now - previous.time
+            )
+        sample = SystemSample(
+            now,
+            cpu,
+            memory,
+            net_io.bytes_sent,
+            net_io.bytes_recv,
+            send_rate,
+            recv_rate,
+            (time.perf_counter() - started) * 1000,
+        )
+        self._previous = sample
+        self.sampled.emit(sample)
+
+
+class SystemMonitor(QObject):
+    """系统指标采样器, 由所有宠物共用
+
+    psutil 调用(尤其是网卡较多时的 `net_io_counters`)在后台线程中定时执行, 不会卡住拖拽和动画.
+    每次采样的结果是不可变的 `SystemSample`, 通过 `sampled` 信号在 GUI 线程中发布,
+    宠物和托盘只负责格式化显示. 样本中记录了采集耗时.
+    最近 Info.HistorySeconds 秒内的样本保存在固定容量的 `history` 中, 供信息框绘制曲线.
+    采样间隔为 Info.SampleIntervalMS, 修改后重启采样线程.
+    没有人显示样本(所有宠物都挂起且托盘负载图标关闭)时由 `set_paused` 暂停采样.
+    """
+
+    sampled = Signal(object)  # SystemSample, 在 GUI 线程中发出
+    _shutdown = Signal()
+    _pause = Signal()
+    _resume = Signal()
+
+    def __init__(self, config: Config, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.config: Config = config
+        self.latest: Optional[SystemSample] = None
+        self.history: MetricHistory = MetricHistory(self._history_capacity())
+        self._thread: Optional[QThread] = None
+        self._sampler: Optional[_Sampler] = None
+        self.paused: bool = False
+
+    def start(self):
+        """启动后台采样线程"""
+        if self._thread is not None:
+            return
+        self._thread = QThread()
+        self._thread.setObjectName("SystemMonitor")
+        self._sampler = _Sampler(self.interval)
+        self._sampler.moveToThread(self._thread)
+        # 接收方位于 GUI 线程, 信号排队回到 GUI 线程处理
+        self._sampler.sampled.connect(self._on_sampled)
+        self._shutdown.connect(self._sampler.shutdown)
+        self._pause.connect(self._sampler.pause)
+        self._resume.connect(self._sampler.resume)
+        self._thread.started.connect(self._sampler.start)
+        self._thread.start(QThread.Priority.LowPriority)
+        if self.paused:
+            # 排队到工作线程, 在 _Sampler.start 之后执行
+            self._pause.emit()
+
+    def stop(self):
+        """停止采样并等待线程退出"""
+        if self._thread is None:
+            return
+        # 定时器只能在所属线程中停止, 由工作线程自己停止后退出
+        self._shutdown.emit()
+        self._thread.wait()
+        self._shutdown.disconnect(self._sampler.shutdown)
+        self._pause.disconnect(self._sampler.pause)
+        self._resume.disconnect(self._sampler.resume)
+        self._thread = None
+        self._sampler = None
+
+    def set_paused(self, paused: bool):
+        """暂停/恢复定时采样, 采样线程保持运行"""
+        if paused == self.paused:
+            return
+        self.paused = paused
+        if self._thread is not None:
+            (self._pause if paused else self._resume).emit()
+
+    @property
+    def interval(self) -> int:
+        """采样间隔(ms)"""
+        return max(1, self.config.config["Info"]["SampleIntervalMS"])
+
+    def update_config(self):
+        """按新的历史时长调整历史记录容量; 采样间隔改变时重启采样线程"""
+        self.history.resize(self._history_capacity())
+        if self._sampler is not None and self._sampler.interval != self.interval:
+            self.stop()
+            self.start()
+
+    def _history_capacity(self) -> int:
+        seconds = self.config.config["Info"]["HistorySeconds"]
+        return seconds * 1000 // self.interval
+
+    def _on_sampled(self, sample: SystemSample):
+        self.latest = sample
+        self.history.append(
+            sample.time, (sample.cpu, sample.memory, sample.recv_rate, sample.send_rate)
+        )
+        self.sampled.emit(sample)
+
+    def get_cpu_usage(self) -> float:
+        """最近一次采样的CPU使用率"""
+        return self.latest.cpu if self.latest is not None else 0.0
+
+    def get_memory_usage(self) -> float:
+        """最近一次采样的内存使用率"""
+        return self.latest.memory if self.latest is not None else 0.0
+
+    def get_disk_usage(self) -> float:
+        """获取磁盘使用率(同步调用)"""
+        return psutil.disk_usage("/").percent
+
+    def get_network_usage(self) -> Dict[str, int]:
+        """最近一次采样的网络累计流量"""
+        if self.latest is None:
+            return {"bytes_sent": 0, "bytes_recv": 0}
+        return {
+            "bytes_sent": self.latest.bytes_sent,
+            "bytes_recv": self.latest.bytes_recv,
+        }
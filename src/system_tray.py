@@ -1,6 +1,6 @@
 import os
 
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from PySide6.QtGui import QIcon, QAction
 from PySide6.QtWidgets import (
@@ -12,6 +12,9 @@ from PySide6.QtWidgets import (
 from .config import Config
 from .pet_window import PetWindow
 from .setting_gui import SettingsDialog
+from .state.base_state import PetState
+from .system_monitor import SystemSample
+from .tray_gauge import TrayGauge, gauge_bucket
 
 if TYPE_CHECKING:
     from MainLayer import MainLayer
@@ -31,10 +34,17 @@ class SystemTray:
 
         # 加载图标
         icon_path: str = Config.PATH_CONFIG["Icon"]["RelativePath"]
+        self.icon: QIcon = QIcon()
         if os.path.exists(icon_path):
-            self.tray_icon.setIcon(QIcon(icon_path))
+            self.icon = QIcon(icon_path)
         else:
             print(f"警告: 图标文件不存在: {icon_path}")
+        self.tray_icon.setIcon(self.icon)
+
+        # 负载图标模式: 按档位预先画好的图标表(首次启用时创建), 档位变化时才替换图标
+        self.gauge: Optional[TrayGauge] = None
+        self.gauge_bucket: int = -1
+        self.main_layer.system_monitor.sampled.connect(self.update_gauge)
 
         # 创建托盘菜单
         self.menu = QMenu()
@@ -48,6 +58,10 @@ class SystemTray:
         self.hide_action.triggered.connect(self.hide_pet)
         self.menu.addAction(self.hide_action)
 
+        self.add_action = QAction("添加桌宠", self.menu)
+        self.add_action.triggered.connect(self.add_pet)
+        self.menu.addAction(self.add_action)
+
         self.menu.addSeparator()
 
         self.settings_action = QAction("设置", self.menu)
@@ -63,6 +77,8 @@ class SystemTray:
         # 设置托盘菜单
         self.tray_icon.setContextMenu(self.menu)
 
+        self.update_config()
+
     def show_tray_icon(self):
         """显示托盘图标"""
         self.tray_icon.show()
@@ -71,21 +87,63 @@ class SystemTray:
         """隐藏托盘图标"""
         self.tray_icon.hide()
 
+    def shows_gauge(self) -> bool:
+        """托盘图标是否显示负载(需要系统采样)"""
+        return self.config.config["Tray"]["Gauge"] != "Off"
+
+    def update_config(self):
+        """按 Tray.Gauge 切换静态图标或负载图标"""
+        self.main_layer.update_sampling()
+        if not self.shows_gauge():
+            if self.gauge_bucket >= 0:
+                self.gauge_bucket = -1
+                self.tray_icon.setIcon(self.icon)
+                self.tray_icon.setToolTip("")
+            return
+        if self.gauge is None:
+            self.gauge = TrayGauge(self.icon)
+        self.gauge_bucket = -1
+        if self.main_layer.system_monitor.latest is not None:
+            self.update_gauge(self.main_layer.system_monitor.latest)
+
+    def update_gauge(self, sample: SystemSample):
+        """每次采样后刷新负载图标(宠物隐藏时也会刷新)"""
+        if self.gauge is None or self.config.config["Tray"]["Gauge"] == "Off":
+            return
+        if self.config.config["Tray"]["Gauge"] == "Memory":
+            name, percent = "内存", sample.memory
+        else:
+            name, percent = "CPU", sample.cpu
+        tooltip = f"doro - {name}: {percent:.0f}%"
+        if tooltip != self.tray_icon.toolTip():
+            self.tray_icon.setToolTip(tooltip)
+        bucket = gauge_bucket(percent)
+        if bucket != self.gauge_bucket:
+            self.gauge_bucket = bucket
+            self.tray_icon.setIcon(self.gauge.icons[bucket])
+
     def show_pet(self):
-        """显示桌宠"""
-        self.pet_window.show()
+        """显示所有桌宠"""
+        for pet_window in self.main_layer.pets:
+            pet_window.show()
 
     def hide_pet(self):
-        """隐藏桌宠"""
-        self.pet_window.hide()
+        """隐藏所有桌宠"""
+        for pet_window in self.main_layer.pets:
+            pet_window.hide()
+
+    def add_pet(self):
+        """添加一只桌宠"""
+        pet_window = self.main_layer.add_pet()
+        pet_window.show()
+        pet_window.state_machine.transition_to(PetState.NORMAL)
+        pet_window.say("你好呀~")
 
     def show_settings(self):
         """显示设置对话框"""
-        dialog = SettingsDialog(self.config, self.pet_window)
+        dialog = SettingsDialog(self.config, self.main_layer.pet_window)
         dialog.exec()
 
     def quit_application(self):
-        """退出应用程序"""
-        self.tray_icon.hide()
-        self.pet_window.close()
-        os._exit(0)
+        """关闭所有桌宠并退出应用程序"""
+        self.main_layer.quit()
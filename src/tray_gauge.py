@@ -0,0 +1,68 @@
+from typing import Dict, List, Tuple
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QIcon, QPainter, QPen, QPixmap
+
+GAUGE_METRICS: Dict[str, str] = {"Off": "静态图标", "CPU": "CPU", "Memory": "内存"}
+"""托盘图标模式 -> 设置界面中的名称"""
+
+GAUGE_STEP = 5
+"""每档覆盖的百分比"""
+
+GAUGE_SIZES: Tuple[int, ...] = (16, 32, 64)
+"""预先绘制的图标尺寸, 由系统按托盘大小和缩放比例挑选"""
+
+
+def gauge_bucket(percent: float) -> int:
+    """百分比所在的档位(0 ~ 100 / GAUGE_STEP)"""
+    return max(0, min(100 // GAUGE_STEP, round(percent / GAUGE_STEP)))
+
+
+def gauge_color(percent: float) -> QColor:
+    """负载由低到高从绿色渐变为红色"""
+    return QColor.fromHsv(int(120 * (1 - min(percent, 100) / 100)), 200, 230)
+
+
+def render_gauge(face: QPixmap, percent: float, size: int) -> QPixmap:
+    """在宠物头像外围画一圈环形进度条"""
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    width = max(2.0, size / 8)
+    ring = QRectF(width / 2, width / 2, size - width, size - width)
+
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    if not face.isNull():
+        inset = int(width) + 1
+        painter.drawPixmap(inset, inset, size - inset * 2, size - inset * 2, face)
+    painter.setPen(QPen(QColor(0, 0, 0, 70), width))
+    painter.drawEllipse(ring)
+    if percent > 0:
+        pen = QPen(gauge_color(percent), width)
+        pen.setCapStyle(Qt.PenCapStyle.FlatCap)
+        painter.setPen(pen)
+        # 从 12 点方向顺时针, 角度单位为 1/16 度
+        painter.drawArc(ring, 90 * 16, -int(360 * 16 * min(percent, 100) / 100))
+    painter.end()
+    return pixmap
+
+
+class TrayGauge:
+    """托盘负载图标表
+
+    每 `GAUGE_STEP`% 一档, 创建时一次画好所有档位的图标; 之后刷新只需按档位取出缓存的 QIcon,
+    不再绘制.
+    """
+
+    def __init__(self, face: QIcon):
+        self.icons: List[QIcon] = []
+        faces = {size: face.pixmap(size, size) for size in GAUGE_SIZES}
+        for bucket in range(100 // GAUGE_STEP + 1):
+            icon = QIcon()
+            for size in GAUGE_SIZES:
+                icon.addPixmap(render_gauge(faces[size], bucket * GAUGE_STEP, size))
+            self.icons.append(icon)
+
+    def icon(self, percent: float) -> QIcon:
+        return self.icons[gauge_bucket(percent)]